@@ -161,6 +161,7 @@ def test_search_index_generated():
     assert (BASE_DIR / 'api' / 'searchindex.json').is_file()
     assert (BASE_DIR / 'api' / 'fullsearchindex.json').is_file()
     assert (BASE_DIR / 'api' / 'all-documents.html').is_file()
+    assert (BASE_DIR / 'api' / 'all-documents.json').is_file()
 
 def test_lunr_index() -> None:
     """
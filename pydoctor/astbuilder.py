@@ -9,7 +9,7 @@ from inspect import Parameter, Signature
 from itertools import chain
 from pathlib import Path
 from typing import (
-    Any, Callable, Collection, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple,
+    AbstractSet, Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple,
     Type, TypeVar, Union, cast
 )
 
@@ -17,7 +17,7 @@ from pydoctor import epydoc2stan, model, node2stan, extensions, linker
 from pydoctor.epydoc.markup._pyval_repr import colorize_inline_pyval
 from pydoctor.astutils import (is_none_literal, is_typing_annotation, is_using_annotations, is_using_typing_final, node2dottedname, node2fullname, 
                                is__name__equals__main__, unstring_annotation, upgrade_annotation, iterassign, extract_docstring_linenum, infer_type, get_parents,
-                               get_docstring_node, unparse, NodeVisitor, Parentage, Str)
+                               get_docstring_node, unparse, NodeVisitor, Str)
 
 
 def parseFile(path: Path) -> ast.Module:
@@ -32,6 +32,32 @@ else:
     _parse = ast.parse
 
 
+def resolveImportFrom(node: ast.ImportFrom, mod: model.Module) -> Optional[str]:
+    """
+    Get the full name of the module imported by a C{from ... import ...} statement of module C{mod}.
+
+    @returns: The module name or C{None} if the relative import level is too high.
+    """
+    modname = node.module
+    level = node.level
+    if level:
+        # Relative import.
+        parent: Optional[model.Documentable] = mod
+        if isinstance(mod, model.Package):
+            level -= 1
+        for _ in range(level):
+            if parent is None:
+                break
+            parent = parent.parent
+        if parent is None:
+            return None
+        if modname is None:
+            return parent.fullName()
+        return f'{parent.fullName()}.{modname}'
+    # The module name can only be omitted on relative imports.
+    assert modname is not None
+    return modname
+
 def _maybeAttribute(cls: model.Class, name: str) -> bool:
     """Check whether a name is a potential attribute of the given class.
     This is used to prevent an assignment that wraps a method from
@@ -59,6 +85,7 @@ def _handleAliasing(
     if full_name is None:
         return False
     ctx._localNameToFullName_map[target] = full_name
+    ctx.system._clearExpandNameCache()
     return True
 
 
@@ -196,7 +223,6 @@ class ModuleVistor(NodeVisitor):
 
     def visit_Module(self, node: ast.Module) -> None:
         assert self.module.docstring is None
-        Parentage().visit(node)
 
         self.builder.push(self.module, 0)
         doc_node = get_docstring_node(node)
@@ -257,6 +283,7 @@ class ModuleVistor(NodeVisitor):
         cls.rawbases = rawbases
         cls._initialbaseobjects = initialbaseobjects
         cls._initialbases = initialbases
+        self.system._clearExpandNameCache()
 
         doc_node = get_docstring_node(node)
         if doc_node is not None:
@@ -300,31 +327,13 @@ class ModuleVistor(NodeVisitor):
             # processing import statement in odd context
             return
 
-        modname = node.module
-        level = node.level
-        if level:
-            # Relative import.
-            parent: Optional[model.Documentable] = ctx.parentMod
-            if isinstance(ctx.module, model.Package):
-                level -= 1
-            for _ in range(level):
-                if parent is None:
-                    break
-                parent = parent.parent
-            if parent is None:
-                assert ctx.parentMod is not None
-                ctx.parentMod.report(
-                    "relative import level (%d) too high" % node.level,
-                    lineno_offset=node.lineno
-                    )
-                return
-            if modname is None:
-                modname = parent.fullName()
-            else:
-                modname = f'{parent.fullName()}.{modname}'
-        else:
-            # The module name can only be omitted on relative imports.
-            assert modname is not None
+        modname = resolveImportFrom(node, ctx.module)
+        if modname is None:
+            ctx.module.report(
+                "relative import level (%d) too high" % node.level,
+                lineno_offset=node.lineno
+                )
+            return
 
         if node.names[0].name == '*':
             self._importAll(modname)
@@ -361,55 +370,73 @@ class ModuleVistor(NodeVisitor):
         assert isinstance(self.builder.current, model.CanContainImportsDocumentable)
         _localNameToFullName = self.builder.current._localNameToFullName_map
         expandName = mod.expandName
+        moves: List[Tuple[model.Documentable, str]] = []
         for name in names:
 
-            if self._handleReExport(exports, name, name, mod) is True:
+            if self._handleReExport(exports, name, name, mod, moves) is True:
                 continue
 
             _localNameToFullName[name] = expandName(name)
+        self._moveReExports(moves)
+        self.system._clearExpandNameCache()
 
-    def _getCurrentModuleExports(self) -> Collection[str]:
+    def _getCurrentModuleExports(self) -> AbstractSet[str]:
         # Fetch names to export.
         current = self.builder.current
         if isinstance(current, model.Module):
-            exports = current.all
+            exports = current.all_names
             if exports is None:
-                exports = []
+                exports = frozenset()
         else:
             # Don't export names imported inside classes or functions.
-            exports = []
+            exports = frozenset()
         return exports
 
-    def _handleReExport(self, curr_mod_exports:Collection[str], 
+    def _handleReExport(self, curr_mod_exports:AbstractSet[str], 
                         origin_name:str, as_name:str,
-                        origin_module:model.Module) -> bool:
+                        origin_module:model.Module, 
+                        moves:List[Tuple[model.Documentable, str]]) -> bool:
         """
-        Move re-exported objects into current module.
+        Find re-exported objects to move into current module.
 
+        @param moves: The object and its new name are appended to this list, 
+            see L{_moveReExports}.
         @returns: True if the imported name has been sucessfully re-exported.
         """
         # Move re-exported objects into current module.
         current = self.builder.current
-        modname = origin_module.fullName()
         if as_name in curr_mod_exports:
             # In case of duplicates names, we can't rely on resolveName,
             # So we use content.get first to resolve non-alias names. 
             ob = origin_module.contents.get(origin_name) or origin_module.resolveName(origin_name)
             if ob is None:
                 current.report("cannot resolve re-exported name :"
-                                        f'{modname}.{origin_name}', thresh=1)
+                                        f'{origin_module.fullName()}.{origin_name}', thresh=1)
             else:
-                if origin_module.all is None or origin_name not in origin_module.all:
-                    self.system.msg(
-                        "astbuilder",
-                        "moving %r into %r" % (ob.fullName(), current.fullName())
-                        )
-                    # Must be a Module since the exports is set to an empty list if it's not.
-                    assert isinstance(current, model.Module)
-                    ob.reparent(current, as_name)
+                origin_exports = origin_module.all_names
+                if origin_exports is None or origin_name not in origin_exports:
+                    moves.append((ob, as_name))
                     return True
         return False
 
+    def _moveReExports(self, moves:Iterable[Tuple[model.Documentable, str]]) -> None:
+        """
+        Move the objects re-exported by an import statement into current module, 
+        in the order they were imported.
+        
+        The moves are done once all names are handled, so the names of the system
+        are only changed, and the L{model.Documentable.expandName} caches cleared, once per statement.
+        """
+        current = self.builder.current
+        for ob, as_name in moves:
+            self.system.msg(
+                "astbuilder",
+                "moving %r into %r" % (ob.fullName(), current.fullName())
+                )
+            # Must be a Module since the exports is set to an empty set if it's not.
+            assert isinstance(current, model.Module)
+            ob._reparent(current, as_name)
+
     def _importNames(self, modname: str, names: Iterable[ast.alias]) -> None:
         """Handle a C{from <modname> import <names>} statement."""
 
@@ -422,6 +449,7 @@ class ModuleVistor(NodeVisitor):
         current = self.builder.current
         assert isinstance(current, model.CanContainImportsDocumentable)
         _localNameToFullName = current._localNameToFullName_map
+        moves: List[Tuple[model.Documentable, str]] = []
         for al in names:
             orgname, asname = al.name, al.asname
             if asname is None:
@@ -430,10 +458,12 @@ class ModuleVistor(NodeVisitor):
             # are processed (getProcessedModule() ignores non-modules).
             if isinstance(mod, model.Package):
                 self.system.getProcessedModule(f'{modname}.{orgname}')
-            if mod is not None and self._handleReExport(exports, orgname, asname, mod) is True:
+            if mod is not None and self._handleReExport(exports, orgname, asname, mod, moves) is True:
                 continue
 
             _localNameToFullName[asname] = f'{modname}.{orgname}'
+        self._moveReExports(moves)
+        self.system._clearExpandNameCache()
 
     def visit_Import(self, node: ast.Import) -> None:
         """Process an import statement.
@@ -458,6 +488,7 @@ class ModuleVistor(NodeVisitor):
                 # we're keeping track of all defined names
                 asname = targetname = targetname.split('.')[0]
             _localNameToFullName[asname] = targetname
+        self.system._clearExpandNameCache()
 
     def _handleOldSchoolMethodDecoration(self, target: str, expr: Optional[ast.expr]) -> bool:
         if not isinstance(expr, ast.Call):
@@ -718,6 +749,7 @@ class ModuleVistor(NodeVisitor):
 
         if obj is not None:
             obj._setDocstringValue(docstring, expr.lineno)
+            self.system._recordUpdate(obj)
             # TODO: It might be better to not perform docstring parsing until
             #       we have the final docstrings for all objects.
             obj.parsed_docstring = None
@@ -744,7 +776,16 @@ class ModuleVistor(NodeVisitor):
             elif isinstance(value, ast.Name) and value.id == 'self':
                 self._handleInstanceVar(targetNode.attr, annotation, expr, lineno)
 
+    @staticmethod
+    def _linkValue(node: Union[ast.Assign, ast.AnnAssign, ast.AugAssign]) -> None:
+        # Statements get their parent attribute set while walking the tree,
+        # link the assigned value to it's statement such that 
+        # is_constant() can check the context with get_parents().
+        if node.value is not None:
+            node.value.parent = node # type:ignore[attr-defined]
+
     def visit_Assign(self, node: ast.Assign) -> None:
+        self._linkValue(node)
         lineno = node.lineno
         expr = node.value
 
@@ -765,11 +806,13 @@ class ModuleVistor(NodeVisitor):
                 self._handleAssignment(target, annotation, expr, lineno)
 
     def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        self._linkValue(node)
         annotation = upgrade_annotation(unstring_annotation(
             node.annotation, self.builder.current), self.builder.current)
         self._handleAssignment(node.target, annotation, node.value, node.lineno)
     
     def visit_AugAssign(self, node:ast.AugAssign) -> None:
+        self._linkValue(node)
         self._handleAssignment(node.target, None, node.value, 
                                node.lineno, augassign=node.op)
 
@@ -1172,6 +1215,40 @@ class ASTBuilder:
         vis.extensions.attach_visitor(vis)
         vis.walkabout(mod_ast)
 
+    def findImportedModules(self, mod_ast: ast.Module, mod: model.Module) -> Iterator[Tuple[str, bool]]:
+        """
+        Find the names of the modules imported by this module's AST, without visiting it: 
+        the modules of the import statements outside of functions and the names imported 
+        by C{from ... import ...} statements, that can be submodules.
+        
+        This is used to process the modules in the order of their imports, see L{model.System.process}, 
+        and to find the modules that depend on a changed module, see L{model.System.reprocessModules}.
+
+        @returns: Tuples C{(name, processed)}, where C{processed} tells whether the module might 
+            be processed while processing this module's AST: this is only the case for the 
+            C{from ... import ...} statements. The parent packages of the C{import ...} statements 
+            are yielded as well.
+        """
+        nodes: List[ast.AST] = [mod_ast]
+        while nodes:
+            node = nodes.pop()
+            if isinstance(node, ast.ImportFrom):
+                modname = resolveImportFrom(node, mod)
+                if modname is not None:
+                    yield modname, True
+                    for al in node.names:
+                        if al.name != '*':
+                            yield f'{modname}.{al.name}', True
+            elif isinstance(node, ast.Import):
+                for al in node.names:
+                    parts = al.name.split('.')
+                    for i in range(len(parts)):
+                        yield '.'.join(parts[:i+1]), False
+            elif not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                # Imports are statements, so expressions can be skipped.
+                # Children are pushed in reverse order to find the imports in source order.
+                nodes.extend(reversed([n for n in ast.iter_child_nodes(node) if not isinstance(n, ast.expr)]))
+
     def parseFile(self, path: Path, ctx: model.Module) -> Optional[ast.Module]:
         try:
             return self.ast_cache[path]
@@ -1290,3 +1367,4 @@ MODULE_VARIABLES_META_PARSERS: Mapping[str, Callable[[ast.Assign, model.Module],
 def setup_pydoctor_extension(r:extensions.ExtRegistrar) -> None:
     r.register_astbuilder_visitor(TypeAliasVisitorExt)
     r.register_post_processor(model.defaultPostProcess, priority=200)
+    r.register_post_processor(model.resolveDocsources, priority=0)
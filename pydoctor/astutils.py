@@ -64,10 +64,15 @@ class NodeVisitor(visitor.PartialVisitor[ast.AST]):
     def get_children(cls, node: ast.AST) -> Iterable[ast.AST]:
         """
         Returns the nested nodes in the body of a node.
+
+        The C{parent} attribute of each child statement is set while iterating, 
+        so that L{get_parents} works for statements seen during the walk without 
+        requiring a separate L{Parentage} pass over the whole tree.
         """
         body: Optional[Sequence[ast.AST]] = getattr(node, 'body', None)
         if body is not None:
             for child in body:
+                child.parent = node # type:ignore[attr-defined]
                 yield child
 
 class NodeVisitorExt(visitor.VisitorExt[ast.AST]):
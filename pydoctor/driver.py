@@ -1,18 +1,25 @@
 """The entry point."""
 from __future__ import annotations
 
-from typing import  Sequence
+from typing import  Collection, Dict, Iterable, List, Optional, Sequence, Tuple, TYPE_CHECKING
 import datetime
+import io
 import os
 import sys
+import time
 from pathlib import Path
 
+import attr
+
 from pydoctor.options import Options, BUILDTIME_FORMAT
 from pydoctor.utils import error
 from pydoctor import model
-from pydoctor.templatewriter import IWriter, TemplateLookup, TemplateError
+from pydoctor.templatewriter import IWriter, TemplateLookup, TemplateError, TemplateWriter, util
 from pydoctor.sphinx import SphinxInventoryWriter, prepareCache
 
+if TYPE_CHECKING:
+    from pydoctor.sphinx import CacheT
+
 # In newer Python versions, use importlib.resources from the standard library.
 # On older versions, a compatibility package must be installed from PyPI.
 if sys.version_info < (3, 9):
@@ -20,19 +27,26 @@ if sys.version_info < (3, 9):
 else:
     import importlib.resources as importlib_resources
 
-def get_system(options: model.Options) -> model.System:
+def get_system(options: model.Options, intersphinx_cache: Optional[CacheT] = None) -> model.System:
     """
     Get a system with the defined options. Load packages and modules.
-    """
-    cache = prepareCache(clearCache=options.clear_intersphinx_cache,
-                         enableCache=options.enable_intersphinx_cache,
-                         cachePath=options.intersphinx_cache_path,
-                         maxAge=options.intersphinx_cache_max_age)
 
+    @param intersphinx_cache: The cache used to fetch the intersphinx inventories. 
+        If C{None}, a cache is created with the options and closed when done.
+    """
     # step 1: make/find the system
     system = options.systemclass(options)
-    system.fetchIntersphinxInventories(cache)
-    cache.close() # Fixes ResourceWarning: unclosed <ssl.SSLSocket>
+    
+    if intersphinx_cache is not None:
+        system.fetchIntersphinxInventories(intersphinx_cache)
+    # The cache (and requests) are only needed when there are inventories to fetch.
+    elif options.intersphinx or options.clear_intersphinx_cache:
+        cache = prepareCache(clearCache=options.clear_intersphinx_cache,
+                            enableCache=options.enable_intersphinx_cache,
+                            cachePath=options.intersphinx_cache_path,
+                            maxAge=options.intersphinx_cache_max_age)
+        system.fetchIntersphinxInventories(cache)
+        cache.close() # Fixes ResourceWarning: unclosed <ssl.SSLSocket>
 
     # TODO: load buildtime with default factory and converter in model.Options
     # Support source date epoch:
@@ -79,14 +93,53 @@ def get_system(options: model.Options) -> model.System:
         system.projectname = system.options.projectname
 
     builder.buildModules()
+    system.flushProgress()
 
     return system
 
-def make(system: model.System) -> None:
+def get_template_lookup(options: model.Options) -> TemplateLookup:
+    """
+    Load the templates of the theme and custom template directories, as configured in the options.
+    """
+    # Always init the writer with the 'base' set of templates at least.
+    template_lookup = TemplateLookup(
+                        importlib_resources.files('pydoctor.themes') / 'base', 
+                        minify=options.minify_html)
+    
+    # Handle theme selection, 'classic' by default.
+    if options.theme != 'base':
+        template_lookup.add_templatedir(
+            importlib_resources.files('pydoctor.themes') / options.theme)
+
+    # Handle custom HTML templates
+    if options.templatedir:
+        try:
+            for t in options.templatedir:
+                template_lookup.add_templatedir(Path(t))
+        except TemplateError  as e:
+            error(str(e))
+    
+    return template_lookup
+
+def make(system: model.System, template_lookup: Optional[TemplateLookup] = None, 
+         pages: Optional[Collection[model.Documentable]] = None) -> None:
     """
     Produce the html/intersphinx output, as configured in the system's options. 
+
+    @param template_lookup: The templates used to write the HTML. 
+        If C{None}, the templates are loaded with L{get_template_lookup}.
+    @param pages: If given, only the pages of these objects are written again, the other pages 
+        of the previous build are kept. The summary pages and the Sphinx inventory are always written. 
+        Used by C{--watch} with the objects returned by L{model.System.reprocessModules}.
     """
     options = system.options
+    sphinx_inventory = SphinxInventoryWriter(
+            logger=system.msg,
+            project_name=system.projectname,
+            project_version=system.options.projectversion,
+            )
+    inventory_written = False
+    
     # step 4: make html, if desired
 
     if options.makehtml:
@@ -98,47 +151,67 @@ def make(system: model.System) -> None:
 
         writer: IWriter
         
-        # Always init the writer with the 'base' set of templates at least.
-        template_lookup = TemplateLookup(
-                            importlib_resources.files('pydoctor.themes') / 'base')
-        
-        # Handle theme selection, 'classic' by default.
-        if system.options.theme != 'base':
-            template_lookup.add_templatedir(
-                importlib_resources.files('pydoctor.themes') / system.options.theme)
-
-        # Handle custom HTML templates
-        if system.options.templatedir:
-            try:
-                for t in system.options.templatedir:
-                    template_lookup.add_templatedir(Path(t))
-            except TemplateError  as e:
-                error(str(e))
+        if template_lookup is None:
+            template_lookup = get_template_lookup(options)
 
         build_directory = Path(options.htmloutput)
 
         writer = options.htmlwriter(build_directory, template_lookup=template_lookup)
 
-        writer.prepOutputDirectory()
+        if isinstance(writer, TemplateWriter):
+            writer.link_static_assets = options.static_assets == 'link'
+            writer.static_assets_store = options.static_assets_store
+            writer.write_changed_only = options.watch or options.write_changed_only
+            writer.write_threads = options.write_threads
+            if pages is not None and writer.write_changed_only:
+                writer.render_only = set(pages)
+                # The classes changed since their pages were rendered.
+                util.clear_caches()
+            if options.precompress:
+                from pydoctor.templatewriter.compress import availableFormats
+                writer.precompress = availableFormats()
 
-        subjects: Sequence[model.Documentable] = ()
-        if options.htmlsubjects:
-            subjects = [system.allobjects[fn] for fn in options.htmlsubjects]
-        else:
-            writer.writeSummaryPages(system)
-            if not options.htmlsummarypages:
-                subjects = system.rootobjects
-        writer.writeIndividualFiles(subjects)
+        try:
+            writer.prepOutputDirectory()
+
+            subjects: Sequence[model.Documentable] = ()
+            if options.htmlsubjects:
+                subjects = [system.allobjects[fn] for fn in options.htmlsubjects]
+            else:
+                writer.writeSummaryPages(system)
+                if not options.htmlsummarypages:
+                    subjects = system.rootobjects
+            
+            if isinstance(writer, TemplateWriter):
+                # Generate the Sphinx inventory while writing the HTML pages, 
+                # so the objects are walked only once. 
+                # It's written with the writer, like the other files.
+                inventory = io.BytesIO()
+                with sphinx_inventory.stream(options.htmloutput, fobj=inventory) as add_to_inventory:
+                    writer.visitors.append(add_to_inventory)
+                    try:
+                        writer.writeIndividualFiles(subjects)
+                    finally:
+                        writer.visitors.remove(add_to_inventory)
+                writer.writeFile('objects.inv', inventory.getvalue())
+                inventory_written = True
+            else:
+                writer.writeIndividualFiles(subjects)
+            
+            if isinstance(writer, TemplateWriter) and not options.htmlsubjects and not options.htmlsummarypages:
+                writer.deleteStaleFiles()
+        finally:
+            if isinstance(writer, TemplateWriter):
+                writer.close()
+        
+        if isinstance(writer, TemplateWriter) and writer.write_changed_only:
+            system.msg('html', f'{writer.unchanged_pages} files unchanged, '
+                               f'{writer.deleted_files} stale files deleted.', thresh=1)
         
-    if options.makeintersphinx:
+    if options.makeintersphinx and not inventory_written:
         if not options.makehtml:
             subjects = system.rootobjects
         # Generate Sphinx inventory.
-        sphinx_inventory = SphinxInventoryWriter(
-            logger=system.msg,
-            project_name=system.projectname,
-            project_version=system.options.projectversion,
-            )
         if not os.path.exists(options.htmloutput):
             os.makedirs(options.htmloutput)
         sphinx_inventory.generate(
@@ -146,6 +219,322 @@ def make(system: model.System) -> None:
             basepath=options.htmloutput,
             )
 
+    lookups = system.expandName_hits + system.expandName_misses
+    if lookups:
+        system.msg('expandName', 
+            f'name resolution cache: {system.expandName_hits} hits, {system.expandName_misses} misses '
+            f'({system.expandName_hits / lookups:.0%} hit rate)', thresh=1)
+    
+    system.flushProgress()
+
+def get_exitcode(system: model.System) -> int:
+    """
+    Get the CLI exit code of a built system, print the summary of docstring syntax errors.
+    """
+    exitcode = 0
+
+    # Print summary of docstring syntax errors
+    docstring_syntax_errors = system.parse_errors['docstring']
+    if docstring_syntax_errors:
+        exitcode = 2
+
+        def p(msg: str) -> None:
+            system.msg('docstring-summary', msg, thresh=-1, topthresh=1)
+        p("these %s objects' docstrings contain syntax errors:"
+            %(len(docstring_syntax_errors),))
+        for fn in sorted(docstring_syntax_errors):
+            p('    '+fn)
+
+    # If there is any other kind of parse errors, exit with code 2 as well.
+    # This applies to errors generated from colorizing AST.
+    elif any(system.parse_errors.values()):
+        exitcode = 2
+
+    if system.violations and system.options.warnings_as_errors:
+        # Update exit code if the run has produced warnings.
+        exitcode = 3
+    
+    return exitcode
+
+@attr.s(auto_attribs=True)
+class BuildResult:
+    """
+    The result of one build of L{BatchBuilder}.
+    """
+    options: Options
+    exitcode: int
+    """
+    Same as the CLI exit code. C{1} if the build failed with an error.
+    """
+    timings: Dict[str, float]
+    """
+    Duration in seconds of the build steps: C{'system'} (L{get_system}), C{'make'} (L{make}) and C{'total'}.
+    """
+    error: Optional[str] = None
+    """
+    Description of the error that stopped the build, if any.
+    """
+    system: Optional[model.System] = None
+    """
+    The built system, if kept to be updated with L{BatchBuilder.update}. C{None} if the build failed.
+    """
+
+class _MemoryCache:
+    """
+    Intersphinx cache that keeps the fetched inventories in memory, 
+    so each inventory is fetched once for all the systems.
+    """
+    def __init__(self, cache: CacheT) -> None:
+        self._cache = cache
+        self._data: Dict[str, Optional[bytes]] = {}
+    
+    def get(self, url: str) -> Optional[bytes]:
+        try:
+            return self._data[url]
+        except KeyError:
+            data = self._data[url] = self._cache.get(url)
+            return data
+    
+    def close(self) -> None:
+        self._cache.close()
+
+class BatchBuilder:
+    """
+    Build several systems from one process, sharing the state that does not depend on a single system:
+    the loaded templates, the intersphinx inventories and the docutils settings.
+    The extension modules are imported once as well.
+
+    Usage::
+
+        results = BatchBuilder().build([Options.from_args(args) for args in all_args], jobs=4)
+        for r in results:
+            print(r.options.projectname, r.exitcode, r.timings)
+    """
+    def __init__(self) -> None:
+        self._template_lookups: Dict[Tuple[str, Tuple[Path, ...], bool], TemplateLookup] = {}
+        self._intersphinx_caches: Dict[Tuple[bool, str, str], _MemoryCache] = {}
+
+    def template_lookup(self, options: Options) -> TemplateLookup:
+        """
+        Get the shared templates for these options.
+        """
+        key = (options.theme, tuple(options.templatedir), options.minify_html)
+        try:
+            return self._template_lookups[key]
+        except KeyError:
+            lookup = self._template_lookups[key] = get_template_lookup(options)
+            return lookup
+
+    def intersphinx_cache(self, options: Options) -> CacheT:
+        """
+        Get the shared intersphinx cache for these options. 
+        """
+        key = (options.enable_intersphinx_cache, 
+               options.intersphinx_cache_path, 
+               options.intersphinx_cache_max_age)
+        try:
+            return self._intersphinx_caches[key]
+        except KeyError:
+            cache = self._intersphinx_caches[key] = _MemoryCache(prepareCache(
+                            # The cache is cleared only once.
+                            clearCache=options.clear_intersphinx_cache and os.path.exists(options.intersphinx_cache_path),
+                            enableCache=options.enable_intersphinx_cache,
+                            cachePath=options.intersphinx_cache_path,
+                            maxAge=options.intersphinx_cache_max_age))
+            return cache
+    
+    def build_one(self, options: Options, keep_system: bool = False) -> BuildResult:
+        """
+        Build one system and write its output. 
+        Errors are reported in the result instead of stopping the batch.
+
+        @param keep_system: Keep the built system in the result, to update it with L{update}.
+        """
+        return self._build(options, None, (), keep_system)
+    
+    def update(self, system: model.System, paths: Iterable[Path]) -> BuildResult:
+        """
+        Update a system kept by L{build_one} after some of its source files changed, and write its output again. 
+        Only the changed modules and the modules depending on them are processed again, and only the pages 
+        that changed are written, see L{model.System.reprocessModules}. If the system can't be updated, 
+        it's built again from scratch. The updated system is kept in the result.
+
+        @param paths: The source files that changed.
+        """
+        return self._build(system.options, system, paths, True)
+    
+    def _build(self, options: Options, system: Optional[model.System], 
+               paths: Iterable[Path], keep_system: bool) -> BuildResult:
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
+        pages: Optional[Collection[model.Documentable]] = None
+        try:
+            if system is not None:
+                pages = system.reprocessModules(paths)
+                if pages is None:
+                    system = None
+            if system is None:
+                cache = self.intersphinx_cache(options) if options.intersphinx else None
+                system = get_system(options, intersphinx_cache=cache)
+            timings['system'] = time.perf_counter() - start
+            
+            t = time.perf_counter()
+            make(system, template_lookup=self.template_lookup(options) if options.makehtml else None, pages=pages)
+            timings['make'] = time.perf_counter() - t
+            
+            exitcode = get_exitcode(system)
+            err = None
+        except SystemExit as e:
+            # Raised by utils.error()
+            exitcode = e.code if isinstance(e.code, int) else 1
+            err = f'exited with code {e.code}'
+            system = None
+        except Exception as e:
+            exitcode = 1
+            err = f'{e.__class__.__name__}: {e}'
+            system = None
+        timings['total'] = time.perf_counter() - start
+        return BuildResult(options, exitcode, timings, err, system if keep_system else None)
+    
+    def build(self, options: Sequence[Options], jobs: int = 1) -> List[BuildResult]:
+        """
+        Build all systems, in this process or in a pool of C{jobs} worker processes. 
+        Each worker process has its own L{BatchBuilder}. 
+
+        @returns: The results, in the same order as C{options}.
+        """
+        try:
+            if jobs > 1 and len(options) > 1:
+                from concurrent.futures import ProcessPoolExecutor
+                with ProcessPoolExecutor(max_workers=jobs) as executor:
+                    return list(executor.map(_build_in_worker, options))
+            return [self.build_one(o) for o in options]
+        finally:
+            self.close()
+    
+    def close(self) -> None:
+        """
+        Close the connections of the intersphinx caches. 
+        The fetched inventories are kept in memory, the caches can still be used afterwards.
+        """
+        for cache in self._intersphinx_caches.values():
+            cache.close()
+
+_worker_builder: Optional[BatchBuilder] = None
+
+def _build_in_worker(options: Options) -> BuildResult:
+    global _worker_builder
+    if _worker_builder is None:
+        _worker_builder = BatchBuilder()
+    try:
+        return _worker_builder.build_one(options)
+    finally:
+        # The worker process is terminated without notice when the pool shuts down.
+        _worker_builder.close()
+
+class SourceWatcher:
+    """
+    Detect the changes of the python source files under some paths, by polling their modification time and size.
+    """
+
+    SUFFIXES = ('.py', '.pyi')
+
+    def __init__(self, paths: Iterable[Path]) -> None:
+        self.paths = list(paths)
+        self.files = self.snapshot()
+        """The files found by the last poll, see L{snapshot}."""
+
+    def snapshot(self) -> Dict[Path, Tuple[int, int]]:
+        """
+        Get the modification time (in nanoseconds) and size of all source files.
+        """
+        files: Dict[Path, Tuple[int, int]] = {}
+        def add(path: Path) -> None:
+            try:
+                st = path.stat()
+            except OSError:
+                # Removed while walking the tree.
+                return
+            files[path] = (st.st_mtime_ns, st.st_size)
+        for path in self.paths:
+            if path.is_dir():
+                for dirpath, dirnames, filenames in os.walk(path):
+                    # Do not walk hidden directories and __pycache__.
+                    dirnames[:] = [d for d in dirnames if not d.startswith('.') and d != '__pycache__']
+                    for name in filenames:
+                        if name.endswith(self.SUFFIXES):
+                            add(Path(dirpath, name))
+            else:
+                add(path)
+        return files
+
+    def poll(self) -> List[Path]:
+        """
+        Get the files that have been created, modified or removed since the last call.
+        """
+        old, new = self.files, self.snapshot()
+        self.files = new
+        return sorted(p for p in old.keys() | new.keys() if old.get(p) != new.get(p))
+
+    def wait(self, interval: float) -> List[Path]:
+        """
+        Block until some files change.
+
+        @param interval: Seconds between two polls.
+        @returns: The changed files.
+        """
+        while True:
+            time.sleep(interval)
+            changed = self.poll()
+            if changed:
+                return changed
+
+def watch(options: Options, builder: Optional[BatchBuilder] = None) -> int:
+    """
+    Build the documentation, then update it each time a source file changes, until interrupted.
+
+    The system is kept between the builds: only the changed modules and the modules that depend 
+    on them are processed again, and only the pages of the objects that changed are written again, 
+    see L{BatchBuilder.update}. The system is built again from scratch when a module is added or removed. 
+    The templates and intersphinx inventories are loaded only once. 
+    The build time of the first build is kept for the next ones, since it's displayed on every page.
+
+    @returns: The exit code of the last build.
+    """
+    if not options.buildtime and 'SOURCE_DATE_EPOCH' not in os.environ:
+        options.buildtime = datetime.datetime.now().strftime(BUILDTIME_FORMAT)
+    if builder is None:
+        builder = BatchBuilder()
+    def log(msg: str, thresh: int = 0) -> None:
+        # Follows the verbosity like System.msg(), without a system: a build can fail before its system is created.
+        if thresh <= options.verbosity:
+            print(msg, flush=True)
+    watcher = SourceWatcher(options.sourcepath)
+    system: Optional[model.System] = None
+    changed: List[Path] = []
+    exitcode = 0
+    try:
+        while True:
+            if system is None:
+                result = builder.build_one(options, keep_system=True)
+            else:
+                result = builder.update(system, changed)
+            system = result.system
+            exitcode = result.exitcode
+            if result.error:
+                log(f"build failed: {result.error}", thresh=-1)
+            log(f"build took {result.timings['total']:.2f}s, "
+                  f"watching {len(watcher.files)} files for changes (press Ctrl+C to stop)")
+            # Keep the fetched intersphinx inventories for the next builds.
+            builder.close()
+            changed = watcher.wait(options.watch_interval)
+            log('changed: ' + ', '.join(str(p) for p in changed))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        builder.close()
+    return exitcode
+
 def main(args: Sequence[str] = sys.argv[1:]) -> int:
     """
     This is the console_scripts entry point for pydoctor CLI.
@@ -154,40 +543,22 @@ def main(args: Sequence[str] = sys.argv[1:]) -> int:
     """
     options = Options.from_args(args)
 
-    exitcode = 0
-
     try:
 
         # Check that we're actually going to accomplish something here
         if not options.sourcepath:
             error("No source paths given.")
 
+        if options.watch:
+            return watch(options)
+
         # Build model
         system = get_system(options)
         
         # Produce output (HMTL, json, ect)
         make(system)
 
-        # Print summary of docstring syntax errors
-        docstring_syntax_errors = system.parse_errors['docstring']
-        if docstring_syntax_errors:
-            exitcode = 2
-
-            def p(msg: str) -> None:
-                system.msg('docstring-summary', msg, thresh=-1, topthresh=1)
-            p("these %s objects' docstrings contain syntax errors:"
-                %(len(docstring_syntax_errors),))
-            for fn in sorted(docstring_syntax_errors):
-                p('    '+fn)
-
-        # If there is any other kind of parse errors, exit with code 2 as well.
-        # This applies to errors generated from colorizing AST.
-        elif any(system.parse_errors.values()):
-            exitcode = 2
-
-        if system.violations and options.warnings_as_errors:
-            # Update exit code if the run has produced warnings.
-            exitcode = 3
+        exitcode = get_exitcode(system)
         
     except:
         if options.pdb:
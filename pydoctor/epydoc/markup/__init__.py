@@ -33,7 +33,7 @@ each error.
 from __future__ import annotations
 __docformat__ = 'epytext en'
 
-from typing import Callable, ContextManager, List, Optional, Sequence, Iterator, TYPE_CHECKING
+from typing import Callable, ContextManager, Dict, List, Optional, Sequence, Iterator, TYPE_CHECKING
 import abc
 import sys
 import re
@@ -146,6 +146,7 @@ class ParsedDocstring(abc.ABC):
 
         self._stan: Optional[Tag] = None
         self._summary: Optional['ParsedDocstring'] = None
+        self._tocs: Dict[int, Optional['ParsedDocstring']] = {}
 
     @abc.abstractproperty
     def has_body(self) -> bool:
@@ -159,19 +160,26 @@ class ParsedDocstring(abc.ABC):
     def get_toc(self, depth: int) -> Optional['ParsedDocstring']:
         """
         The table of contents of the docstring if titles are defined or C{None}.
+
+        @note: The table of contents is cached: building it again would 
+            give new ids to its entries and to the titles of the docstring.
         """
+        if depth in self._tocs:
+            return self._tocs[depth]
+        toc: Optional[ParsedDocstring] = None
         try:
             document = self.to_node()
         except NotImplementedError:
-            return None
-        contents = build_table_of_content(document, depth=depth)
-        docstring_toc = new_document('toc')
-        if contents:
-            docstring_toc.extend(contents)
-            from pydoctor.epydoc.markup.restructuredtext import ParsedRstDocstring
-            return ParsedRstDocstring(docstring_toc, ())
+            pass
         else:
-            return None
+            contents = build_table_of_content(document, depth=depth)
+            if contents:
+                docstring_toc = new_document('toc')
+                docstring_toc.extend(contents)
+                from pydoctor.epydoc.markup.restructuredtext import ParsedRstDocstring
+                toc = ParsedRstDocstring(docstring_toc, ())
+        self._tocs[depth] = toc
+        return toc
 
     def to_stan(self, docstring_linker: 'DocstringLinker') -> Tag:
         """
@@ -39,8 +39,9 @@ import re
 import ast
 import functools
 import sys
+from weakref import WeakKeyDictionary
 from inspect import signature
-from typing import Any, AnyStr, Union, Callable, Dict, Iterable, Sequence, Optional, List, Tuple, cast
+from typing import Any, AnyStr, Union, Callable, Dict, Iterable, Iterator, Sequence, Optional, List, Tuple, cast
 
 import attr
 from docutils import nodes
@@ -50,7 +51,7 @@ from pydoctor.epydoc import sre_parse36, sre_constants36 as sre_constants
 from pydoctor.epydoc.markup import DocstringLinker
 from pydoctor.epydoc.markup.restructuredtext import ParsedRstDocstring
 from pydoctor.epydoc.docutils import set_node_attributes, wbr, obj_reference, new_document
-from pydoctor.astutils import node2dottedname, bind_args, Parentage, get_parents, unparse, op_util
+from pydoctor.astutils import node2dottedname, bind_args, get_parents, unparse, op_util
 
 def decode_with_backslashreplace(s: bytes) -> str:
     r"""
@@ -140,7 +141,7 @@ class _OperatorDelimiter:
         self.marked = state.mark()
 
         # We use a hack to populate a "parent" attribute on AST nodes.
-        # See astutils.Parentage class, applied in PyvalColorizer._colorize_ast()
+        # See _link_children(), applied in PyvalColorizer._colorize_ast()
         try:
             parent_node: ast.AST = next(get_parents(node))
         except StopIteration:
@@ -174,6 +175,32 @@ class _OperatorDelimiter:
             self.state.result.extend(trimmed)
             self.colorizer._output(')', self.colorizer.GROUP_TAG, self.state)
 
+def _link_children(node: ast.AST) -> None:
+    """
+    Set the C{parent} attribute of the direct children of the node, like L{pydoctor.astutils.Parentage} would do.
+    """
+    for child in ast.iter_child_nodes(node):
+        setattr(child, 'parent', node)
+
+class _LinkedChildren:
+    """
+    Iterable over the children of a container node, 
+    sets their C{parent} attribute only when they are iterated. 
+    
+    With several sequences of children, iterates over tuples like L{zip}.
+    """
+    def __init__(self, node: ast.AST, *children: Sequence[Optional[ast.AST]]) -> None:
+        self._node = node
+        self._children = children
+
+    def __iter__(self) -> Iterator[Any]:
+        node = self._node
+        for children in zip(*self._children):
+            for child in children:
+                if child is not None:
+                    setattr(child, 'parent', node)
+            yield children if len(children) > 1 else children[0]
+
 class _Maxlines(Exception):
     """A control-flow exception that is raised when PyvalColorizer
     exeeds the maximum number of allowed lines."""
@@ -208,8 +235,30 @@ def colorize_pyval(pyval: Any, linelen:Optional[int], maxlines:int, linebreakok:
         explicit 'refuri' value on the L{obj_reference} node.
         This can be used for cases the where the linker might be wrong, obviously this is just a workaround.
     @return: A L{ColorizedPyvalRepr} describing the given pyval.
+    @note: The colorization of AST nodes is cached, such that the same expression 
+        (i.e. a parameter default shared by several signatures) is colorized only once per set of arguments.
     """
-    return PyvalColorizer(linelen=linelen, maxlines=maxlines, linebreakok=linebreakok, refmap=refmap).colorize(pyval)
+    if not isinstance(pyval, ast.AST):
+        return PyvalColorizer(linelen=linelen, maxlines=maxlines, linebreakok=linebreakok, refmap=refmap).colorize(pyval)
+    
+    key = (linelen, maxlines, linebreakok, frozenset(refmap.items()) if refmap else None)
+    try:
+        cached = _colorized_cache[pyval]
+    except KeyError:
+        cached = _colorized_cache[pyval] = {}
+    try:
+        document, is_complete, warnings = cached[key]
+    except KeyError:
+        colorized = PyvalColorizer(linelen=linelen, maxlines=maxlines, linebreakok=linebreakok, refmap=refmap).colorize(pyval)
+        cached[key] = (colorized.to_node(), colorized.is_complete, colorized.warnings)
+        return colorized
+    # Each call gets its own ParsedDocstring since the stan is cached on it, and it depends on the linker.
+    return ColorizedPyvalRepr(document, is_complete, list(warnings))
+
+_colorized_cache: 'WeakKeyDictionary[ast.AST, Dict[Tuple[Any, ...], Tuple[nodes.document, bool, List[str]]]]' = WeakKeyDictionary()
+"""
+Cache of the colorized AST nodes for L{colorize_pyval}. 
+"""
 
 def colorize_inline_pyval(pyval: Any, refmap:Optional[Dict[str, str]]=None) -> ColorizedPyvalRepr:
     """
@@ -554,10 +603,10 @@ class PyvalColorizer:
     def _colorize_ast(self, pyval: ast.AST, state: _ColorizerState) -> None:
         state.stack.append(pyval)
         # Set nodes parent in order to check theirs precedences and add delimiters when needed.
-        try:
-            next(get_parents(pyval))
-        except StopIteration:
-            Parentage().visit(pyval)
+        # This is done lazily for the nodes that are actually colorized, so we don't walk 
+        # the whole tree of large values that are going to be truncated.
+        if not isinstance(pyval, (ast.List, ast.Tuple, ast.Set, ast.Dict)):
+            _link_children(pyval)
 
         if self._is_ast_constant(pyval): 
             self._colorize_ast_constant(pyval, state)
@@ -568,13 +617,13 @@ class PyvalColorizer:
         elif isinstance(pyval, ast.BoolOp):
             self._colorize_ast_bool_op(pyval, state)
         elif isinstance(pyval, ast.List):
-            self._multiline(self._colorize_iter, pyval.elts, state, prefix='[', suffix=']')
+            self._multiline(self._colorize_iter, _LinkedChildren(pyval, pyval.elts), state, prefix='[', suffix=']')
         elif isinstance(pyval, ast.Tuple):
-            self._multiline(self._colorize_iter, pyval.elts, state, prefix='(', suffix=')')
+            self._multiline(self._colorize_iter, _LinkedChildren(pyval, pyval.elts), state, prefix='(', suffix=')')
         elif isinstance(pyval, ast.Set):
-            self._multiline(self._colorize_iter, pyval.elts, state, prefix='set([', suffix='])')
+            self._multiline(self._colorize_iter, _LinkedChildren(pyval, pyval.elts), state, prefix='set([', suffix='])')
         elif isinstance(pyval, ast.Dict):
-            items = list(zip(pyval.keys, pyval.values))
+            items = _LinkedChildren(pyval, pyval.keys, pyval.values)
             self._multiline(self._colorize_ast_dict, items, state, prefix='{', suffix='}')
         elif isinstance(pyval, ast.Name):
             self._colorize_ast_name(pyval, state)
@@ -668,6 +717,8 @@ class PyvalColorizer:
         if sys.version_info < (3,9) and isinstance(sub, ast.Index):
             # In Python < 3.9, non-slices are always wrapped in an Index node.
             sub = sub.value
+        # The slice node is not colorized with _colorize_ast().
+        _link_children(node.slice)
         self._output('[', self.GROUP_TAG, state)
         self._set_precedence(op_util.Precedence.Subscript, node)
         self._set_precedence(op_util.Precedence.Index, sub)
@@ -743,6 +794,9 @@ class PyvalColorizer:
 
         ast_flags = args.arguments.get('flags')
         if ast_flags is not None:
+            for keyword in node.keywords:
+                # The keywords are not colorized with _colorize_ast().
+                _link_children(keyword)
             self._insert_comma(indent, state)
             self._colorize_ast(ast_flags, state)
 
@@ -7,7 +7,7 @@ from __future__ import annotations
 
 import importlib
 import sys
-from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type, Union, TYPE_CHECKING, cast
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, Union, TYPE_CHECKING, cast
 
 # In newer Python versions, use importlib.resources from the standard library.
 # On older versions, a compatibility package must be installed from PyPI.
@@ -41,29 +41,11 @@ class InheritableMixin(FunctionMixin, AttributeMixin):
 
 MixinT = Union[ClassMixin, ModuleMixin, PackageMixin, FunctionMixin, AttributeMixin]
 
-def _importlib_resources_contents(package: str) -> Iterable[str]:
-    """Return an iterable of entries in C{package}.
-
-    Note that not all entries are resources.  Specifically, directories are
-    not considered resources. 
-    """
-    return [path.name for path in importlib_resources.files(package).iterdir()]
-
-
-def _importlib_resources_is_resource(package: str, name: str) -> bool:
-    """True if C{name} is a resource inside C{package}.
-
-    Directories are B{not} resources.
-    """
-    resource = name
-    return any(
-        traversable.name == resource and traversable.is_file()
-        for traversable in importlib_resources.files(package).iterdir()
-    )
-
 def _get_submodules(pkg: str) -> Iterator[str]:
-    for name in _importlib_resources_contents(pkg):
-        if (not name.startswith('_') and _importlib_resources_is_resource(pkg, name)) and name.endswith('.py'):
+    for traversable in importlib_resources.files(pkg).iterdir():
+        name = traversable.name
+        # Directories are not modules.
+        if not name.startswith('_') and name.endswith('.py') and traversable.is_file():
             name = name[:-len('.py')]
             yield f"{pkg}.{name}"
 
@@ -123,7 +105,8 @@ class PriorityProcessor:
 
     Highest priority callables will be called first, when priority is the same it's FIFO order.
 
-    One L{PriorityProcessor} should only be run once on the system.
+    One L{PriorityProcessor} should only be run once on the system, 
+    except after some modules are processed again, see L{model.System.reprocessModules}.
     """
     
     def __init__(self, system:'model.System'):
@@ -196,6 +179,9 @@ class ExtRegistrar:
         A post-processor is simply a one-argument callable receiving 
         the processed L{model.System} and doing stuff on the L{model.Documentable} tree.
 
+        With C{--watch}, the post-processors run again after some modules are processed again, 
+        so they must reset the state they set on the objects of other modules by the previous run.
+
         @param priority: See L{PriorityProcessor}.
         """
         for p in post_processor:
@@ -208,11 +194,18 @@ def load_extension_module(system:'model.System', mod: str) -> None:
     setup_pydoctor_extension = _get_setup_extension_func_from_module(mod)
     setup_pydoctor_extension(ExtRegistrar(system))
 
+_extensions: Optional[Tuple[str, ...]] = None
+
 def get_extensions() -> Iterator[str]:
     """
     Get the full names of all the pydoctor extension modules.
+
+    The package is only listed the first time, the result is cached for the following calls.
     """
-    return _get_submodules('pydoctor.extensions')
+    global _extensions
+    if _extensions is None:
+        _extensions = tuple(_get_submodules('pydoctor.extensions'))
+    return iter(_extensions)
 
 class ModuleVisitorExt(astutils.NodeVisitorExt):
     """
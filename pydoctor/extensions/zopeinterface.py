@@ -21,6 +21,10 @@ class ZopeInterfaceModule(model.Module, extensions.ModuleMixin):
         """
         return self.implements_directly
 
+    def relatedObjects(self) -> Iterator[model.Documentable]:
+        yield from super().relatedObjects()
+        yield from _implementedInterfaces(self)
+
 
 class ZopeInterfaceClass(model.Class, extensions.ClassMixin):
     isinterface = False
@@ -55,6 +59,22 @@ class ZopeInterfaceClass(model.Class, extensions.ClassMixin):
                     r.append(interface)
         return r
 
+    def relatedObjects(self) -> Iterator[model.Documentable]:
+        # The interfaces list their implementations, 
+        # and the implementations inherit the documentation of the interfaces.
+        yield from super().relatedObjects()
+        yield from _implementedInterfaces(self)
+        if self.isinterface:
+            for implementer in self.implementedby_directly:
+                yield implementer
+                yield from implementer.relatedObjects()
+
+def _implementedInterfaces(ob: Union[ZopeInterfaceClass, ZopeInterfaceModule]) -> Iterator[model.Documentable]:
+    for interface in ob.allImplementedInterfaces:
+        io = ob.system.objForFullName(interface)
+        if io is not None:
+            yield io
+
 def _inheritedDocsources(obj: model.Documentable) -> Iterator[model.Documentable]:
     if not isinstance(obj.parent, (ZopeInterfaceClass, ZopeInterfaceModule)):
         return
@@ -154,6 +174,8 @@ def addInterfaceInfoToClass(
     if implementsOnly:
         cls.implements_directly = []
     addInterfaceInfoToScope(cls, interfaceargs, ctx)
+    # classImplements() can be called on the classes of other modules.
+    cls.system._recordUpdate(cls)
 
 
 schema_prog = re.compile(r'zope\.schema\.([a-zA-Z_][a-zA-Z0-9_]*)')
@@ -337,6 +359,12 @@ class ZopeInterfaceModuleVisitor(extensions.ModuleVisitorExt):
 
 def postProcess(self:model.System) -> None:
 
+    # The implementers are found again when the system is post-processed 
+    # again, after some modules are processed again.
+    for cls in self.objectsOfType(ZopeInterfaceClass):
+        if cls.isinterface:
+            cls.implementedby_directly = []
+
     for mod in self.objectsOfType(ZopeInterfaceModule):
         _handle_implemented(mod)
 
@@ -13,15 +13,19 @@ import attr
 from collections import defaultdict
 import datetime
 import importlib
+import json
+import os
 import platform
 import sys
 import textwrap
+import time
 import types
 from enum import Enum
+from itertools import chain
 from inspect import signature, Signature
 from pathlib import Path
 from typing import (
-    TYPE_CHECKING, Any, Collection, Dict, Iterator, List, Mapping, Callable, 
+    TYPE_CHECKING, IO, Any, Collection, Dict, FrozenSet, Iterable, Iterator, List, Mapping, MutableMapping, Callable, 
     Optional, Sequence, Set, Tuple, Type, TypeVar, Union, cast, overload
 )
 from urllib.parse import quote
@@ -135,6 +139,19 @@ class Documentable:
     sourceHref: Optional[str] = None
     kind: Optional[DocumentableKind] = None
 
+    # Caches of fullName() and url, cleared by _clearNamesCache().
+    _fullName: Optional[str] = None
+    _url: Optional[str] = None
+
+    # Cache of expandName(), valid as long as _expandName_generation is the same as the system's, 
+    # see System._clearExpandNameCache().
+    _expandName_cache: Dict[str, str]
+    _expandName_generation = -1
+
+    # Result of docsources() stored by resolveDocsources(), with the names generation of the system 
+    # it was computed for, see System._clearExpandNameCache().
+    _docsources: Optional[Tuple[int, Sequence[Documentable]]] = None
+
     documentation_location = DocLocation.OWN_PAGE
     """Page location where we are documented."""
 
@@ -246,22 +263,42 @@ class Documentable:
         URI fragment (because L{pydoctor.templatewriter.writer.TemplateWriter}
         uses it directly to determine the output filename).
         """
+        url = self._url
+        if url is not None:
+            return url
+        
         page_obj = self.page_object
         if list(self.system.root_names) == [page_obj.fullName()]:
             page_url = 'index.html'
         else:
             page_url = f'{quote(page_obj.fullName())}.html'
         if page_obj is self:
-            return page_url
+            url = page_url
         else:
-            return f'{page_url}#{quote(self.name)}'
+            url = f'{page_url}#{quote(self.name)}'
+        self._url = url
+        return url
 
     def fullName(self) -> str:
-        parent = self.parent
-        if parent is None:
-            return self.name
-        else:
-            return f'{parent.fullName()}.{self.name}'
+        fullName = self._fullName
+        if fullName is None:
+            parent = self.parent
+            if parent is None:
+                fullName = self.name
+            else:
+                fullName = f'{parent.fullName()}.{self.name}'
+            self._fullName = fullName
+        return fullName
+    
+    def _clearNamesCache(self) -> None:
+        """
+        Forget the cached L{fullName()} and L{url} of this object and all its members. 
+        Must be called whenever the name or the parent of this object changes.
+        """
+        self._fullName = None
+        self._url = None
+        for o in self.contents.values():
+            o._clearNamesCache()
 
     def __repr__(self) -> str:
         return f"{self.__class__.__name__} {self.fullName()!r}"
@@ -275,8 +312,23 @@ class Documentable:
         """
         yield self
 
+    def relatedObjects(self) -> Iterator['Documentable']:
+        """
+        Objects other than the parents whose page shows information about this object, 
+        like the base classes listing their subclasses. 
+        Their pages are written again when this object changes, see L{System.reprocessModules}.
+        """
+        return iter(())
 
     def reparent(self, new_parent: 'Module', new_name: str) -> None:
+        self._reparent(new_parent, new_name)
+        self.system._clearExpandNameCache()
+
+    def _reparent(self, new_parent: 'Module', new_name: str) -> None:
+        """
+        Like L{reparent}, but the caller must call L{System._clearExpandNameCache} afterwards. 
+        This lets the AST builder move all objects re-exported by an import statement at once.
+        """
         # this code attempts to preserve "rather a lot" of
         # invariants assumed by various bits of pydoctor
         # and that are of course not written down anywhere
@@ -287,11 +339,11 @@ class Documentable:
         old_name = self.name
         self.parent = self.parentMod = new_parent
         self.name = new_name
+        self._clearNamesCache()
         self._handle_reparenting_post()
         del old_parent.contents[old_name]
         old_parent._localNameToFullName_map[old_name] = self.fullName()
         new_parent.contents[new_name] = self
-        self._handle_reparenting_post()
 
     def _handle_reparenting_pre(self) -> None:
         del self.system.allobjects[self.fullName()]
@@ -335,7 +387,27 @@ class Documentable:
 
         In the context of mod2.E, expandName("RenamedExternal") should be
         "external_location.External" and expandName("renamed_mod.Local")
-        should be "mod1.Local". """
+        should be "mod1.Local". 
+        
+        Results are cached until the names of the system change, see L{System._clearExpandNameCache}.
+        """
+        system = self.system
+        if self._expandName_generation == system._names_generation:
+            try:
+                full_name = self._expandName_cache[name]
+            except KeyError:
+                pass
+            else:
+                system.expandName_hits += 1
+                return full_name
+        else:
+            self._expandName_cache = {}
+            self._expandName_generation = system._names_generation
+        system.expandName_misses += 1
+        full_name = self._expandName_cache[name] = self._expandName(name)
+        return full_name
+
+    def _expandName(self, name: str) -> str:
         parts = name.split('.')
         obj: Documentable = self
         for i, p in enumerate(parts):
@@ -490,7 +562,13 @@ class Module(CanContainImportsDocumentable):
         self._py_string: Optional[str] = None
         """The module string if the module was built from text."""
 
-        self.all: Optional[Collection[str]] = None
+        self._all: Optional[Collection[str]] = None
+        self._all_names: Optional[FrozenSet[str]] = None
+
+        self._docformat: Optional[str] = None
+
+    @property
+    def all(self) -> Optional[Collection[str]]:
         """Names listed in the C{__all__} variable of this module.
 
         These names are considered to be exported by the module,
@@ -499,9 +577,23 @@ class Module(CanContainImportsDocumentable):
 
         If no C{__all__} variable was found in the module, or its
         contents could not be parsed, this is L{None}.
+
+        Assign a new collection to change it, so L{all_names} stays in sync.
         """
+        return self._all
 
-        self._docformat: Optional[str] = None
+    @all.setter
+    def all(self, names: Optional[Collection[str]]) -> None:
+        self._all = names
+        self._all_names = None if names is None else frozenset(names)
+
+    @property
+    def all_names(self) -> Optional[FrozenSet[str]]:
+        """
+        The names of L{all} as a set, to check if a name is exported in constant time,
+        or L{None} if the module has no C{__all__} variable.
+        """
+        return self._all_names
 
     def _localNameToFullName(self, name: str) -> str:
         if name in self.contents:
@@ -577,12 +669,17 @@ def is_exception(cls: 'Class') -> bool:
             return True
     return False
 
-def compute_mro(cls:'Class') -> Sequence[Union['Class', str]]:
+def compute_mro(cls:'Class', 
+                cache: Optional[MutableMapping[Union['Class', str], List[Union['Class', str]]]] = None
+                ) -> Sequence[Union['Class', str]]:
     """
     Compute the method resolution order for this class.
     This function will also set the 
     C{_finalbaseobjects} and C{_finalbases} attributes on 
     this class and all it's superclasses.
+
+    @param cache: Mapping of the linearizations already computed, shared 
+        by the classes of the system, see L{mro.mro}.
     """
     def init_finalbaseobjects(o: 'Class', path:Optional[List['Class']]=None) -> None:
         if not path:
@@ -616,6 +713,7 @@ def compute_mro(cls:'Class') -> Sequence[Union['Class', str]]:
                     init_finalbaseobjects(base, path.copy())
             o._finalbaseobjects = finalbaseobjects
             o._finalbases = finalbases
+            o.system._clearExpandNameCache()
     
     def localbases(o:'Class') -> Iterator[Union['Class', str]]:
         """
@@ -633,7 +731,7 @@ def compute_mro(cls:'Class') -> Sequence[Union['Class', str]]:
         return list(localbases(o))
 
     init_finalbaseobjects(cls)
-    return mro.mro(cls, getbases)
+    return mro.mro(cls, getbases, cache)
 
 def _find_dunder_constructor(cls:'Class') -> Optional['Function']:
     """
@@ -703,15 +801,17 @@ class Class(CanContainImportsDocumentable):
         self._initialbases: List[str] = []
         self._initialbaseobjects: List[Optional['Class']] = []
     
-    def _init_mro(self) -> None:
+    def _init_mro(self, cache: Optional[MutableMapping[Union['Class', str], List[Union['Class', str]]]] = None) -> None:
         """
         Compute the correct value of the method resolution order returned by L{mro()}.
         """
         try:
-            self._mro = compute_mro(self)
+            self._mro = compute_mro(self, cache)
         except ValueError as e:
             self.report(str(e), 'mro')
             self._mro = list(self.allbases(True))
+        # Names of inherited members are resolved with the MRO.
+        self.system._clearExpandNameCache()
     
     @overload
     def mro(self, include_external:'Literal[True]', include_self:bool=True) -> Sequence[Union['Class', str]]:...
@@ -793,6 +893,17 @@ class Class(CanContainImportsDocumentable):
             if b is not None:
                 yield from b.allbases(True)
 
+    def relatedObjects(self) -> Iterator[Documentable]:
+        # The base classes list their subclasses and the members overriding theirs, 
+        # the subclasses list the members they inherit.
+        yield from super().relatedObjects()
+        yield from self.mro(include_self=False)
+        todo = list(self.subclasses)
+        while todo:
+            cls = todo.pop()
+            yield cls
+            todo.extend(cls.subclasses)
+
     def find(self, name: str) -> Optional[Documentable]:
         """Look up a name in this class and its base classes.
 
@@ -846,6 +957,10 @@ class Inheritable(Documentable):
     def _localNameToFullName(self, name: str) -> str:
         return self.parent._localNameToFullName(name)
     
+    def expandName(self, name: str) -> str:
+        # Names are looked up in the parent scope, so share its cache.
+        return self.parent.expandName(name)
+
     def isNameDefined(self, name: str) -> bool:
         return self.parent.isNameDefined(name)
 
@@ -952,6 +1067,12 @@ class System:
         self.allobjects: Dict[str, Documentable] = {}
         self.rootobjects: List[_ModuleT] = []
 
+        self._names_generation = 0
+        """Incremented by L{_clearExpandNameCache}."""
+        self.expandName_hits = 0
+        self.expandName_misses = 0
+        """Number of calls to L{Documentable.expandName} answered from the cache or not."""
+
         self.violations = 0
         """The number of docstring problems found.
         This is used to determine whether to fail the build when using
@@ -977,12 +1098,31 @@ class System:
         self.needsnl = False
         self.once_msgs: Set[Tuple[str, str]] = set()
 
+        self._progress_time = 0.0
+        self._progress_pending: Optional[Tuple[str, int, Optional[int], str]] = None
+        self._isatty: Optional[Tuple[IO[str], bool]] = None
+        self._progress_stream: Optional[IO[str]] = None
+
         # We're using the id() of the modules as key, and not the fullName becaue modules can
         # be reparented, generating KeyError.
         self.unprocessed_modules: List[_ModuleT] = []
 
         self.module_count = 0
         self.processing_modules: List[str] = []
+        self._module_asts: Dict[_ModuleT, Optional[ast.Module]] = {}
+        """
+        ASTs of the modules parsed by L{process} before their processing, see L{_moduleProcessingOrder}.
+        """
+        self._module_imports: Dict[str, Dict[str, bool]] = {}
+        """
+        Full names of the modules imported by each module, by the full name of the importing module, 
+        mapped to whether they are processed before it. 
+        Recorded by L{_moduleProcessingOrder}, used by L{reprocessModules}.
+        """
+        self._module_updates: Dict[str, Set[str]] = {}
+        """
+        Full names of the modules whose objects were changed while processing each module, see L{_recordUpdate}.
+        """
         self.buildtime = datetime.datetime.now()
         self.intersphinx = SphinxInventory(logger=self.msg)
 
@@ -1034,19 +1174,77 @@ class System:
         """The top-level package/module names in this system."""
         return {obj.name for obj in self.rootobjects}
 
+    progress_interval = 0.1
+    """
+    Minimum delay in seconds between two progress updates. 
+    The last update of a section is always reported.
+    """
+
     def progress(self, section: str, i: int, n: Optional[int], msg: str) -> None:
+        """
+        Report the progress of a long operation. 
+
+        Updates are shown on the terminal when the verbosity is the default, 
+        and written as JSON lines to the file descriptor given with C{--progress-fd}.
+        """
+        pending = self._progress_pending
+        if pending is not None and pending[0] != section:
+            self._writeProgress(*pending)
+        now = time.monotonic()
+        if i != n and now - self._progress_time < self.progress_interval:
+            # Too soon, keep it for later.
+            self._progress_pending = (section, i, n, msg)
+            return
+        self._progress_time = now
+        self._writeProgress(section, i, n, msg)
+    
+    def flushProgress(self) -> None:
+        """
+        Report the last progress update if it was delayed, so the final count of a section 
+        is reported even when nothing follows it. Called when a build step is done.
+        """
+        pending = self._progress_pending
+        if pending is not None:
+            self._writeProgress(*pending)
+
+    def _writeProgress(self, section: str, i: int, n: Optional[int], msg: str) -> None:
+        self._progress_pending = None
         if n is None:
             d = str(i)
         else:
             d = f'{i}/{n}'
-        if self.options.verbosity == 0 and sys.stdout.isatty():
-            print('\r'+d, msg, end='')
-            sys.stdout.flush()
-            if d == n:
+        if self.options.verbosity == 0 and self._stdoutIsatty():
+            if i == n:
                 self.needsnl = False
-                print()
+                sys.stdout.write(f'\r{d} {msg}\n')
             else:
                 self.needsnl = True
+                sys.stdout.write(f'\r{d} {msg}')
+            sys.stdout.flush()
+        
+        stream = self._progressStream()
+        if stream is not None:
+            stream.write(json.dumps({'section': section, 'current': i, 'total': n, 
+                                     'msg': msg, 'time': time.time()}) + '\n')
+
+    def _stdoutIsatty(self) -> bool:
+        # The result is cached as long as sys.stdout is the same stream.
+        stdout = sys.stdout
+        cached = self._isatty
+        if cached is None or cached[0] is not stdout:
+            cached = self._isatty = (stdout, stdout.isatty())
+        return cached[1]
+    
+    def _progressStream(self) -> Optional[IO[str]]:
+        fd = self.options.progressfd
+        if fd is None:
+            return None
+        stream = self._progress_stream
+        if stream is None:
+            # Line buffered, so each update can be read as soon as it's written.
+            stream = self._progress_stream = os.fdopen(fd, 'w', 
+                encoding='utf-8', buffering=1, closefd=False)
+        return stream
 
     def msg(self,
             section: str,
@@ -1081,15 +1279,19 @@ class System:
             self.violations += 1
 
         if thresh <= self.options.verbosity <= topthresh:
+            if self._progress_pending is not None:
+                self._writeProgress(*self._progress_pending)
+            # Write the message at once, only flush the partial lines on a terminal.
             if self.needsnl and wantsnl:
-                print()
-            print(msg, end='')
+                msg = '\n' + msg
             if nonl:
                 self.needsnl = True
-                sys.stdout.flush()
+                sys.stdout.write(msg)
+                if self._stdoutIsatty():
+                    sys.stdout.flush()
             else:
                 self.needsnl = False
-                print('')
+                sys.stdout.write(msg + '\n')
 
     def objForFullName(self, fullName: str) -> Optional[Documentable]:
         return self.allobjects.get(fullName)
@@ -1187,6 +1389,9 @@ class System:
         if obj.parent:
             obj.parent.contents[obj.name] = obj
         elif isinstance(obj, _ModuleT):
+            # The URLs depend on the root names: only a single root module is documented in index.html.
+            for root in self.rootobjects:
+                root._clearNamesCache()
             self.rootobjects.append(obj)
         else:
             raise ValueError(f'Top-level object is not a module: {obj!r}')
@@ -1194,6 +1399,17 @@ class System:
         first = self.allobjects.setdefault(obj.fullName(), obj)
         if obj is not first:
             self.handleDuplicate(obj)
+        self._clearExpandNameCache()
+
+    def _clearExpandNameCache(self) -> None:
+        """
+        Forget the results of L{Documentable.expandName} cached in all scopes. 
+
+        Must be called whenever the names that can be resolved change: objects added, removed, 
+        renamed or reparented, names added to L{CanContainImportsDocumentable._localNameToFullName_map}, 
+        or the bases and MRO of a class changed.
+        """
+        self._names_generation += 1
 
     # if we assume:
     #
@@ -1386,6 +1602,7 @@ class System:
             break
     
     def _remove(self, o: Documentable) -> None:
+        self._clearExpandNameCache()
         del self.allobjects[o.fullName()]
         oc = list(o.contents.values())
         for c in oc:
@@ -1414,12 +1631,14 @@ class System:
         obj.report(f"duplicate {str(prev)}", thresh=1)
         self._remove(prev)
         prev.name = obj.name + ' ' + str(i)
+        prev._clearNamesCache()
         def readd(o: Documentable) -> None:
             self.allobjects[o.fullName()] = o
             for c in o.contents.values():
                 readd(c)
         readd(prev)
         self.allobjects[fullName] = obj
+        self._clearExpandNameCache()
 
 
     def getProcessedModule(self, modname: str) -> Optional[_ModuleT]:
@@ -1451,11 +1670,10 @@ class System:
             assert head == mod.fullName()
         else:
             builder = self.defaultBuilder(self)
-            if mod._py_string is not None:
-                ast = builder.parseString(mod._py_string, mod)
+            if mod in self._module_asts:
+                ast = self._module_asts.pop(mod)
             else:
-                assert mod.source_path is not None
-                ast = builder.parseFile(mod.source_path, mod)
+                ast = self._parseModule(builder, mod)
             if ast:
                 self.processing_modules.append(mod.fullName())
                 if mod._py_string is None:
@@ -1471,11 +1689,55 @@ class System:
             f"modules processed, {self.violations} warnings")
 
 
+    def _parseModule(self, builder: ASTBuilder, mod: _ModuleT) -> Optional[ast.Module]:
+        if mod._py_string is not None:
+            return builder.parseString(mod._py_string, mod)
+        else:
+            assert mod.source_path is not None
+            return builder.parseFile(mod.source_path, mod)
+
+    def _moduleProcessingOrder(self) -> List[_ModuleT]:
+        """
+        Parse the unprocessed modules and sort them such that the modules imported by a module 
+        come before it, so they are already processed when the module imports names from them. 
+        Modules importing each other are kept in the order they were added.
+
+        Processing a module still processes the modules it imports if they are not processed yet, 
+        but walking the modules in this order avoids deep recursions.
+        The parsed ASTs are stored to be used by L{processModule}, 
+        and the imported modules in L{_module_imports}.
+        """
+        builder = self.defaultBuilder(self)
+        modules = list(self.unprocessed_modules)
+        imports: Dict[_ModuleT, List[_ModuleT]] = {}
+        for mod in modules:
+            imports[mod] = []
+            dependencies = self._module_imports[mod.fullName()] = {}
+            if mod._is_c_module:
+                continue
+            mod_ast = self._module_asts[mod] = self._parseModule(builder, mod)
+            if mod_ast is None:
+                continue
+            for name, processed in builder.findImportedModules(mod_ast, mod):
+                imported = self.allobjects.get(name)
+                if isinstance(imported, Module) and imported is not mod:
+                    dependencies[name] = dependencies.get(name, False) or processed
+                    if processed:
+                        imports[mod].append(imported)
+        return [mod for component in utils.strongly_connected_components(modules, imports.__getitem__) 
+                    for mod in component]
+
     def process(self) -> None:
+        self._processModules()
+        self.postProcess()
+
+    def _processModules(self) -> None:
+        for mod in self._moduleProcessingOrder():
+            if mod.state is ProcessingState.UNPROCESSED:
+                self.processModule(mod)
         while self.unprocessed_modules:
             mod = next(iter(self.unprocessed_modules))
             self.processModule(mod)
-        self.postProcess()
 
 
     def postProcess(self) -> None:
@@ -1489,6 +1751,233 @@ class System:
         """
         self._post_processor.apply_processors()
 
+    def _recordUpdate(self, ob: Documentable) -> None:
+        """
+        Record that the module being processed changed an object of another module, 
+        like with a C{__doc__} assignment: both modules must be processed again when 
+        one of them changes, see L{reprocessModules}.
+        """
+        if self.processing_modules:
+            current = self.processing_modules[-1]
+            target = (ob if isinstance(ob, Module) else ob.module).fullName()
+            if target != current:
+                self._module_updates.setdefault(current, set()).add(target)
+
+    def reprocessModules(self, paths: Iterable[Path]) -> Optional[Set[Documentable]]:
+        """
+        Update the system after some source files changed: process their modules again, 
+        then run the post-processors again. Used by C{--watch}.
+
+        The modules that depend on a changed module are processed again with it, see L{_dependentModules}. 
+        The modules importing it are processed again afterwards only if its names changed, and so on.
+
+        @param paths: The source files that changed.
+        @returns: The objects whose page must be written again: the objects of the changed modules, 
+            their packages and their L{related objects <Documentable.relatedObjects>}. 
+            The other modules processed again give the same objects.
+            All the objects if some names were added, removed or now resolve to something else, 
+            since any page can link to them.
+            C{None} if the system can't be updated and must be built again from scratch: when a module 
+            is added or removed, was not built from a python source file, was moved by a re-export, 
+            or when the C{__docformat__} of a package changed. The system must not be used anymore in the last case.
+        """
+        modules_by_path: Dict[Path, _ModuleT] = {}
+        for mod in self.objectsOfType(_ModuleT):
+            if mod.parentMod not in (None, mod):
+                return None
+            if mod.source_path is not None:
+                modules_by_path[mod.source_path] = mod
+        todo: Set[_ModuleT] = set()
+        for path in paths:
+            changed = modules_by_path.get(path)
+            if changed is None:
+                return None
+            todo.add(changed)
+        
+        # What the pages of other objects show about the objects of the modules processed again, 
+        # before they were processed again.
+        old_names: Dict[str, Tuple[object, ...]] = {}
+        # The objects showing information about them, by module.
+        old_related: Dict[str, Set[str]] = {}
+        # The modules whose objects changed.
+        modified: Set[str] = set()
+        # The warnings are counted for the modules processed again and the pages written again.
+        self.violations = 0
+        
+        while todo:
+            dependents = self._dependentModules(todo, modules_by_path)
+            if dependents is None:
+                return None
+            modules, changed_modules = dependents
+            modified.update(mod.fullName() for mod in changed_modules)
+            objects = _objectsByModule(self)
+            names = {mod.fullName(): _namesTable(objects[mod]) for mod in modules}
+            docformats = {mod.fullName(): mod.docformat for mod in modules if isinstance(mod, Package)}
+            for mod in modules:
+                if mod.fullName() not in old_related:
+                    old_names.update(names[mod.fullName()])
+                    old_related[mod.fullName()] = {r.fullName() for ob in objects[mod] for r in ob.relatedObjects()}
+            stale = {ob.fullName() for mod in modules for ob in objects[mod]}
+            for errors in self.parse_errors.values():
+                errors -= stale
+            
+            for mod in modules:
+                for ob in objects[mod]:
+                    if ob is not mod:
+                        del self.allobjects[ob.fullName()]
+                self._module_updates.pop(mod.fullName(), None)
+                self._unloadModule(mod)
+            self._clearExpandNameCache()
+            self._processModules()
+            components = self._moduleComponents()
+            self._sortObjects(components)
+            # The post-processors reset the state they derive from the whole system.
+            self._post_processor.applied.clear()
+            self.postProcess()
+            
+            for name, docformat in docformats.items():
+                if cast(_ModuleT, self.allobjects[name]).docformat != docformat:
+                    return None
+            objects = _objectsByModule(self)
+            todo = set()
+            for name, table in names.items():
+                if _namesTable(objects[cast(_ModuleT, self.allobjects[name])]) != table:
+                    # The modules importing names from this module are processed again.
+                    for importer, imported in self._module_imports.items():
+                        if name in imported and importer not in names:
+                            todo.add(cast(_ModuleT, self.allobjects[importer]))
+            for component in components:
+                # Some modules now import each other: they are processed together, like in a full build.
+                if any(mod.fullName() in names for mod in component):
+                    todo.update(mod for mod in component if mod.fullName() not in names)
+        
+        objects = _objectsByModule(self)
+        new_objects = [ob for name in old_related for ob in objects[cast(_ModuleT, self.allobjects[name])]]
+        if _namesTable(new_objects) != old_names:
+            return set(self.allobjects.values())
+        
+        new_modules = [cast(_ModuleT, self.allobjects[name]) for name in modified]
+        pages: Set[Documentable] = set()
+        for mod in new_modules:
+            for ob in objects[mod]:
+                pages.add(ob)
+                pages.update(ob.relatedObjects())
+            # The packages list their modules.
+            parent = mod.parent
+            while parent is not None:
+                pages.add(parent)
+                parent = parent.parent
+            pages.update(ob for ob in map(self.allobjects.get, old_related[mod.fullName()]) if ob is not None)
+        return pages
+
+    def _dependentModules(self, changed: Iterable[_ModuleT], modules_by_path: Mapping[Path, _ModuleT]
+                          ) -> Optional[Tuple[List[_ModuleT], Set[_ModuleT]]]:
+        """
+        Find the modules to process again with the changed modules. 
+        
+        The changed modules include the modules whose objects they change or that change their objects, 
+        like with C{__doc__} assignments, and the modules they re-export objects from or that re-export their objects. 
+        They are processed again with the modules they import each other with, so the objects are added 
+        in the same order as in a full build, see L{_sortObjects}, and with the modules of the subclasses 
+        of their classes, since the base classes are replaced.
+
+        @returns: The modules to process again, in the order they were added, and the changed modules. 
+            C{None} if one of them was not built from a python source file.
+        """
+        component_of = {mod: component for component in self._moduleComponents() for mod in component}
+        links: Dict[_ModuleT, Set[_ModuleT]] = {}
+        def link(mod: _ModuleT, other: _ModuleT) -> None:
+            links.setdefault(mod, set()).add(other)
+            links.setdefault(other, set()).add(mod)
+        for name, updated in self._module_updates.items():
+            for u in updated:
+                link(cast(_ModuleT, self.allobjects[name]), cast(_ModuleT, self.allobjects[u]))
+        for mod in component_of:
+            for ob in mod.contents.values():
+                # The re-exported objects are moved back to their module when it's processed again.
+                if not isinstance(ob, _ModuleT) and ob.source_path is not None and ob.source_path != mod.source_path:
+                    origin = modules_by_path.get(ob.source_path)
+                    if origin is not None:
+                        link(mod, origin)
+        
+        modified: Set[_ModuleT] = set()
+        todo = list(changed)
+        while todo:
+            mod = todo.pop()
+            if mod not in modified:
+                modified.add(mod)
+                todo.extend(links.get(mod, ()))
+        
+        affected: Set[_ModuleT] = set()
+        todo = list(modified)
+        while todo:
+            while todo:
+                mod = todo.pop()
+                if mod in affected:
+                    continue
+                if mod._is_c_module or mod._py_string is not None:
+                    return None
+                affected.add(mod)
+                todo.extend(component_of[mod])
+                todo.extend(links.get(mod, ()))
+            # The subclasses hold references to the base classes.
+            for cls in self.objectsOfType(Class):
+                mod = _owningModule(cls)
+                if mod not in affected and any(b is not None and _owningModule(b) in affected 
+                        for b in chain(cls._initialbaseobjects, cls._finalbaseobjects or ())):
+                    todo.append(mod)
+        return [mod for mod in component_of if mod in affected], modified
+
+    def _moduleComponents(self) -> List[List[_ModuleT]]:
+        """
+        Group the modules importing each other, in the order L{_moduleProcessingOrder} sorts them for a full build. 
+        """
+        modules = [ob for ob in self.allobjects.values() if isinstance(ob, _ModuleT)]
+        def imported(mod: _ModuleT) -> Iterator[_ModuleT]:
+            for name, processed in self._module_imports.get(mod.fullName(), {}).items():
+                ob = self.allobjects.get(name)
+                if processed and isinstance(ob, _ModuleT):
+                    yield ob
+        return utils.strongly_connected_components(modules, imported)
+
+    def _sortObjects(self, components: Sequence[Sequence[_ModuleT]]) -> None:
+        """
+        Sort L{allobjects} like a full build adds them after some modules are processed again: 
+        the modules first, then the objects of the modules in processing order. 
+        This keeps the order of the objects in the summary pages, and of the post-processors.
+        
+        @param components: The modules, as returned by L{_moduleComponents}.
+        """
+        position = {mod: i for i, component in enumerate(components) for mod in component}
+        items = sorted(self.allobjects.items(), 
+            key=lambda item: -1 if isinstance(item[1], _ModuleT) else position[_owningModule(item[1])])
+        self.allobjects.clear()
+        self.allobjects.update(items)
+
+    def _unloadModule(self, mod: _ModuleT) -> None:
+        """
+        Replace a module by a new unprocessed module with the same submodules, 
+        so it's processed again, see L{reprocessModules}. 
+        The objects of the module must be removed from L{allobjects} beforehand.
+        """
+        assert mod.source_path is not None
+        parent = mod.parent
+        factory = self.Package if isinstance(mod, Package) else self.Module
+        new = factory(self, mod.name, parent, mod.source_path)
+        for ob in mod.contents.values():
+            if isinstance(ob, _ModuleT):
+                new.contents[ob.name] = ob
+                ob.parent = new
+                # The linker resolves names in the parent scope.
+                ob._linker = None
+        if parent is None:
+            self.rootobjects[self.rootobjects.index(mod)] = new
+        else:
+            parent.contents[mod.name] = new
+        self.allobjects[new.fullName()] = new
+        self.unprocessed_modules.append(new)
+        self.setSourceHref(new, mod.source_path)
+
     def fetchIntersphinxInventories(self, cache: CacheT) -> None:
         """
         Download and parse intersphinx inventories based on configuration.
@@ -1496,10 +1985,59 @@ class System:
         for url in self.options.intersphinx:
             self.intersphinx.update(cache, url)
 
+def _owningModule(ob: Documentable) -> Module:
+    """
+    The module an object is defined in, or re-exported by. 
+    Unlike L{Documentable.module}, this follows the parents of the object.
+    """
+    while not isinstance(ob, Module):
+        assert ob.parent is not None
+        ob = ob.parent
+    return ob
+
+def _objectsByModule(system: System) -> Dict[Module, List[Documentable]]:
+    """
+    Group the objects of the system by L{owning module <_owningModule>}, modules included.
+    """
+    objects: Dict[Module, List[Documentable]] = {}
+    for ob in system.allobjects.values():
+        objects.setdefault(_owningModule(ob), []).append(ob)
+    return objects
+
+def _namesTable(objects: Iterable[Documentable]) -> Dict[str, Tuple[object, ...]]:
+    """
+    What the pages of other objects can show about these objects when they link to them: 
+    the names they resolve and their URLs, kinds and privacy, and what other modules can import from them. 
+    See L{System.reprocessModules}.
+    """
+    table: Dict[str, Tuple[object, ...]] = {}
+    for ob in objects:
+        entry: Tuple[object, ...] = (type(ob), ob.kind, ob.privacyClass, ob.isVisible, ob.url)
+        if isinstance(ob, CanContainImportsDocumentable):
+            entry += (dict(ob._localNameToFullName_map),)
+        if isinstance(ob, Module):
+            # The names imported with a wildcard.
+            entry += (ob.all,)
+        if isinstance(ob, Class):
+            # The inherited members are resolved with the MRO.
+            entry += (tuple(b if isinstance(b, str) else b.fullName() for b in ob.mro(True)),)
+        table[ob.fullName()] = entry
+    return table
+
 def defaultPostProcess(system:'System') -> None:
+    # The system is post-processed again when some modules are processed again, 
+    # see System.reprocessModules(): forget the results of the previous pass.
+    for cls in system.objectsOfType(Class):
+        cls._finalbaseobjects = None
+        cls._finalbases = None
+        cls._mro = None
+        cls.subclasses = []
+
+    # The linearizations of the base classes are computed only once.
+    mro_cache: Dict[Union[Class, str], List[Union[Class, str]]] = {}
     for cls in system.objectsOfType(Class):
         # Initiate the MROs
-        cls._init_mro()
+        cls._init_mro(mro_cache)
 
         # Compute subclasses
         for b in cls.baseobjects:
@@ -1510,23 +2048,42 @@ def defaultPostProcess(system:'System') -> None:
         if is_exception(cls):
             cls.kind = DocumentableKind.EXCEPTION
             
-    for attrib in system.objectsOfType(Attribute):
-       _inherits_instance_variable_kind(attrib)
+def resolveDocsources(system: 'System') -> None:
+    """
+    Walk the base classes once for every member: store the result of L{Documentable.docsources()}, 
+    used by L{get_docstring} to find inherited docstrings, and infer the kind of inherited instance variables.
 
-def _inherits_instance_variable_kind(attr: Attribute) -> None:
+    This runs after the other post-processors, when the MROs are final.
+    """
+    generation = system._names_generation
+    for ob in system.objectsOfType(Inheritable):
+        sources = tuple(ob.docsources())
+        ob._docsources = (generation, sources)
+        if isinstance(ob, Attribute):
+            _inherits_instance_variable_kind(ob, sources)
+
+def _inherits_instance_variable_kind(attr: Attribute, docsources: Sequence[Documentable]) -> None:
     """
     If any of the inherited members of a class variable is an instance variable,
     then the subclass' class variable become an instance variable as well.
     """
     if attr.kind is not DocumentableKind.CLASS_VARIABLE:
         return
-    docsources = attr.docsources()
-    next(docsources)
-    for inherited in docsources:
+    for inherited in docsources[1:]:
         if inherited.kind is DocumentableKind.INSTANCE_VARIABLE:
             attr.kind = DocumentableKind.INSTANCE_VARIABLE
             break
 
+def get_docsources(obj: Documentable) -> Sequence[Documentable]:
+    """
+    Same as L{Documentable.docsources()}, but uses the result stored by L{resolveDocsources} 
+    when the names of the system have not changed since.
+    """
+    stored = obj._docsources
+    if stored is not None and stored[0] == obj.system._names_generation:
+        return stored[1]
+    return tuple(obj.docsources())
+
 def get_docstring(
         obj: Documentable
         ) -> Tuple[Optional[str], Optional[Documentable]]:
@@ -1539,7 +2096,7 @@ def get_docstring(
         - C{(None, None)} if the object has no docstring (even inherited).
         - C{(None, source)} if the object has an empty docstring.
     """
-    for source in obj.docsources():
+    for source in get_docsources(obj):
         doc = source.docstring
         if doc:
             return doc, source
@@ -25,112 +25,75 @@ C3 linearization algorithm.
 """
 from __future__ import annotations
 
-from collections import deque
-from itertools import islice
-from typing import Callable, List, Tuple, Optional, TypeVar
+from collections import Counter
+from typing import Callable, Hashable, List, MutableMapping, Optional, Sequence, TypeVar
 
-T = TypeVar('T')
+T = TypeVar('T', bound=Hashable)
 
-class Dependency(deque):
-    @property
-    def head(self) -> Optional[T]:
-        try:
-            return self[0]
-        except IndexError:
-            return None
-
-    @property
-    def tail(self) -> islice: 
-        """
-        Return islice object, which is suffice for iteration or calling `in`
-        """
-        try:
-            return islice(self, 1, self.__len__())
-        except (ValueError, IndexError):
-            return islice([], 0, 0)
-
-
-class DependencyList:
+def _merge(*lists: Sequence[T]) -> List[T]:
     """
-    A class represents list of linearizations (dependencies)
-    The last element of DependencyList is a list of parents.
-    It's needed  to the merge process preserves the local
-    precedence order of direct parent classes.
-    """
-    def __init__(self, *lists: Tuple[List[T]]) -> None:
-        self._lists = [Dependency(i) for i in lists]
-
-    def __contains__(self, item: T) -> bool:
-        """
-        Return True if any linearization's tail contains an item
-        """
-        return any([item in l.tail for l in self._lists])
-
-    def __len__(self):
-        size = len(self._lists)
-        return (size - 1) if size else 0
-
-    def __repr__(self):
-        return self._lists.__repr__()
-
-    @property
-    def heads(self) -> List[Optional[T]]:
-        return [h.head for h in self._lists]
-
-    @property
-    def tails(self) -> 'DependencyList':
-        """
-        Return self so that __contains__ could be called
-        Used for readability reasons only
-        """
-        return self
-
-    @property
-    def exhausted(self) -> bool:
-        """
-        Return True if all elements of the lists are exhausted
-        """
-        return all(map(lambda x: len(x) == 0, self._lists))
-
-    def remove(self, item: Optional[T]) -> None:
-        """
-        Remove an item from the lists
-        Once an item removed from heads, the leftmost elements of the tails
-        get promoted to become the new heads.
-        """
-        for i in self._lists:
-            if i and i.head == item:
-                i.popleft()
-
-
-def _merge(*lists) -> list:
-    result: List[Optional[T]] = []
-    linearizations = DependencyList(*lists)
+    Merge the linearizations of the bases and the list of bases itself.
 
+    Instead of building the heads and scanning all tails at each step, the number of tails 
+    each item currently belongs to is tracked: an item is a good head when this count drops to zero. 
+    Each step costs at most one pass over the heads and popping a head updates the counts in constant time.
+    """
+    seqs = [l for l in lists if l]
+    # Index of the current head of each sequence.
+    heads = [0] * len(seqs)
+    in_tails: Counter[T] = Counter()
+    for seq in seqs:
+        in_tails.update(seq[1:])
+    
+    result: List[T] = []
     while True:
-        if linearizations.exhausted:
-            return result
-
-        for head in linearizations.heads:
-            if head and (head not in linearizations.tails):
-                result.append(head)
-                linearizations.remove(head)
-
-                # Once candidate is found, continue iteration
-                # from the first element of the list
+        candidate: Optional[T] = None
+        exhausted = True
+        for seq, h in zip(seqs, heads):
+            if h == len(seq):
+                continue
+            exhausted = False
+            if not in_tails[seq[h]]:
+                candidate = seq[h]
                 break
-        else:
-            # Loop never broke, no linearization could possibly be found
+        if exhausted:
+            return result
+        if candidate is None:
+            # No linearization could possibly be found
             raise ValueError('Cannot compute linearization of the class inheritance hierarchy')
-
-
-def mro(cls: T, getbases: Callable[[T], List[T]]) -> List[T]:
+        
+        result.append(candidate)
+        # Once removed from the heads, the leftmost elements of the tails
+        # get promoted to become the new heads.
+        for i, seq in enumerate(seqs):
+            h = heads[i]
+            if h < len(seq) and seq[h] == candidate:
+                h += 1
+                heads[i] = h
+                if h < len(seq):
+                    in_tails[seq[h]] -= 1
+
+
+def mro(cls: T, getbases: Callable[[T], List[T]], 
+        cache: Optional[MutableMapping[T, List[T]]] = None) -> List[T]:
     """
     Return a list of classes in order corresponding to Python's MRO.
+
+    @param cache: Linearizations already computed, they are reused instead of being computed again 
+        for each class sharing the same bases. Pass the same mapping to compute the MRO of several 
+        classes of a hierarchy; it's populated with the linearization of C{cls} and all its bases.
+        The linearization returned are shared with the cache, they must not be modified.
     """
+    if cache is None:
+        cache = {}
+    try:
+        return cache[cls]
+    except KeyError:
+        pass
+    
+    bases = getbases(cls)
     result = [cls]
-
-    if not getbases(cls):
-        return result
-    else:
-        return result + _merge(*[mro(kls, getbases) for kls in getbases(cls)], getbases(cls))
+    if bases:
+        result += _merge(*[mro(kls, getbases, cache) for kls in bases], bases)
+    cache[cls] = result
+    return result
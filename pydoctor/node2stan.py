@@ -221,59 +221,65 @@ class HTMLTranslator(html4css1.HTMLTranslator):
         node.insert(0, nodes.title(name, name.title()))
         self.set_first_last(node)
 
+    def _depart_admonition(self, node: nodes.Node) -> None:
+        self.depart_admonition(node)
+        # Remove the title inserted by _visit_admonition(): the docstring is 
+        # rendered the same way again, and its text does not include the title.
+        del node[0]
+
     def visit_note(self, node: nodes.Node) -> None:
         self._visit_admonition(node, 'note')
 
     def depart_note(self, node: nodes.Node) -> None:
-        self.depart_admonition(node)
+        self._depart_admonition(node)
 
     def visit_warning(self, node: nodes.Node) -> None:
         self._visit_admonition(node, 'warning')
 
     def depart_warning(self, node: nodes.Node) -> None:
-        self.depart_admonition(node)
+        self._depart_admonition(node)
 
     def visit_attention(self, node: nodes.Node) -> None:
         self._visit_admonition(node, 'attention')
 
     def depart_attention(self, node: nodes.Node) -> None:
-        self.depart_admonition(node)
+        self._depart_admonition(node)
 
     def visit_caution(self, node: nodes.Node) -> None:
         self._visit_admonition(node, 'caution')
 
     def depart_caution(self, node: nodes.Node) -> None:
-        self.depart_admonition(node)
+        self._depart_admonition(node)
 
     def visit_danger(self, node: nodes.Node) -> None:
         self._visit_admonition(node, 'danger')
 
     def depart_danger(self, node: nodes.Node) -> None:
-        self.depart_admonition(node)
+        self._depart_admonition(node)
 
     def visit_error(self, node: nodes.Node) -> None:
         self._visit_admonition(node, 'error')
 
     def depart_error(self, node: nodes.Node) -> None:
-        self.depart_admonition(node)
+        self._depart_admonition(node)
 
     def visit_hint(self, node: nodes.Node) -> None:
         self._visit_admonition(node, 'hint')
 
     def depart_hint(self, node: nodes.Node) -> None:
-        self.depart_admonition(node)
+        self._depart_admonition(node)
 
     def visit_important(self, node: nodes.Node) -> None:
         self._visit_admonition(node, 'important')
 
     def depart_important(self, node: nodes.Node) -> None:
-        self.depart_admonition(node)
+        self._depart_admonition(node)
 
     def visit_tip(self, node: nodes.Node) -> None:
         self._visit_admonition(node, 'tip')
 
     def depart_tip(self, node: nodes.Node) -> None:
-        self.depart_admonition(node)
+        self._depart_admonition(node)
 
     def visit_wbr(self, node: nodes.Node) -> None:
         self.body.append('<wbr></wbr>')
@@ -285,7 +291,7 @@ class HTMLTranslator(html4css1.HTMLTranslator):
         self._visit_admonition(node, 'see also')
 
     def depart_seealso(self, node: nodes.Node) -> None:
-        self.depart_admonition(node)
+        self._depart_admonition(node)
 
     def visit_versionmodified(self, node: nodes.Node) -> None:
         self.body.append(self.starttag(node, 'div', CLASS=node['type']))
@@ -133,6 +133,41 @@ def get_parser() -> ArgumentParser:
     parser.add_argument(
         '--html-output', dest='htmloutput', default='apidocs',
         help=("Directory to save HTML files to (default 'apidocs')"), metavar='PATH')
+    parser.add_argument(
+        '--static-assets', dest='static_assets', default='copy', choices=['copy', 'link'],
+        help=("How the static files of the theme (CSS, JS, fonts) are deployed in the output directory: "
+              "'copy' them or hard 'link' them to the installed theme files, falling back to a copy when not possible. "
+              "Files that are already up to date are not written again. (default: copy)"))
+    parser.add_argument(
+        '--static-assets-store', dest='static_assets_store', default=None, metavar='PATH',
+        help=("Directory where the static files are stored once, named by the hash of their contents. "
+              "They are hard linked from there into the output directory, so several sites can share the same files."))
+    parser.add_argument(
+        '--write-changed-only', dest='write_changed_only', action='store_true', default=False,
+        help=("Only replace the output files whose content changed, so the others keep their modification time, "
+              "and delete the pages of the previous build that are not generated anymore. "
+              "The files are listed with their hash in the '.pydoctor-manifest.json' file of the output directory. "
+              "Pages include the build time: pass a fixed --buildtime so they do not all change. "
+              "Implied by --watch."))
+    parser.add_argument(
+        '--minify-html', dest='minify_html', action='store_true', default=False,
+        help=("Remove the whitespace that is not displayed and the comments from the HTML output, "
+              "to make the pages smaller. The templates are minified once, when they are loaded."))
+    parser.add_argument(
+        '--split-summary-pages', dest='split_summary_pages', action='store_true', default=False,
+        help=("Split the module index, class hierarchy, index of names and summary of undocumented objects "
+              "in one page per second level package (one page per initial letter for the index of names). "
+              "The main summary pages only link to these pages. Useful for very large systems."))
+    parser.add_argument(
+        '--precompress', dest='precompress', action='store_true', default=False,
+        help=("Write gzip compressed copies of the HTML pages, JSON files and static assets next to them (.gz files), "
+              "and Brotli compressed copies (.br files) if the Brotli package is installed, "
+              "for web servers that serve pre-compressed files. The files are compressed by a pool of processes. "
+              "Not supported by the archive writers of pydoctor.templatewriter.archive."))
+    parser.add_argument(
+        '--write-threads', dest='write_threads', type=int, default=4, metavar='N',
+        help=("Number of background threads writing the output files while the next pages are rendered. "
+              "Use 0 to write the files from the main thread. (default: 4)"))
     parser.add_argument(
         '--html-writer', dest='htmlwriter',
         default='pydoctor.templatewriter.TemplateWriter', 
@@ -168,6 +203,10 @@ def get_parser() -> ArgumentParser:
         '--quiet', '-q', action='count', dest='quietness',
         default=0,
         help=("Be quieter."))
+    parser.add_argument(
+        '--progress-fd', dest='progressfd', type=int, default=None, metavar='FD',
+        help=("Write the progress updates as JSON lines to this file descriptor. "
+              "Each line has the keys 'section', 'current', 'total', 'msg' and 'time'."))
     
     parser.add_argument(
         '--introspect-c-modules', default=False, action='store_true',
@@ -234,6 +273,21 @@ def get_parser() -> ArgumentParser:
         '--no-sidebar', default=False, action='store_true', dest='nosidebar',
         help=("Do not generate the sidebar at all."))
     
+    parser.add_argument(
+        '--no-all-documents-html', default=False, action='store_true', dest='noalldocumentshtml',
+        help=("Do not generate all-documents.html, the HTML list of all documented objects. "
+              "The search only uses all-documents.json."))
+    
+    parser.add_argument(
+        '--watch', default=False, action='store_true', dest='watch',
+        help=("Keep running after the build and update it each time a python source file "
+              "under the source paths changes: only the changed modules and the modules depending on them "
+              "are processed again, and only the pages whose content changed are written again. "
+              "Stop with Ctrl+C."))
+    parser.add_argument(
+        '--watch-interval', metavar='SECONDS', type=float, default=1.0, dest='watch_interval',
+        help=("How often the source paths are checked for changes with --watch. (default: 1.0)"))
+    
     parser.add_argument(
         '--system-class', dest='systemclass', default=DEFAULT_SYSTEM,
         help=("A dotted name of the class to use to make a system."))
@@ -282,6 +336,9 @@ def _convert_templatedir(l: List[str]) -> List[Path]:
 def _convert_projectbasedirectory(s: Optional[str]) -> Optional[Path]:
     if s: return parse_path(s, opt='--project-base-dir')
     else: return None
+def _convert_static_assets_store(s: Optional[str]) -> Optional[Path]:
+    if s: return parse_path(s, opt='--static-assets-store')
+    else: return None
 def _convert_systemclass(s: str) -> Type['model.System']:
     try:
         return findClassFromDottedName(s, '--system-class', base_class='pydoctor.model.System')
@@ -356,12 +413,20 @@ class Options:
     htmlsummarypages:       bool                                    = attr.ib()
     htmloutput:             str                                     = attr.ib() # TODO: make this a Path object once https://github.com/twisted/pydoctor/pull/389/files is merged
     htmlwriter:             Type['IWriter']                         = attr.ib(converter=_convert_htmlwriter)
+    static_assets:          'Literal["copy", "link"]'               = attr.ib()
+    static_assets_store:    Optional[Path]                          = attr.ib(converter=_convert_static_assets_store)
+    write_changed_only:     bool                                    = attr.ib()
+    minify_html:            bool                                    = attr.ib()
+    split_summary_pages:    bool                                    = attr.ib()
+    precompress:            bool                                    = attr.ib()
+    write_threads:          int                                     = attr.ib()
     htmlsourcebase:         Optional[str]                           = attr.ib()
     htmlsourcetemplate:     str                                     = attr.ib()
     buildtime:              Optional[str]                           = attr.ib()
     warnings_as_errors:     bool                                    = attr.ib()
     verbosity:              int                                     = attr.ib()
     quietness:              int                                     = attr.ib()
+    progressfd:             Optional[int]                           = attr.ib()
     introspect_c_modules:   bool                                    = attr.ib()
     intersphinx:            List[str]                               = attr.ib()
     enable_intersphinx_cache:   bool                                = attr.ib()
@@ -373,8 +438,11 @@ class Options:
     sidebarexpanddepth:     int                                     = attr.ib()
     sidebartocdepth:        int                                     = attr.ib()
     nosidebar:              int                                     = attr.ib()
+    noalldocumentshtml:     bool                                    = attr.ib()
     cls_member_order:       'Literal["alphabetical", "source"]'     = attr.ib()
     mod_member_order:       'Literal["alphabetical", "source"]'     = attr.ib()
+    watch:                  bool                                    = attr.ib()
+    watch_interval:         float                                   = attr.ib()
 
     def __attrs_post_init__(self) -> None:
         # do some validations...
@@ -385,6 +453,15 @@ class Options:
         if self.sidebartocdepth < 0:
             error("Invalid --sidebar-toc-depth value" + 'The value of --sidebar-toc-depth option should be greater or equal to 0, '
                                 'to suppress sidebar generation all together: use --no-sidebar')
+        if self.watch_interval <= 0:
+            error("Invalid --watch-interval value. The value of --watch-interval option should be greater than 0.")
+        if self.write_threads < 0:
+            error("Invalid --write-threads value. The value of --write-threads option should be greater or equal to 0.")
+        if self.precompress:
+            from pydoctor.templatewriter.archive import ArchiveWriter
+            if issubclass(self.htmlwriter, ArchiveWriter):
+                error("Invalid --precompress option. The archive writers do not write compressed copies of the files, "
+                      f"do not use --precompress with --html-writer={self.htmlwriter.__module__}.{self.htmlwriter.__name__}")
             
     # HIGH LEVEL FACTORY METHODS
 
@@ -3,24 +3,23 @@ Support for Sphinx compatibility.
 """
 from __future__ import annotations
 
+from contextlib import contextmanager, nullcontext
 import logging
 import os
 import shutil
 import textwrap
 import zlib
 from typing import (
-    TYPE_CHECKING, Callable, ContextManager, Dict, IO, Iterable, Mapping,
-    Optional, Tuple
+    TYPE_CHECKING, Callable, ContextManager, Dict, IO, Iterable, Iterator, List, 
+    Mapping, Optional, Tuple
 )
 
 import appdirs
 import attr
-import requests
-from cachecontrol import CacheControl
-from cachecontrol.caches import FileCache
-from cachecontrol.heuristics import ExpiresAfter
 
 if TYPE_CHECKING:
+    # requests and cachecontrol are only imported when the intersphinx cache is used.
+    import requests
     from pydoctor.model import Documentable
     from typing_extensions import Protocol
 
@@ -198,13 +197,35 @@ class SphinxInventoryWriter:
         """
         Generate Sphinx objects inventory version 2 at `basepath`/objects.inv.
         """
+        with self.stream(basepath) as add:
+            for obj in self._iterObjects(subjects):
+                add(obj)
+
+    @contextmanager
+    def stream(self, basepath: str, fobj: Optional[IO[bytes]] = None) -> Iterator[Callable[[Documentable], None]]:
+        """
+        Open the Sphinx objects inventory at `basepath`/objects.inv and 
+        yield a function that adds one object to it. 
+        
+        The lines are compressed as they are added, so the inventory can be 
+        generated while walking the objects for other purposes, like writing the HTML pages.
+        Only visible objects should be added, parents first.
+
+        @param fobj: If given, the inventory is written to this file instead, 
+            it is not closed.
+        """
         path = os.path.join(basepath, 'objects.inv')
         self.info('sphinx', 'Generating objects inventory at %s' % (path,))
 
-        with self._openFileForWriting(path) as target:
+        with self._openFileForWriting(path) if fobj is None else nullcontext(fobj) as target:
             target.write(self._generateHeader())
-            content = self._generateContent(subjects)
-            target.write(zlib.compress(content))
+            compressor = zlib.compressobj()
+            def add(obj: Documentable) -> None:
+                data = compressor.compress(self._generateLine(obj).encode('utf-8'))
+                if data:
+                    target.write(data)
+            yield add
+            target.write(compressor.flush())
 
     def _openFileForWriting(self, path: str) -> ContextManager[IO[bytes]]:
         """
@@ -222,18 +243,26 @@ class SphinxInventoryWriter:
 # The rest of this file is compressed with zlib.
 """.encode('utf-8')
 
+    def _iterObjects(self, subjects: Iterable[Documentable]) -> Iterator[Documentable]:
+        """
+        Iterate over the visible `subjects` and their visible members, recursively, parents first.
+        """
+        # Iterative depth-first walk: the stack holds the iterators of the members being visited.
+        stack: List[Iterator[Documentable]] = [iter(subjects)]
+        while stack:
+            for obj in stack[-1]:
+                if obj.isVisible:
+                    yield obj
+                    stack.append(iter(obj.contents.values()))
+                    break
+            else:
+                stack.pop()
+
     def _generateContent(self, subjects: Iterable[Documentable]) -> bytes:
         """
         Write inventory for all `subjects`.
         """
-        content = []
-        for obj in subjects:
-            if not obj.isVisible:
-                continue
-            content.append(self._generateLine(obj).encode('utf-8'))
-            content.append(self._generateContent(obj.contents.values()))
-
-        return b''.join(content)
+        return ''.join(map(self._generateLine, self._iterObjects(subjects))).encode('utf-8')
 
     def _generateLine(self, obj: Documentable) -> str:
         """
@@ -381,6 +410,10 @@ class IntersphinxCache(CacheT):
             age of any cache entry.
         @see: L{parseMaxAge}
         """
+        from cachecontrol import CacheControl
+        from cachecontrol.caches import FileCache
+        from cachecontrol.heuristics import ExpiresAfter
+
         session = CacheControl(sessionFactory(),
                                cache=FileCache(cachePath),
                                heuristic=ExpiresAfter(**maxAgeDictionary))
@@ -410,7 +443,7 @@ def prepareCache(
         enableCache: bool,
         cachePath: str,
         maxAge: str,
-        sessionFactory: Callable[[], requests.Session] = requests.Session,
+        sessionFactory: Optional[Callable[[], requests.Session]] = None,
         ) -> IntersphinxCache:
     """
     Prepare an Intersphinx cache.
@@ -421,9 +454,12 @@ def prepareCache(
     @param maxAge: The maximum age in seconds of cached Intersphinx
         C{objects.inv} files.
     @param sessionFactory: (optional) A zero-argument L{callable} that
-        returns a L{requests.Session}.
+        returns a L{requests.Session}. Defaults to L{requests.Session}.
     @return: A L{IntersphinxCache} instance.
     """
+    if sessionFactory is None:
+        import requests
+        sessionFactory = requests.Session
     if clearCache:
         shutil.rmtree(cachePath)
     if enableCache:
@@ -15,6 +15,9 @@ Inside the Sphinx conf.py file you need to define the following configuration op
   - C{pydoctor_args} - Sequence with all the pydoctor command line arguments used to trigger the build.
                      - (private usage) a mapping with values as sequence of pydoctor command line arguments.
 
+  - C{pydoctor_jobs} - (optional) Number of pydoctor builds to run in parallel worker processes.
+                      By default, the builds run one after the other in the Sphinx process.
+
 The following format placeholders are resolved for C{pydoctor_args} at runtime:
   - C{{outdir}} - the Sphinx output dir
 
@@ -26,9 +29,13 @@ from __future__ import annotations
 import os
 import pathlib
 import shutil
+import subprocess
+import sys
+from argparse import Namespace
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import redirect_stdout
 from io import StringIO
-from typing import Any, Sequence, Mapping
+from typing import Any, Dict, List, Sequence, Mapping, Set, Tuple
 
 from sphinx.application import Sphinx
 from sphinx.errors import ConfigError
@@ -100,25 +107,46 @@ def on_builder_inited(app: Sphinx) -> None:
     if not isinstance(pydoctor_url_path, Mapping):
         pydoctor_url_path = {'main': pydoctor_url_path}
 
+    builds: List[Tuple[str, Sequence[str], Namespace]] = []
     for key, value in runs.items():
         arguments = _get_arguments(value, placeholders)
 
         options = parse_args(arguments)
-        output_path = pathlib.Path(options.htmloutput)
-        temp_path = output_path.with_suffix('.pydoctor_temp')
 
         # Update intersphinx_mapping.
         url_path = pydoctor_url_path.get(key)
         if url_path:
             intersphinx_mapping = config.intersphinx_mapping
             url = url_path.format(**{'rtd_version': rtd_version})
-            inv = (str(temp_path / 'objects.inv'),)
+            inv = (str(_temp_path(options) / 'objects.inv'),)
             intersphinx_mapping[f'{key}-api-docs'] = (None, (url, inv))
 
-        # Build the API docs in temporary path.
-        shutil.rmtree(temp_path, ignore_errors=True)
-        _run_pydoctor(key,  arguments)
-        output_path.rename(temp_path)
+        builds.append((key, arguments, options))
+
+    # Parallel builds are opt-in: they run in new processes, not in the Sphinx process.
+    jobs = config.pydoctor_jobs or 1
+    
+    # Build the API docs in temporary paths.
+    if jobs > 1 and len(builds) > 1:
+        for _, _, options in builds:
+            shutil.rmtree(_temp_path(options), ignore_errors=True)
+        builds = _prepare_intersphinx_cache(builds)
+        _run_pydoctor_parallel([(key, arguments) for key, arguments, _ in builds], jobs)
+        # The outputs are moved once all the builds are done.
+        for _, _, options in builds:
+            pathlib.Path(options.htmloutput).rename(_temp_path(options))
+    else:
+        for key, arguments, options in builds:
+            shutil.rmtree(_temp_path(options), ignore_errors=True)
+            _run_pydoctor(key, arguments)
+            pathlib.Path(options.htmloutput).rename(_temp_path(options))
+
+
+def _temp_path(options: Namespace) -> pathlib.Path:
+    """
+    The path where the output of a pydoctor build is moved once built.
+    """
+    return pathlib.Path(options.htmloutput).with_suffix('.pydoctor_temp')
 
 
 def _run_pydoctor(name: str, arguments: Sequence[str]) -> None:
@@ -139,6 +167,86 @@ def _run_pydoctor(name: str, arguments: Sequence[str]) -> None:
             logger.warning(line)
 
 
+def _run_pydoctor_parallel(builds: Sequence[Tuple[str, Sequence[str]]], jobs: int) -> None:
+    """
+    Call pydoctor for each build in at most C{jobs} parallel worker processes.
+
+    @param builds: Pairs of human-readable description and command line arguments.
+    @param jobs: Maximum number of processes running at the same time.
+    """
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(_run_pydoctor_process, name, arguments) 
+                   for name, arguments in builds]
+        for future in futures:
+            # Re-raise any error.
+            future.result()
+
+
+def _run_pydoctor_process(name: str, arguments: Sequence[str]) -> None:
+    """
+    Call pydoctor with arguments in a new process. 
+    The output is forwarded to the Sphinx log line by line, as soon as it's written.
+
+    The process gets the C{sys.path} of the Sphinx process, 
+    which might have been changed in C{conf.py}, as its C{PYTHONPATH}.
+
+    @param name: A human-readable description of this pydoctor build.
+    @param arguments: Command line arguments used to call pydoctor.
+    """
+    logger.info(f"Building '{name}' pydoctor API docs as:")
+    logger.info('\n'.join(arguments))
+
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p or os.curdir for p in sys.path))
+    with subprocess.Popen([sys.executable, '-m', 'pydoctor', *arguments], 
+                          stdout=subprocess.PIPE, env=env,
+                          encoding='utf-8', errors='replace') as process:
+        assert process.stdout is not None
+        for line in process.stdout:
+            # Prefix the lines since the output of the builds is interleaved.
+            logger.warning(f"{name}: {line.rstrip()}")
+    
+    if process.returncode != 0:
+        logger.warning(f"Building '{name}' pydoctor API docs failed with exit code {process.returncode}")
+
+
+def _prepare_intersphinx_cache(builds: List[Tuple[str, Sequence[str], Namespace]]) -> List[Tuple[str, Sequence[str], Namespace]]:
+    """
+    Fetch the intersphinx inventories used by all builds once, before running them in parallel.
+    The builds then find the inventories in the shared intersphinx cache 
+    instead of downloading them all at the same time.
+
+    Caches that should be cleared are cleared here, and the C{--clear-intersphinx-cache} argument 
+    is removed from the returned builds, so one build does not clear the cache while the others are using it.
+    """
+    from pydoctor.sphinx import prepareCache
+
+    urls: Dict[Tuple[str, str], Set[str]] = {}
+    clear: Set[Tuple[str, str]] = set()
+    for _, _, options in builds:
+        if not options.enable_intersphinx_cache:
+            continue
+        cache_key = (options.intersphinx_cache_path, options.intersphinx_cache_max_age)
+        urls.setdefault(cache_key, set()).update(options.intersphinx)
+        if options.clear_intersphinx_cache:
+            clear.add(cache_key)
+    
+    for cache_key, cache_urls in urls.items():
+        path, max_age = cache_key
+        if not cache_urls and cache_key not in clear:
+            continue
+        cache = prepareCache(clearCache=cache_key in clear and os.path.exists(path), 
+                             enableCache=True, cachePath=path, maxAge=max_age)
+        try:
+            for url in sorted(cache_urls):
+                cache.get(url)
+        finally:
+            cache.close() # Fixes ResourceWarning: unclosed <ssl.SSLSocket>
+    
+    return [(key, [a for a in arguments if a != '--clear-intersphinx-cache'] 
+                if options.enable_intersphinx_cache else arguments, options) 
+            for key, arguments, options in builds]
+
+
 def _get_arguments(arguments: Sequence[str], placeholders: Mapping[str, str]) -> Sequence[str]:
     """
     Return the resolved arguments for pydoctor build.
@@ -162,6 +270,7 @@ def setup(app: Sphinx) -> Mapping[str, Any]:
     """
     app.add_config_value("pydoctor_args", None, "env")
     app.add_config_value("pydoctor_url_path", None, "env")
+    app.add_config_value("pydoctor_jobs", None, "env")
 
     # Make sure we have a lower priority than intersphinx extension.
     app.connect('builder-inited', on_builder_inited, priority=490)
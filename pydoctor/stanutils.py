@@ -3,9 +3,9 @@ Utilities related to Stan tree building and HTML flattening.
 """
 import re
 from types import GeneratorType
-from typing import Union, List, TYPE_CHECKING
+from typing import Optional, Union, List, TYPE_CHECKING
 
-from twisted.web.template import Tag, XMLString, flattenString
+from twisted.web.template import Comment, Tag, XMLString, flattenString
 from twisted.python.failure import Failure
 
 if TYPE_CHECKING:
@@ -83,3 +83,68 @@ def flatten_text(stan: 'Flattenable') -> str:
             # Actually, some tests fails if we try to raise
             # an error here instead of ignoring.
     return text
+
+# Elements around which whitespace is not displayed: whitespace-only text next to them can be removed.
+_BLOCK_TAGS = frozenset((
+    'html', 'head', 'body', 'title', 'meta', 'link', 'script', 'style', 'noscript', 'template',
+    'div', 'p', 'ul', 'ol', 'li', 'dl', 'dt', 'dd', 'table', 'thead', 'tbody', 'tfoot', 'tr', 'td', 'th',
+    'caption', 'colgroup', 'col', 'nav', 'header', 'footer', 'section', 'article', 'aside', 'main',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'hr', 'br', 'form', 'fieldset', 'legend', 'pre', 'blockquote',
+    'figure', 'figcaption', 'details', 'summary', 'address', 'option',
+))
+# Elements where whitespace is significant.
+_PRESERVE_TAGS = frozenset(('pre', 'textarea', 'script', 'style'))
+_RE_WHITESPACE = re.compile('[ \t\n\r\f]+')
+
+def _is_block(node: Optional["Flattenable"]) -> bool:
+    return isinstance(node, Tag) and node.tagName.lower() in _BLOCK_TAGS
+
+def _preserves_whitespace(tag: Tag) -> bool:
+    if tag.tagName.lower() in _PRESERVE_TAGS:
+        return True
+    # The "pre" CSS class sets "white-space: pre", see apidocs.css.
+    class_ = tag.attributes.get('class')
+    return isinstance(class_, str) and 'pre' in class_.split()
+
+def _minify_children(children: List["Flattenable"], in_block: bool) -> List["Flattenable"]:
+    # Comments are removed and the text around them is merged.
+    merged: List["Flattenable"] = []
+    for child in children:
+        if isinstance(child, Comment):
+            continue
+        if isinstance(child, str) and merged and isinstance(merged[-1], str):
+            merged[-1] += child
+        else:
+            merged.append(child)
+
+    minified: List["Flattenable"] = []
+    for i, child in enumerate(merged):
+        if isinstance(child, str):
+            text = _RE_WHITESPACE.sub(' ', child)
+            prev = merged[i - 1] if i > 0 else None
+            next_ = merged[i + 1] if i + 1 < len(merged) else None
+            if (prev is None and in_block) or _is_block(prev):
+                text = text.lstrip(' ')
+            if (next_ is None and in_block) or _is_block(next_):
+                text = text.rstrip(' ')
+            if text:
+                minified.append(text)
+        else:
+            if isinstance(child, Tag) and not _preserves_whitespace(child):
+                child.children = _minify_children(child.children, _is_block(child))
+            minified.append(child)
+    return minified
+
+def minify(stan: List["Flattenable"]) -> List["Flattenable"]:
+    """
+    Remove the whitespace that is not displayed and the comments from a Stan tree, 
+    to make the HTML smaller.
+
+    Runs of whitespace are collapsed to a single space, and removed next to block elements
+    like C{div}, C{li} or C{td}. The content of C{pre}, C{textarea}, C{script} and C{style} elements 
+    and of elements with the C{pre} class is kept as is. 
+
+    @param stan: The nodes of a document or fragment. L{Tag}s are modified in place.
+    @return: The minified nodes.
+    """
+    return _minify_children(stan, True)
@@ -1,7 +1,7 @@
 """Render pydoctor data as HTML."""
 from __future__ import annotations
 
-from typing import Iterable, Iterator, Optional, Union, TYPE_CHECKING
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union, TYPE_CHECKING
 if TYPE_CHECKING:
     from typing_extensions import Protocol, runtime_checkable
 else:
@@ -9,18 +9,27 @@ else:
     def runtime_checkable(f):
         return f
 import abc
+import hashlib
+import os
+import pickle
+import shutil
 from pathlib import Path, PurePath
 import warnings
 from xml.dom import minidom
 
+
 # Newer APIs from importlib_resources should arrive to stdlib importlib.resources in Python 3.9.
 if TYPE_CHECKING:
     from importlib.resources.abc import Traversable
+    from twisted.web.template import Flattenable
 else:
     Traversable = object
 
 from twisted.web.iweb import ITemplateLoader
-from twisted.web.template import TagLoader, XMLString, Element, tags
+from twisted.web.template import Tag, TagLoader, XMLString, Element, tags
+from zope.interface import implementer
+
+from pydoctor import __version__, stanutils
 
 from pydoctor.templatewriter.util import CaseInsensitiveDict
 from pydoctor.model import System, Documentable
@@ -100,13 +109,15 @@ class Template(abc.ABC):
         """Template filename, may include subdirectories."""
 
     @classmethod
-    def fromdir(cls, basedir: Union[Traversable, Path], subdir: Optional[PurePath] = None) -> Iterator['Template']:
+    def fromdir(cls, basedir: Union[Traversable, Path], subdir: Optional[PurePath] = None, 
+                minify: bool = False) -> Iterator['Template']:
         """
         Scan a directory for templates. 
 
         @param basedir: A L{Path} or L{Traversable} object that should point to the root directory of the template directory structure.
         @param subdir: The subdirectory inside the template directory structure that we want to scan, relative to the C{basedir}. 
             Scan the C{basedir} if C{None}. 
+        @param minify: Minify the HTML templates, see L{HtmlTemplate}.
         @raises FailedToCreateTemplate: If the path is not a directory or do not exist. 
         """
         path = basedir.joinpath(subdir.as_posix()) if subdir else basedir
@@ -117,20 +128,22 @@ class Template(abc.ABC):
         for entry in path.iterdir():
             entry_path = subdir.joinpath(entry.name)
             if entry.is_dir():
-                yield from Template.fromdir(basedir, entry_path)
+                yield from Template.fromdir(basedir, entry_path, minify)
             else:
-                template = Template.fromfile(basedir, entry_path)
+                template = Template.fromfile(basedir, entry_path, minify)
                 if template:
                     yield template
 
     @classmethod
-    def fromfile(cls, basedir: Union[Traversable, Path], templatepath: PurePath) -> Optional['Template']:
+    def fromfile(cls, basedir: Union[Traversable, Path], templatepath: PurePath, 
+                 minify: bool = False) -> Optional['Template']:
         """
         Create a concrete template object.
         Type depends on the file extension.
 
         @param basedir: A L{Path} or L{Traversable} object that should point to the root directory of the template directory structure.
         @param templatepath: The path to the template file, relative to the C{basedir}.
+        @param minify: Minify the HTML templates, see L{HtmlTemplate}.
         @returns: The template object or C{None} if a the path entry is not a file.
         @raises FailedToCreateTemplate: If there is an error while creating the template.
         """
@@ -152,12 +165,15 @@ class Template(abc.ABC):
                 else:
                     # The template name is the relative path to the template.
                     # Template files in subdirectories will have a name like: 'static/bar.svg'.
-                    template = HtmlTemplate(name=templatepath.as_posix(), text=text)
+                    template = HtmlTemplate(name=templatepath.as_posix(), text=text, minify=minify)
             
             else:
                 # Treat the file as binary data.
-                data = path.read_bytes()
-                template = StaticTemplate(name=templatepath.as_posix(), data=data)
+                if isinstance(path, Path):
+                    # Regular file, it will be copied or linked directly from there.
+                    template = StaticTemplate(name=templatepath.as_posix(), path=path)
+                else:
+                    template = StaticTemplate(name=templatepath.as_posix(), data=path.read_bytes())
         
         # Catch io errors only once for the whole block, it's ok to do that since 
         # we're reading only one file per call to fromfile()
@@ -173,26 +189,264 @@ class StaticTemplate(Template):
 
     For CSS and JS templates.
     """
-    def __init__(self, name: str, data: bytes) -> None:
+    def __init__(self, name: str, data: Optional[bytes] = None, path: Optional[Path] = None) -> None:
         super().__init__(name)
-        self.data: bytes = data
+        if data is None and path is None:
+            raise TypeError("StaticTemplate() requires 'data' or 'path'")
+        self._data = data
+        self.path = path
         """
-        Contents of the template file as L{bytes}.
+        Path of the template file when it's a regular file on the filesystem, C{None} otherwise. 
+        In this case the data is only read when needed: L{write} copies or links the file directly.
         """
     
-    def write(self, build_directory: Path) -> None:
+    @property
+    def data(self) -> bytes:
         """
-        Directly write the contents of this static template as is to the build dir.
+        Contents of the template file as L{bytes}.
+        """
+        if self._data is None:
+            assert self.path is not None
+            self._data = self.path.read_bytes()
+        return self._data
+
+    def write(self, build_directory: Path, link: bool = False, store: Optional[Path] = None) -> None:
+        """
+        Write the contents of this static template as is to the build dir.
+
+        Files already up to date in the build directory are left untouched: a file copied from 
+        the template L{path} is up to date when its size and modification time are the same, 
+        otherwise the contents are compared. Existing files are always replaced, never written into, 
+        so it's safe to hard link them.
+
+        @param link: Hard link the file from the template L{path} instead of copying it, 
+            falls back to a copy if the link cannot be created.
+        @param store: Directory of content-addressed static files, possibly shared by several builds.
+            When given, the data is written once in this directory and hard linked from there.
         """
         outfile = build_directory.joinpath(self.name)
         outfile.parent.mkdir(exist_ok=True, parents=True)
-        with outfile.open('wb') as fobjb:
-            fobjb.write(self.data)
+        source = self.path
+        if store is not None:
+            source = self._store(store)
+            link = True
+        try:
+            out_stat = outfile.stat()
+        except FileNotFoundError:
+            pass
+        else:
+            if source is None:
+                if out_stat.st_size == len(self.data) and outfile.read_bytes() == self.data:
+                    return
+            else:
+                src_stat = source.stat()
+                if (src_stat.st_dev, src_stat.st_ino) == (out_stat.st_dev, out_stat.st_ino):
+                    return
+                if (src_stat.st_size, src_stat.st_mtime_ns) == (out_stat.st_size, out_stat.st_mtime_ns):
+                    return
         
+        tmp = outfile.with_name(f'.{outfile.name}.{os.getpid()}.tmp')
+        try:
+            if source is None:
+                tmp.write_bytes(self.data)
+            else:
+                _link_or_copy(source, tmp, link)
+            os.replace(tmp, outfile)
+        except BaseException:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            raise
+
+    def _store(self, store: Path) -> Path:
+        # The file name is the hash of the contents, so entries never change once written.
+        path = store.joinpath(hashlib.sha256(self.data).hexdigest() + PurePath(self.name).suffix)
+        if not path.is_file():
+            store.mkdir(exist_ok=True, parents=True)
+            tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+            tmp.write_bytes(self.data)
+            os.replace(tmp, path)
+        return path
+
+def _link_or_copy(source: Path, target: Path, link: bool) -> None:
+    if link:
+        try:
+            os.link(source, target)
+        except OSError:
+            # Not supported by the filesystem or across devices.
+            pass
+        else:
+            return
+    # shutil.copyfile() uses the zero-copy fast paths of the platform when available.
+    shutil.copyfile(source, target)
+    st = source.stat()
+    os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+@implementer(ITemplateLoader)
+class _CompiledTemplateLoader:
+    """
+    L{ITemplateLoader} returning an already loaded document.
+    """
+    def __init__(self, loaded: List['Flattenable']) -> None:
+        self._loaded = loaded
+
+    def load(self) -> List['Flattenable']:
+        return self._loaded
+
+def _extract_version(loaded: List['Flattenable'], template_name: str) -> int:
+    # If no meta pydoctor-template-version tag found,
+    # it's most probably a placeholder template.
+    version = -1
+    stack: List[Tag] = [t for t in loaded if isinstance(t, Tag)]
+    while stack:
+        parent = stack.pop(0)
+        for meta in [t for t in parent.children if isinstance(t, Tag)]:
+            if meta.tagName != 'meta':
+                stack.append(meta)
+                continue
+            if meta.attributes.get('name') != "pydoctor-template-version":
+                continue
+
+            # Remove the meta tag as soon as found
+            parent.children.remove(meta)
+
+            version_str = meta.attributes.get('content')
+            if version_str is None:
+                warnings.warn(f"Could not read '{template_name}' template version: "
+                    f"the 'content' attribute is missing")
+                continue
+
+            try:
+                version = int(str(version_str))
+            except ValueError:
+                warnings.warn(f"Could not read '{template_name}' template version: "
+                        "the 'content' attribute must be an integer")
+            else:
+                return version
+
+    return version
+
+_COMPILED_TEMPLATES_FORMAT = '1'
+"""
+Version of the compiled templates, part of the cache key. 
+Bump it when the compilation changes (i.e. L{_extract_version} or L{stanutils.minify}), 
+since the pydoctor version does not change in a development checkout.
+"""
+
+class _CompiledTemplates:
+    """
+    Cache of compiled HTML templates: the template version and the document loaded by L{XMLString}.
+
+    Entries are keyed by a hash of the template name and text, the L{_COMPILED_TEMPLATES_FORMAT} and 
+    the pydoctor and Twisted versions, so the cache never needs invalidation. 
+    They are kept in memory and, when C{directory} is not C{None}, pickled in this directory
+    such that the next pydoctor runs do not have to parse the templates again.
+
+    Warnings triggered while compiling a template are stored along with it and re-emitted on each cache hit. 
+    """
+    def __init__(self, directory: Optional[Path]) -> None:
+        self.directory = directory
+        self._compiled: Dict[str, Tuple[int, List[str], List['Flattenable']]] = {}
+
+    @staticmethod
+    def _key(name: str, text: str, minify: bool = False) -> str:
+        # Twisted is part of the key because the loaded document is made of twisted.web.template objects.
+        from twisted import __version__ as twisted_version
+        h = hashlib.sha256()
+        for part in (_COMPILED_TEMPLATES_FORMAT, __version__, twisted_version, name, text, 'minify' if minify else ''):
+            h.update(part.encode('utf-8'))
+            h.update(b'\0')
+        return h.hexdigest()
+
+    def get(self, name: str, text: str, minify: bool = False) -> Tuple[int, List['Flattenable']]:
+        """
+        Get the version and loaded document of the template, compile it if it's not in the cache.
+
+        @param minify: Remove the whitespace that is not displayed, see L{stanutils.minify}.
+        @raises ValueError: If the template is not valid XML.
+        """
+        key = self._key(name, text, minify)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled = self._read(key)
+            if compiled is None:
+                compiled = self._compile(name, text, minify)
+                self._write(key, compiled)
+            self._compiled[key] = compiled
+        else:
+            for message in compiled[1]:
+                warnings.warn(message)
+        version, _, loaded = compiled
+        return version, loaded
+
+    @staticmethod
+    def _compile(name: str, text: str, minify: bool = False) -> Tuple[int, List[str], List['Flattenable']]:
+        try:
+            loaded = XMLString(text).load()
+        except Exception as e:
+            raise ValueError(f"Failed to parse template as XML: {e}") from e
+        with warnings.catch_warnings(record=True) as catched:
+            warnings.simplefilter('always')
+            version = _extract_version(loaded, name)
+        if minify:
+            loaded = stanutils.minify(loaded)
+        messages = [str(w.message) for w in catched]
+        for message in messages:
+            warnings.warn(message)
+        return version, messages, loaded
+
+    def _read(self, key: str) -> Optional[Tuple[int, List[str], List['Flattenable']]]:
+        if self.directory is None:
+            return None
+        try:
+            with self.directory.joinpath(key).open('rb') as f:
+                version, messages, loaded = pickle.load(f)
+        except Exception:
+            # Missing or corrupted cache entry, simply compile the template again.
+            return None
+        for message in messages:
+            warnings.warn(message)
+        return version, messages, loaded
+
+    def _write(self, key: str, compiled: Tuple[int, List[str], List['Flattenable']]) -> None:
+        if self.directory is None:
+            return
+        path = self.directory.joinpath(key)
+        tmp = path.with_name(f'{key}.{os.getpid()}.tmp')
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with tmp.open('wb') as f:
+                pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except Exception:
+            # The cache is an optimization only.
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+
+def _templates_cache_directory() -> Optional[Path]:
+    directory = os.environ.get('PYDOCTOR_TEMPLATES_CACHE')
+    return Path(directory) if directory else None
+
+compiled_templates = _CompiledTemplates(_templates_cache_directory())
+"""
+Shared cache of compiled HTML templates. 
+
+The on-disk cache is opt-in: it's enabled by the environment variable C{PYDOCTOR_TEMPLATES_CACHE}, 
+set to the cache directory, or by setting the C{directory} attribute. 
+Parsing the default templates only takes a few milliseconds, 
+the on-disk cache is worth it for large custom templates.
+"""
+
 class HtmlTemplate(Template):
     """
     HTML template that works with the Twisted templating system
-    and use L{xml.dom.minidom} to parse the C{pydoctor-template-version} meta tag.
+    and read the C{pydoctor-template-version} meta tag.
+
+    Compiled templates are cached with L{compiled_templates}, the loaded document is shared 
+    by all templates with the same name and text.
 
     @ivar text:  Contents of the template file as 
         UFT-8 decoded L{str}.
@@ -210,46 +464,19 @@ class HtmlTemplate(Template):
 
         This is a L{ITemplateLoader}.
     """
-    def __init__(self, name: str, text: str):
+    def __init__(self, name: str, text: str, minify: bool = False):
+        """
+        @param minify: Remove the whitespace that is not displayed when compiling the template, 
+            see L{stanutils.minify}.
+        """
         super().__init__(name=name)
         self.text = text
         if len(self.text.strip()) == 0:
-            self._dom: Optional[minidom.Document] = None
             self.version = -1
             self.loader: ITemplateLoader = TagLoader(tags.transparent)
         else:
-            self._dom = parse_xml(self.text)
-            self.version = self._extract_version(self._dom, self.name)
-            self.loader = XMLString(self._dom.toxml())
-
-    @staticmethod
-    def _extract_version(dom: minidom.Document, template_name: str) -> int:
-        # If no meta pydoctor-template-version tag found,
-        # it's most probably a placeholder template.
-        version = -1
-        for meta in dom.getElementsByTagName("meta"):
-            if meta.getAttribute("name") != "pydoctor-template-version":
-                continue
-
-            # Remove the meta tag as soon as found
-            meta.parentNode.removeChild(meta)
-
-            if not meta.hasAttribute("content"):
-                warnings.warn(f"Could not read '{template_name}' template version: "
-                    f"the 'content' attribute is missing")
-                continue
-
-            version_str = meta.getAttribute("content")
-
-            try:
-                version = int(version_str)
-            except ValueError:
-                warnings.warn(f"Could not read '{template_name}' template version: "
-                        "the 'content' attribute must be an integer")
-            else:
-                break
-
-        return version
+            self.version, loaded = compiled_templates.get(self.name, self.text, minify)
+            self.loader = _CompiledTemplateLoader(loaded)
 
 class TemplateLookup:
     """
@@ -273,14 +500,17 @@ class TemplateLookup:
     @see: L{Template}, L{StaticTemplate}, L{HtmlTemplate}
     """
 
-    def __init__(self, path: Union[Traversable, Path]) -> None:
+    def __init__(self, path: Union[Traversable, Path], minify: bool = False) -> None:
         """
         Loads all templates from the given C{path} into the lookup.
 
         @param path: A L{Path} or L{Traversable} object pointing to a
             directory to load the default set of templates from.
+        @param minify: Remove the whitespace that is not displayed from the HTML templates 
+            of this directory and the ones added with L{add_templatedir}, see L{stanutils.minify}.
         """
         self._templates: CaseInsensitiveDict[Template] = CaseInsensitiveDict()
+        self.minify = minify
 
         self.add_templatedir(path)
     
@@ -363,7 +593,7 @@ class TemplateLookup:
         """
         Scan a directory and add all templates in the given directory to the lookup.
         """
-        for template in Template.fromdir(path):
+        for template in Template.fromdir(path, minify=self.minify):
             self.add_template(template)
 
     def get_template(self, filename: str) -> Template:
@@ -0,0 +1,320 @@
+"""
+Writers that store the whole documentation in a single file: a zip or tar archive, or an SQLite database.
+
+Writing one file sequentially is much faster than writing thousands of small files
+on network filesystems or container overlay mounts, and the result can be uploaded as is.
+
+Use them with the C{--html-writer} option, C{--html-output} is the path of the archive::
+
+    pydoctor --html-writer=pydoctor.templatewriter.archive.ZipWriter --html-output=apidocs.zip ./mylib
+
+The compression of tar archives depends on the file extension: C{.tar}, C{.tar.gz}, C{.tar.bz2} or C{.tar.xz}.
+
+To preview the documentation, serve the archive on a local port or extract it::
+
+    python -m pydoctor.templatewriter.archive serve apidocs.zip --port 8000
+    python -m pydoctor.templatewriter.archive extract apidocs.zip apidocs/
+"""
+from __future__ import annotations
+
+import abc
+import argparse
+import http.server
+import io
+import mimetypes
+import posixpath
+import sqlite3
+import sys
+import tarfile
+import time
+import urllib.parse
+import zipfile
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional, Sequence, Type, TYPE_CHECKING
+
+from pydoctor.templatewriter import StaticTemplate, TemplateWriter
+
+if TYPE_CHECKING:
+    from typing_extensions import Literal
+
+# Archives do not all support links: a page redirecting to the target is written instead.
+_REDIRECT_PAGE = ('<!DOCTYPE html>\n<html><head><meta charset="utf-8" />'
+                  '<meta http-equiv="refresh" content="0; url={0}" />'
+                  '<link rel="canonical" href="{0}" /></head></html>\n')
+
+class ArchiveWriter(TemplateWriter, abc.ABC):
+    """
+    Base class of the writers that store all files in one file, at the C{build_directory} path.
+    """
+
+    def prepOutputDirectory(self) -> None:
+        """
+        Create the archive and add the static files to it.
+        """
+        self.build_directory.parent.mkdir(exist_ok=True, parents=True)
+        self._openArchive()
+        for template in self.template_lookup.templates:
+            if isinstance(template, StaticTemplate):
+                self.writeFile(template.name, template.data)
+
+    def linkFile(self, name: str, target: str) -> None:
+        self.writeFile(name, _REDIRECT_PAGE.format(target).encode('utf-8'))
+
+    @abc.abstractmethod
+    def _openArchive(self) -> None:
+        """
+        Create the archive at the C{build_directory} path.
+        """
+
+class ZipWriter(ArchiveWriter):
+    """
+    Write the documentation in a zip archive, with deflate compression.
+    """
+
+    _zip: Optional[zipfile.ZipFile] = None
+
+    def _openArchive(self) -> None:
+        self._zip = zipfile.ZipFile(self.build_directory, 'w', compression=zipfile.ZIP_DEFLATED)
+        self._date_time = time.localtime()[:6]
+
+    def writeFile(self, name: str, data: bytes) -> None:
+        assert self._zip is not None
+        info = zipfile.ZipInfo(name, date_time=self._date_time)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = 0o644 << 16
+        self._zip.writestr(info, data)
+
+    def close(self) -> None:
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+def _tar_mode(path: Path) -> Literal['w', 'w:gz', 'w:bz2', 'w:xz']:
+    name = path.name.lower()
+    if name.endswith(('.tar.gz', '.tgz')):
+        return 'w:gz'
+    if name.endswith(('.tar.bz2', '.tbz2')):
+        return 'w:bz2'
+    if name.endswith(('.tar.xz', '.txz')):
+        return 'w:xz'
+    return 'w'
+
+class TarWriter(ArchiveWriter):
+    """
+    Write the documentation in a tar archive, compressed depending on the file extension.
+    """
+
+    _tar: Optional[tarfile.TarFile] = None
+
+    def _openArchive(self) -> None:
+        self._tar = tarfile.open(self.build_directory, _tar_mode(self.build_directory))
+        self._mtime = time.time()
+
+    def writeFile(self, name: str, data: bytes) -> None:
+        assert self._tar is not None
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = self._mtime
+        info.mode = 0o644
+        self._tar.addfile(info, io.BytesIO(data))
+
+    def linkFile(self, name: str, target: str) -> None:
+        assert self._tar is not None
+        info = tarfile.TarInfo(name)
+        info.type = tarfile.SYMTYPE
+        info.linkname = target
+        info.mtime = self._mtime
+        info.mode = 0o777
+        self._tar.addfile(info)
+
+    def close(self) -> None:
+        if self._tar is not None:
+            self._tar.close()
+            self._tar = None
+
+class SQLiteWriter(ArchiveWriter):
+    """
+    Write the documentation in an SQLite database, with one row per file in the table C{files(name, data)}.
+    """
+
+    _db: Optional[sqlite3.Connection] = None
+
+    def _openArchive(self) -> None:
+        if self.build_directory.exists():
+            self.build_directory.unlink()
+        self._db = sqlite3.connect(str(self.build_directory))
+        # A new database is written at once, it does not need to survive crashes.
+        self._db.execute('PRAGMA journal_mode = OFF')
+        self._db.execute('PRAGMA synchronous = OFF')
+        self._db.execute('CREATE TABLE files (name TEXT PRIMARY KEY, data BLOB NOT NULL)')
+
+    def writeFile(self, name: str, data: bytes) -> None:
+        assert self._db is not None
+        self._db.execute('INSERT OR REPLACE INTO files (name, data) VALUES (?, ?)', (name, data))
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.commit()
+            self._db.close()
+            self._db = None
+
+class ArchiveReader(abc.ABC):
+    """
+    Read the files of an archive written by one of the L{ArchiveWriter}s.
+    """
+    @abc.abstractmethod
+    def names(self) -> List[str]:
+        """
+        Names of the files in the archive.
+        """
+
+    @abc.abstractmethod
+    def read(self, name: str) -> Optional[bytes]:
+        """
+        Read a file of the archive, C{None} if there is no such file.
+        """
+
+    @abc.abstractmethod
+    def close(self) -> None:
+        """
+        Close the archive.
+        """
+
+class _ZipReader(ArchiveReader):
+    def __init__(self, path: Path) -> None:
+        self._zip = zipfile.ZipFile(path)
+    def names(self) -> List[str]:
+        return [n for n in self._zip.namelist() if not n.endswith('/')]
+    def read(self, name: str) -> Optional[bytes]:
+        try:
+            return self._zip.read(name)
+        except KeyError:
+            return None
+    def close(self) -> None:
+        self._zip.close()
+
+class _TarReader(ArchiveReader):
+    def __init__(self, path: Path) -> None:
+        self._tar = tarfile.open(path)
+        self._members: Dict[str, tarfile.TarInfo] = {m.name: m for m in self._tar.getmembers()
+                                                     if m.isfile() or m.issym()}
+    def names(self) -> List[str]:
+        return list(self._members)
+    def read(self, name: str) -> Optional[bytes]:
+        member = self._members.get(name)
+        if member is None:
+            return None
+        if member.issym():
+            return self.read(posixpath.normpath(posixpath.join(posixpath.dirname(name), member.linkname)))
+        f = self._tar.extractfile(member)
+        assert f is not None
+        return f.read()
+    def close(self) -> None:
+        self._tar.close()
+
+class _SQLiteReader(ArchiveReader):
+    def __init__(self, path: Path) -> None:
+        self._db = sqlite3.connect(f'{path.resolve().as_uri()}?mode=ro', uri=True)
+    def names(self) -> List[str]:
+        return [name for name, in self._db.execute('SELECT name FROM files ORDER BY name')]
+    def read(self, name: str) -> Optional[bytes]:
+        row = self._db.execute('SELECT data FROM files WHERE name = ?', (name,)).fetchone()
+        return None if row is None else bytes(row[0])
+    def close(self) -> None:
+        self._db.close()
+
+def openArchive(path: Path) -> ArchiveReader:
+    """
+    Open an archive written by a L{ZipWriter}, L{TarWriter} or L{SQLiteWriter}.
+
+    @raises ValueError: If the file is not a supported archive.
+    """
+    with path.open('rb') as f:
+        header = f.read(16)
+    if header == b'SQLite format 3\x00':
+        return _SQLiteReader(path)
+    if zipfile.is_zipfile(path):
+        return _ZipReader(path)
+    if tarfile.is_tarfile(path):
+        return _TarReader(path)
+    raise ValueError(f'not a zip, tar or SQLite archive: {path}')
+
+def extract(archive: ArchiveReader, directory: Path) -> None:
+    """
+    Write all files of the archive in a directory.
+    """
+    for name in archive.names():
+        parts = PurePosixPath(name).parts
+        if not parts or parts[0] == '/' or '..' in parts:
+            # Do not write outside of the directory.
+            continue
+        data = archive.read(name)
+        assert data is not None
+        path = directory.joinpath(*parts)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+def _handlerClass(archive: ArchiveReader) -> Type[http.server.BaseHTTPRequestHandler]:
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def _sendHeaders(self) -> Optional[bytes]:
+            name = urllib.parse.unquote(urllib.parse.urlsplit(self.path).path).lstrip('/')
+            if name == '' or name.endswith('/'):
+                name += 'index.html'
+            data = archive.read(name)
+            if data is None:
+                self.send_error(404)
+                return None
+            self.send_response(200)
+            self.send_header('Content-Type', mimetypes.guess_type(name)[0] or 'application/octet-stream')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            return data
+
+        def do_HEAD(self) -> None:
+            self._sendHeaders()
+
+        def do_GET(self) -> None:
+            data = self._sendHeaders()
+            if data is not None:
+                self.wfile.write(data)
+    return Handler
+
+def serve(archive: ArchiveReader, port: int = 8000, bind: str = 'localhost') -> None:
+    """
+    Serve the files of the archive over HTTP, until interrupted.
+    """
+    with http.server.HTTPServer((bind, port), _handlerClass(archive)) as server:
+        print(f'Serving on http://{bind}:{server.server_port}/ (press Ctrl+C to stop)', file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+def main(args: Sequence[str] = sys.argv[1:]) -> int:
+    parser = argparse.ArgumentParser(prog='python -m pydoctor.templatewriter.archive',
+        description='Preview the documentation written by pydoctor in a single file.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    serve_parser = subparsers.add_parser('serve', help='Serve the documentation over HTTP.')
+    serve_parser.add_argument('archive', type=Path)
+    serve_parser.add_argument('--port', type=int, default=8000)
+    serve_parser.add_argument('--bind', default='localhost')
+    extract_parser = subparsers.add_parser('extract', help='Extract the documentation in a directory.')
+    extract_parser.add_argument('archive', type=Path)
+    extract_parser.add_argument('directory', type=Path)
+    ns = parser.parse_args(args)
+
+    try:
+        archive = openArchive(ns.archive)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    try:
+        if ns.command == 'serve':
+            serve(archive, ns.port, ns.bind)
+        else:
+            extract(archive, ns.directory)
+    finally:
+        archive.close()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+Pre-compression of the output files, so a web server can send them without compressing them on each request
+(i.e. nginx C{gzip_static} and C{brotli_static}).
+
+The compressed copies are written next to the files, with the C{.gz} and C{.br} extensions.
+Brotli compression requires the C{Brotli} package.
+"""
+from __future__ import annotations
+
+import importlib.util
+import zlib
+from pathlib import PurePosixPath
+from typing import List, Sequence, Tuple
+
+COMPRESSIBLE_SUFFIXES = frozenset(('.html', '.json', '.css', '.js', '.svg', '.txt', '.xml'))
+"""
+Extensions of the files that are compressed. Other files, like C{objects.inv} and images,
+are already compressed.
+"""
+
+def isCompressible(name: str) -> bool:
+    """
+    Whether the file should get pre-compressed copies, depending on its extension.
+    """
+    return PurePosixPath(name).suffix.lower() in COMPRESSIBLE_SUFFIXES
+
+def availableFormats() -> Tuple[str, ...]:
+    """
+    The compression formats supported in this environment: C{'gz'}, and C{'br'} if the C{Brotli} package is installed.
+    """
+    if importlib.util.find_spec('brotli') is None:
+        return ('gz',)
+    return ('gz', 'br')
+
+def compress(data: bytes, formats: Sequence[str]) -> List[Tuple[str, bytes]]:
+    """
+    Compress the data with the maximum compression level, in each format.
+    The output only depends on the input, so unchanged files give the same compressed files.
+
+    This runs in the worker processes of L{pydoctor.templatewriter.TemplateWriter}.
+
+    @param formats: Compression formats, see L{availableFormats}.
+    @returns: The extension and the compressed data, for each format.
+    """
+    compressed = []
+    for fmt in formats:
+        if fmt == 'gz':
+            # wbits=31 gives a gzip stream, with a zero modification time in the header.
+            compressor = zlib.compressobj(9, zlib.DEFLATED, 31)
+            compressed.append((fmt, compressor.compress(data) + compressor.flush()))
+        elif fmt == 'br':
+            import brotli
+            compressed.append((fmt, brotli.compress(data)))
+        else:
+            raise ValueError(f'unknown compression format: {fmt!r}')
+    return compressed
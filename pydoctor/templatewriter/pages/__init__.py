@@ -228,6 +228,9 @@ class CommonPage(Page):
             docgetter = util.DocGetter()
         self.docgetter = docgetter
         self._order = ob.system.membersOrder(ob)
+        # Number the tables from 1 on each page, so the content of a page 
+        # does not depend on the pages rendered before it.
+        ChildTable.last_id = 0
 
     @property
     def page_url(self) -> str:
@@ -522,13 +525,10 @@ class ClassPage(CommonPage):
 
 def get_override_info(cls:model.Class, member_name:str, page_url:Optional[str]=None) -> Iterator["Flattenable"]:
     page_url = page_url or cls.page_object.url
-    for b in cls.mro(include_self=False):
-        if member_name not in b.contents:
-            continue
-        overridden = b.contents[member_name]
+    overridden = util.overridden_member(cls, member_name)
+    if overridden is not None:
         yield tags.div(class_="interfaceinfo")(
             'overrides ', tags.code(epydoc2stan.taglink(overridden, page_url)))
-        break
     
     ocs = sorted(util.overriding_subclasses(cls, member_name), key=util.alphabetical_order_func)
     if ocs:
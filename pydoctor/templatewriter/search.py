@@ -1,19 +1,22 @@
 """
-Code building ``all-documents.html``, ``searchindex.json`` and ``fullsearchindex.json``.
+Code building ``all-documents.html``, ``all-documents.json``, ``searchindex.json`` and ``fullsearchindex.json``.
 """
 from __future__ import annotations
 
+from collections import Counter
 from pathlib import Path
-from typing import Iterator, List, Optional, Tuple, Type, Dict, TYPE_CHECKING
+from typing import Any, Callable, Collection, Iterable, Iterator, List, Optional, Sequence, Tuple, Type, Dict, TYPE_CHECKING
 import json
+import math
+import re
 
 import attr
 
 from pydoctor.templatewriter.pages import Page
 from pydoctor import model, epydoc2stan, node2stan
+from pydoctor.stanutils import flatten
 
 from twisted.web.template import Tag, renderer
-from lunr import lunr, get_default_builder
 
 if TYPE_CHECKING:
     from twisted.web.template import Flattenable
@@ -40,6 +43,40 @@ def get_all_documents_flattenable(system: model.System) -> Iterator[Dict[str, "F
 
             for ob in system.allobjects.values() if ob.isVisible)
 
+ALL_DOCUMENTS_JSON_FIELDS = ('kind', 'type', 'summary', 'url', 'privacy')
+"""
+Names of the values stored for each document in ``all-documents.json``, in order.
+"""
+
+def get_all_documents_json(system: model.System) -> Dict[str, Any]:
+    """
+    Get the data to be writen into ``all-documents.json`` file.
+
+    This is a compact equivalent of ``all-documents.html`` meant to be loaded by the search:
+    it maps each visible object full name to the list of values named in L{ALL_DOCUMENTS_JSON_FIELDS}.
+    The summaries are flattened to HTML once, at build time.
+    """
+    format_kind = epydoc2stan.format_kind
+    format_summary = epydoc2stan.format_summary
+
+    return {'fields': list(ALL_DOCUMENTS_JSON_FIELDS), 
+            'documents': {
+                ob.fullName(): [
+                    format_kind(ob.kind) if ob.kind else '', 
+                    ob.__class__.__name__,
+                    flatten(format_summary(ob)), 
+                    ob.url, 
+                    ob.privacyClass.name
+                ]
+            for ob in system.allobjects.values() if ob.isVisible}}
+
+def dumps_all_documents_json(system: model.System) -> str:
+    """
+    Get the content of ``all-documents.json``.
+    """
+    return json.dumps(get_all_documents_json(system), 
+                      ensure_ascii=False, separators=(',', ':'))
+
 class AllDocuments(Page):
     
     filename = 'all-documents.html'
@@ -52,6 +89,162 @@ class AllDocuments(Page):
         for doc in get_all_documents_flattenable(self.system):
             yield tag.clone().fillSlots(**doc)
 
+_LUNR_SEPARATOR_RE = re.compile('[ \t\n\r\f\v\xa0-]+')
+
+def _default_pipeline() -> Sequence[Callable[..., Any]]:
+    # lunr is only imported when an index is built.
+    from lunr.trimmer import trimmer
+    from lunr.stop_word_filter import stop_word_filter
+    from lunr.stemmer import stemmer
+    return (trimmer, stop_word_filter, stemmer)
+
+@attr.s(auto_attribs=True)
+class LunrIndexBuilder:
+    """
+    Builds a serialized lunr index, in the format loaded by C{lunr.Index.load()} in C{lunr.js}.
+
+    This produces the same data as C{lunr.py}'s C{Builder} followed by C{Index.serialize()}, 
+    but it's a lot faster because:
+
+        - Fields listed in C{skip_pipeline} are not processed by the pipeline at all.
+        - The pipeline functions are run once per distinct token, not once per token occurence.
+          This means the pipeline functions must only depend on the token string, 
+          which is the case for the default C{trimmer}, C{stop_word_filter} and C{stemmer}.
+        - Term frequencies are counted in batch for each field.
+        - Field vectors are built directly in their sorted serialized form.
+        - No C{TokenSet} is created since it's not part of the serialized index.
+    """
+
+    ref: str
+    """The name of the document field used as the reference."""
+    
+    fields: Sequence[Tuple[str, int]]
+    """List of fields names to index and their boost."""
+
+    pipeline: Sequence[Callable[..., Any]] = attr.ib(factory=_default_pipeline)
+    """Functions applied to the tokens, in order. Defaults to C{lunr}'s trimmer, stop word filter and stemmer."""
+    
+    skip_pipeline: Collection[str] = ()
+    """Field names for which the pipeline is not applied."""
+
+    search_pipeline: Sequence[str] = ()
+    """Labels of the functions that lunr.js should apply to query terms."""
+
+    b: float = 0.75
+    k1: float = 1.2
+
+    _pipeline_cache: Dict[str, List[str]] = attr.ib(factory=dict, init=False)
+
+    def _run_pipeline(self, token: str) -> List[str]:
+        try:
+            return self._pipeline_cache[token]
+        except KeyError:
+            from lunr.token import Token
+            tokens = [Token(token, {})]
+            for fn in self.pipeline:
+                results: List[Token] = []
+                for i, t in enumerate(tokens):
+                    result = fn(t, i, tokens)
+                    if not result:
+                        continue
+                    if isinstance(result, (list, tuple)):
+                        results.extend(result)
+                    else:
+                        results.append(result)
+                tokens = results
+            terms = self._pipeline_cache[token] = [str(t) for t in tokens]
+            return terms
+
+    def _get_terms(self, field_name: str, value: Optional[str]) -> List[str]:
+        if value is None:
+            return []
+        # Same as lunr.Tokenizer
+        tokens = [t for t in _LUNR_SEPARATOR_RE.split(str(value).lower()) if t]
+        if field_name in self.skip_pipeline:
+            return tokens
+        run_pipeline = self._run_pipeline
+        return [term for t in tokens for term in run_pipeline(t)]
+
+    def build(self, documents: Iterable[Tuple[Dict[str, Optional[str]], Dict[str, int]]]) -> Dict[str, Any]:
+        """
+        Build the serialized index.
+
+        @param documents: The corpus, as a list of tuples: (document, attributes). 
+            The only attribute taken into account is C{'boost'}.
+        @returns: The JSON serializable index.
+        """
+        field_names = [name for name, _ in self.fields]
+        boosts = dict(self.fields)
+        
+        inverted_index: Dict[str, Dict[str, Any]] = {}
+        # tuples: (field ref, field name, document boost, terms frequencies, field length)
+        field_term_frequencies: List[Tuple[str, str, int, Counter[str], int]] = []
+        field_lengths_sum: Dict[str, int] = dict.fromkeys(field_names, 0)
+        document_count = 0
+
+        for doc, attributes in documents:
+            doc_ref = str(doc[self.ref])
+            doc_boost = attributes.get('boost', 1)
+            document_count += 1
+
+            for field_name in field_names:
+                terms = self._get_terms(field_name, doc[field_name])
+                frequencies = Counter(terms)
+                field_term_frequencies.append((f'{field_name}/{doc_ref}', field_name, doc_boost, frequencies, len(terms)))
+                field_lengths_sum[field_name] += len(terms)
+
+                # Counter preserves the order of first occurence, 
+                # so the term indexes are the same as in lunr.py.
+                for term in frequencies:
+                    posting = inverted_index.get(term)
+                    if posting is None:
+                        posting = {name: {} for name in field_names}
+                        posting['_index'] = len(inverted_index)
+                        inverted_index[term] = posting
+                    posting[field_name][doc_ref] = {}
+
+        average_field_length = {name: (field_lengths_sum[name] / document_count if document_count else 0) 
+                                for name in field_names}
+        
+        k1, b = self.k1, self.b
+        idf_cache: Dict[str, float] = {}
+        field_vectors: List[List[Any]] = []
+        for field_ref, field_name, doc_boost, frequencies, field_length in field_term_frequencies:
+            field_boost = boosts[field_name]
+            # An empty field has no terms: do not divide by the average length, which is zero 
+            # when the field is empty in all documents (i.e. a system without docstrings).
+            length_norm = (1 - b + b * (field_length / average_field_length[field_name] if field_length else 0))
+            elements: List[Tuple[int, float]] = []
+            for term, tf in frequencies.items():
+                posting = inverted_index[term]
+                try:
+                    idf = idf_cache[term]
+                except KeyError:
+                    # Same as lunr.idf.idf()
+                    documents_with_term = sum(len(posting[name]) for name in field_names)
+                    x = (document_count - documents_with_term + 0.5) / (documents_with_term + 0.5)
+                    idf = idf_cache[term] = math.log(1 + abs(x))
+                
+                # The order of the operations must stay the same as in lunr.py 
+                # such that the scores are exactly the same.
+                score = idf * ((k1 + 1) * tf) / (k1 * length_norm + tf)
+                score *= field_boost
+                score *= doc_boost
+                elements.append((posting['_index'], round(score, 3)))
+            
+            elements.sort()
+            field_vectors.append([field_ref, [v for e in elements for v in e]])
+
+        import lunr
+        # CamelCased keys for compatibility with JS version
+        return {
+            "version": lunr.__TARGET_JS_VERSION__,
+            "fields": field_names,
+            "fieldVectors": field_vectors,
+            "invertedIndex": [[term, inverted_index[term]] for term in sorted(inverted_index)],
+            "pipeline": list(self.search_pipeline),
+        }
+
 @attr.s(auto_attribs=True)
 class LunrIndexWriter:
     """
@@ -129,33 +322,43 @@ class LunrIndexWriter:
         ]
 
     def write(self) -> None:
+        with self.output_file.open('w', encoding='utf-8') as fobj:
+            fobj.write(self.serialize())
 
-        builder = get_default_builder()
+    def serialize(self) -> str:
+        """
+        Build the index and get its JSON representation.
+        """
 
         # Skip some pipelines for better UX
-        # https://lunr.readthedocs.io/en/latest/customisation.html#skip-a-pipeline-function-for-specific-field-names
-        
         # We want classes named like "For" to be indexed with their name, even if it's matching stop words.
         # We don't want "name" and related fields to be stemmed since we're stemming ourselves the name.
         # see https://github.com/twisted/pydoctor/issues/648 for why.
-        for pipeline_function in builder.pipeline.registered_functions.values():
-            builder.pipeline.skip(pipeline_function, self._SKIP_PIPELINES)  
 
-        # Removing the stemmer from the search pipeline, see https://github.com/yeraydiazdiaz/lunr.py/issues/112
-        builder.search_pipeline.reset()
-
-        index = lunr(
+        # The search pipeline is empty: removing the stemmer from the search pipeline, 
+        # see https://github.com/yeraydiazdiaz/lunr.py/issues/112
+        
+        builder = LunrIndexBuilder(
             ref='qname',
-            fields=[{'field_name':name, 'boost':self._BOOSTS[name]} for name in self.fields],
-            documents=self.get_corpus(), 
-            builder=builder)   
+            fields=[(name, self._BOOSTS[name]) for name in self.fields],
+            skip_pipeline=self._SKIP_PIPELINES)
         
-        serialized_index = json.dumps(index.serialize())
+        return json.dumps(builder.build(self.get_corpus()))
 
-        with self.output_file.open('w', encoding='utf-8') as fobj:
-            fobj.write(serialized_index)
+# The lunr indexes: file name and indexed fields.
+_LUNR_INDEXES = [("searchindex.json", ["name", "names", "qname"]), 
+                 ("fullsearchindex.json", ["name", "names", "qname", "docstring", "kind"])]
 
 # https://lunr.readthedocs.io/en/latest/
+def get_lunr_indexes(system: model.System) -> Iterator[Tuple[str, str]]:
+    """
+    Build ``searchindex.json`` and ``fullsearchindex.json``.
+
+    @returns: The file names and contents of the indexes.
+    """
+    for filename, fields in _LUNR_INDEXES:
+        yield filename, LunrIndexWriter(Path(filename), system=system, fields=fields).serialize()
+
 def write_lunr_index(output_dir: Path, system: model.System) -> None:
     """
     Write ``searchindex.json`` and ``fullsearchindex.json`` to the output directory.
@@ -163,15 +366,9 @@ def write_lunr_index(output_dir: Path, system: model.System) -> None:
     @arg output_dir: Output directory.
     @arg system: System. 
     """
-    LunrIndexWriter(output_dir / "searchindex.json", 
-        system=system, 
-        fields=["name", "names", "qname"]
-        ).write()
-
-    LunrIndexWriter(output_dir / "fullsearchindex.json", 
-        system=system, 
-        fields=["name", "names", "qname", "docstring", "kind"]
-        ).write()
+    for filename, index in get_lunr_indexes(system):
+        with (output_dir / filename).open('w', encoding='utf-8') as fobj:
+            fobj.write(index)
 
 
 def stem_identifier(identifier: str) -> Iterator[str]:
@@ -188,3 +385,12 @@ def stem_identifier(identifier: str) -> Iterator[str]:
                 yield p
 
 searchpages: List[Type[Page]] = [AllDocuments]
+
+def searchPages(system: model.System) -> Iterable[Type[Page]]:
+    """
+    The pages of L{searchpages} to write for this system. 
+    C{all-documents.html} is skipped with option C{--no-all-documents-html}.
+    """
+    if system.options.noalldocumentshtml:
+        return [p for p in searchpages if p is not AllDocuments]
+    return searchpages
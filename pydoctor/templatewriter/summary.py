@@ -3,11 +3,12 @@ from __future__ import annotations
 
 from collections import defaultdict
 from typing import (
-    TYPE_CHECKING, DefaultDict, Dict, Iterable, List, Mapping, MutableSet,
-    Sequence, Tuple, Type, Union, cast
+    TYPE_CHECKING, Any, DefaultDict, Dict, Generic, Iterable, Iterator, List, Mapping, MutableSet,
+    Optional, Sequence, Tuple, Type, TypeVar, Union, cast
 )
 
 from twisted.web.template import Element, Tag, TagLoader, renderer, tags
+from twisted.web.iweb import ITemplateLoader
 
 from pydoctor import epydoc2stan, model, linker
 from pydoctor.templatewriter import TemplateLookup, util
@@ -16,6 +17,97 @@ from pydoctor.templatewriter.pages import Page
 if TYPE_CHECKING:
     from twisted.web.template import Flattenable
 
+SummaryPageT = TypeVar('SummaryPageT', bound='SummaryPage[Any]')
+FragmentT = TypeVar('FragmentT')
+T = TypeVar('T')
+
+def fragmentFilename(filename: str, fragment: str) -> str:
+    """
+    The filename of a fragment of a summary page, i.e. C{classIndex-twisted.internet.html}.
+    The dash cannot appear in the filename of an object page.
+    """
+    stem, _, ext = filename.rpartition('.')
+    return f'{stem}-{fragment}.{ext}'
+
+def summarySection(ob: model.Documentable) -> str:
+    """
+    The name of the fragment that lists the object when the summary pages are split: 
+    the name of its module or package, up to the second level (i.e. C{twisted.internet}).
+    """
+    module = ob if isinstance(ob, model.Module) else ob.module
+    return '.'.join(module.fullName().split('.')[:2])
+
+class SummaryPage(Page, Generic[FragmentT]):
+    """
+    Base class of the summary pages that can be split with C{--split-summary-pages}. 
+    
+    When split, the page only links to fragment pages, each listing a part of the system. 
+    The objects are grouped in fragments once by L{fragments}, and each fragment is rendered 
+    by an instance of the same class created with the C{fragment} argument, see L{pages}.
+    """
+
+    def __init__(self, system: model.System, template_lookup: TemplateLookup, 
+                 loader: Optional[ITemplateLoader] = None, fragment: Optional[str] = None, 
+                 fragments: Optional[Mapping[str, FragmentT]] = None):
+        super().__init__(system=system, template_lookup=template_lookup, loader=loader)
+        self.fragment = fragment
+        """The fragment rendered by this page, C{None} for the main page."""
+        if fragment is not None:
+            self.filename = fragmentFilename(self.filename, fragment)
+        if fragments is None:
+            fragments = self.fragments(system) if system.options.split_summary_pages else {}
+        self.fragment_contents = fragments
+        """The contents of all the fragments, shared by the pages created by L{pages}. Empty if the page is not split."""
+
+    @property
+    def is_index_of_fragments(self) -> bool:
+        """
+        Whether this page only links to the fragment pages.
+        """
+        return self.fragment is None and self.system.options.split_summary_pages
+
+    @classmethod
+    def fragments(cls, system: model.System) -> Mapping[str, FragmentT]:
+        """
+        The contents of the fragments of the page when split, by name, 
+        in the order they are listed on the main page.
+        """
+        return {}
+
+    @classmethod
+    def pages(cls: Type[SummaryPageT], system: model.System, template_lookup: TemplateLookup) -> Iterator[SummaryPageT]:
+        """
+        Create the page and its fragments, if the summary pages are split. 
+        The objects are grouped in fragments only once for all the pages.
+        """
+        if not system.options.split_summary_pages:
+            yield cls(system, template_lookup)
+            return
+        fragments = cls.fragments(system)
+        yield cls(system, template_lookup, fragments=fragments)
+        for fragment in fragments:
+            yield cls(system, template_lookup, fragment=fragment, fragments=fragments)
+
+    def fragmentTitle(self, title: str) -> str:
+        return title if self.fragment is None else f'{title}: {self.fragment}'
+
+    def fragmentLinks(self, counts: Mapping[str, int], noun: str, plural: str) -> Tag:
+        """
+        The list of links to the fragment pages, with the number of items in each of them.
+        """
+        ul = tags.ul(id='summaryTree')
+        for fragment, count in counts.items():
+            ul(tags.li(tags.a(fragment, href=fragmentFilename(type(self).filename, fragment)), 
+                       f' - {count} {noun if count == 1 else plural}'))
+        return ul
+
+def _groupBySection(items: Iterable[Tuple[str, T]]) -> Dict[str, List[T]]:
+    # Group the items by summarySection() name, the sections are sorted.
+    groups: Dict[str, List[T]] = {}
+    for section, item in items:
+        groups.setdefault(section, []).append(item)
+    return dict(sorted(groups.items(), key=lambda item: (item[0].lower(), item[0])))
+
 
 def moduleSummary(module: model.Module, page_url: str) -> Tag:
     r: Tag = tags.li(
@@ -55,30 +147,69 @@ def moduleSummary(module: model.Module, page_url: str) -> Tag:
 def _lckey(x: model.Documentable) -> Tuple[str, str]:
     return (x.fullName().lower(), x.fullName())
 
-class ModuleIndexPage(Page):
+def _splitPackages(system: model.System) -> Iterator[model.Module]:
+    # The second level packages that have submodules, listed in their own page when split.
+    for root in system.rootobjects:
+        if isinstance(root, model.Package):
+            for m in sorted(root.submodules(), key=util.alphabetical_order_func):
+                if any(m.submodules()):
+                    yield m
+
+class ModuleIndexPage(SummaryPage[model.Module]):
 
     filename = 'moduleIndex.html'
 
-    def __init__(self, system: model.System, template_lookup: TemplateLookup):
+    def __init__(self, system: model.System, template_lookup: TemplateLookup, fragment: Optional[str] = None, 
+                 fragments: Optional[Mapping[str, model.Module]] = None):
 
         # Override L{Page.loader} because here the page L{filename}
         # does not equal the template filename.
         super().__init__(system=system, template_lookup=template_lookup,
-            loader=template_lookup.get_loader('summary.html') )
+            loader=template_lookup.get_loader('summary.html'), fragment=fragment, fragments=fragments)
+
+    @classmethod
+    def fragments(cls, system: model.System) -> Mapping[str, model.Module]:
+        return {m.fullName(): m for m in _splitPackages(system)}
 
     def title(self) -> str:
-        return "Module Index"
+        return self.fragmentTitle("Module Index")
 
     @renderer
     def stuff(self, request: object, tag: Tag) -> Tag:
         tag.clear()
-        tag([moduleSummary(o, self.filename) for o in self.system.rootobjects])
+        if self.fragment is not None:
+            tag(moduleSummary(self.fragment_contents[self.fragment], self.filename))
+        elif self.is_index_of_fragments:
+            # Only the root packages and their direct submodules, 
+            # the packages with submodules link to their own page.
+            split = set(self.fragment_contents.values())
+            for root in self.system.rootobjects:
+                item = tags.li(tags.code(linker.taglink(root, self.filename, label=root.name)), ' - ',
+                               epydoc2stan.format_summary(root))
+                if root.isPrivate:
+                    item(class_='private')
+                if isinstance(root, model.Package):
+                    ul = tags.ul()
+                    for m in sorted(root.submodules(), key=util.alphabetical_order_func):
+                        if m in split:
+                            sub = tags.li(tags.code(linker.taglink(m, self.filename, label=m.name)), ' - ',
+                                          epydoc2stan.format_summary(m), ' ', 
+                                          tags.a('(submodules)', href=fragmentFilename(self.filename, m.fullName())))
+                            if m.isPrivate:
+                                sub(class_='private')
+                            ul(sub)
+                        else:
+                            ul(moduleSummary(m, self.filename))
+                    item(ul)
+                tag(item)
+        else:
+            tag([moduleSummary(o, self.filename) for o in self.system.rootobjects])
         return tag
 
     @renderer
     def heading(self, request: object, tag: Tag) -> Tag:
         tag().clear()
-        tag("Module Index")
+        tag(self.title())
         return tag
 
 def findRootClasses(
@@ -142,8 +273,7 @@ def subclassesFrom(
         anchors.add(name)
     r(tags.div(tags.code(linker.taglink(cls, page_url)), ' - ',
       epydoc2stan.format_summary(cls)))
-    scs = [sc for sc in cls.subclasses if sc.system is hostsystem and ' ' not in sc.fullName()
-           and sc.isVisible]
+    scs = _subclasses(hostsystem, cls)
     if len(scs) > 0:
         ul = tags.ul()
         for sc in sorted(scs, key=_lckey):
@@ -151,25 +281,59 @@ def subclassesFrom(
         r(ul)
     return r
 
-class ClassIndexPage(Page):
+def _subclasses(hostsystem: model.System, cls: model.Class) -> List[model.Class]:
+    return [sc for sc in cls.subclasses if sc.system is hostsystem and ' ' not in sc.fullName()
+            and sc.isVisible]
+
+def _hierarchySize(hostsystem: model.System, cls: model.Class) -> int:
+    # The number of items listed by subclassesFrom().
+    return 1 + sum(_hierarchySize(hostsystem, sc) for sc in _subclasses(hostsystem, cls))
+
+RootClassT = Tuple[str, Union[model.Class, Sequence[model.Class]]]
+
+def _classIndexFragments(system: model.System) -> Iterator[Tuple[str, RootClassT]]:
+    # Each hierarchy is listed in the fragment of its root class; the subclasses
+    # of an external base class are listed in their own fragment.
+    for b, o in findRootClasses(system):
+        if isinstance(o, model.Class):
+            yield summarySection(o), (b, o)
+        else:
+            for section, subclasses in _groupBySection((summarySection(sc), sc) for sc in o).items():
+                yield section, (b, subclasses)
+
+class ClassIndexPage(SummaryPage[List[RootClassT]]):
 
     filename = 'classIndex.html'
 
-    def __init__(self, system: model.System, template_lookup: TemplateLookup):
+    def __init__(self, system: model.System, template_lookup: TemplateLookup, fragment: Optional[str] = None, 
+                 fragments: Optional[Mapping[str, List[RootClassT]]] = None):
 
         # Override L{Page.loader} because here the page L{filename}
         # does not equal the template filename.
         super().__init__(system=system, template_lookup=template_lookup,
-            loader=template_lookup.get_loader('summary.html') )
+            loader=template_lookup.get_loader('summary.html'), fragment=fragment, fragments=fragments)
+
+    @classmethod
+    def fragments(cls, system: model.System) -> Mapping[str, List[RootClassT]]:
+        return _groupBySection(_classIndexFragments(system))
 
     def title(self) -> str:
-        return "Class Hierarchy"
+        return self.fragmentTitle("Class Hierarchy")
 
     @renderer
     def stuff(self, request: object, tag: Tag) -> Tag:
+        if self.is_index_of_fragments:
+            counts = {section: sum(_hierarchySize(self.system, root) 
+                                   for _, o in roots for root in ([o] if isinstance(o, model.Class) else o)) 
+                      for section, roots in self.fragment_contents.items()}
+            return tag.clear()(self.fragmentLinks(counts, 'class', 'classes').children)
         t = tag
         anchors: MutableSet[str] = set()
-        for b, o in findRootClasses(self.system):
+        # A fragment lists the hierarchies of the root classes of its section, and 
+        # the subclasses of the external base classes that are in its section.
+        rootclasses = (findRootClasses(self.system) if self.fragment is None 
+                       else self.fragment_contents[self.fragment])
+        for b, o in rootclasses:
             if isinstance(o, model.Class):
                 t(subclassesFrom(self.system, o, anchors, self.filename))
             else:
@@ -202,7 +366,7 @@ class ClassIndexPage(Page):
     @renderer
     def heading(self, request: object, tag: Tag) -> Tag:
         tag.clear()
-        tag("Class Hierarchy")
+        tag(self.title())
         return tag
 
 
@@ -211,11 +375,17 @@ class LetterElement(Element):
     def __init__(self,
             loader: TagLoader,
             initials: Mapping[str, Sequence[model.Documentable]],
-            letter: str
+            letter: str, 
+            split: bool = False
             ):
+        """
+        @param split: Whether each letter is on its own page, see L{NameIndexPage}.
+        """
         super().__init__(loader=loader)
         self.initials = initials
         self.my_letter = letter
+        self.split = split
+        self.page_url = fragmentFilename(NameIndexPage.filename, letter) if split else NameIndexPage.filename
 
     @renderer
     def letter(self, request: object, tag: Tag) -> Tag:
@@ -228,6 +398,8 @@ class LetterElement(Element):
         for initial in sorted(self.initials):
             if initial == self.my_letter:
                 letterlinks.append(initial)
+            elif self.split:
+                letterlinks.append(tags.a(href=fragmentFilename(NameIndexPage.filename, initial))(initial))
             else:
                 letterlinks.append(tags.a(href='#'+initial)(initial))
             letterlinks.append(' - ')
@@ -245,7 +417,7 @@ class LetterElement(Element):
             if obj.kind:
                 attributes["data-type"] = epydoc2stan.format_kind(obj.kind)
             return tags.code(
-                linker.taglink(obj, NameIndexPage.filename), **attributes
+                linker.taglink(obj, self.page_url), **attributes
                 )
         name2obs: DefaultDict[str, List[model.Documentable]] = defaultdict(list)
         for obj in self.initials[self.my_letter]:
@@ -270,27 +442,43 @@ class LetterElement(Element):
         return r
 
 
-class NameIndexPage(Page):
+def _initials(system: model.System) -> Dict[str, List[model.Documentable]]:
+    initials: Dict[str, List[model.Documentable]] = {}
+    for ob in system.allobjects.values():
+        if ob.isVisible:
+            initials.setdefault(ob.name[0].upper(), []).append(ob)
+    return initials
+
+class NameIndexPage(SummaryPage[List[model.Documentable]]):
+    """
+    The index of names. When split, there is one page per initial letter.
+    """
 
     filename = 'nameIndex.html'
 
-    def __init__(self, system: model.System, template_lookup: TemplateLookup):
-        super().__init__(system=system, template_lookup=template_lookup)
-        self.initials: Dict[str, List[model.Documentable]] = {}
-        for ob in self.system.allobjects.values():
-            if ob.isVisible:
-                self.initials.setdefault(ob.name[0].upper(), []).append(ob)
+    def __init__(self, system: model.System, template_lookup: TemplateLookup, fragment: Optional[str] = None, 
+                 fragments: Optional[Mapping[str, List[model.Documentable]]] = None):
+        super().__init__(system=system, template_lookup=template_lookup, fragment=fragment, fragments=fragments)
+        self.initials = self.fragment_contents if system.options.split_summary_pages else _initials(system)
 
+    @classmethod
+    def fragments(cls, system: model.System) -> Mapping[str, List[model.Documentable]]:
+        initials = _initials(system)
+        return {i: initials[i] for i in sorted(initials)}
 
     def title(self) -> str:
-        return "Index of Names"
+        return self.fragmentTitle("Index of Names")
 
     @renderer
     def heading(self, request: object, tag: Tag) -> Tag:
-        return tag.clear()("Index of Names")
+        return tag.clear()(self.title())
 
     @renderer
     def index(self, request: object, tag: Tag) -> "Flattenable":
+        if self.is_index_of_fragments:
+            return self.fragmentLinks({i: len(self.initials[i]) for i in sorted(self.initials)}, 'name', 'names')
+        if self.fragment is not None:
+            return LetterElement(TagLoader(tag), self.initials, self.fragment, split=True)
         r = []
         for i in sorted(self.initials):
             r.append(LetterElement(TagLoader(tag), self.initials, i))
@@ -322,33 +510,45 @@ class IndexPage(Page):
 
 
 def hasdocstring(ob: model.Documentable) -> bool:
-    for source in ob.docsources():
+    for source in model.get_docsources(ob):
         if source.docstring is not None:
             return True
     return False
 
-class UndocumentedSummaryPage(Page):
+def _undocumented(system: model.System) -> Iterator[model.Documentable]:
+    for o in system.allobjects.values():
+        if o.isVisible and not hasdocstring(o):
+            yield o
+
+class UndocumentedSummaryPage(SummaryPage[List[model.Documentable]]):
 
     filename = 'undoccedSummary.html'
 
-    def __init__(self, system: model.System, template_lookup: TemplateLookup):
+    def __init__(self, system: model.System, template_lookup: TemplateLookup, fragment: Optional[str] = None, 
+                 fragments: Optional[Mapping[str, List[model.Documentable]]] = None):
         # Override L{Page.loader} because here the page L{filename}
         # does not equal the template filename.
         super().__init__(system=system, template_lookup=template_lookup,
-            loader=template_lookup.get_loader('summary.html') )
+            loader=template_lookup.get_loader('summary.html'), fragment=fragment, fragments=fragments)
+
+    @classmethod
+    def fragments(cls, system: model.System) -> Mapping[str, List[model.Documentable]]:
+        return _groupBySection((summarySection(o), o) for o in _undocumented(system))
 
     def title(self) -> str:
-        return "Summary of Undocumented Objects"
+        return self.fragmentTitle("Summary of Undocumented Objects")
 
     @renderer
     def heading(self, request: object, tag: Tag) -> Tag:
-        return tag.clear()("Summary of Undocumented Objects")
+        return tag.clear()(self.title())
 
     @renderer
     def stuff(self, request: object, tag: Tag) -> Tag:
-        undoccedpublic = [o for o in self.system.allobjects.values()
-                          if o.isVisible and not hasdocstring(o)]
-        undoccedpublic.sort(key=lambda o:o.fullName())
+        if self.is_index_of_fragments:
+            return tag.clear()(self.fragmentLinks(
+                {section: len(obs) for section, obs in self.fragment_contents.items()}, 'object', 'objects').children)
+        undoccedpublic = sorted(_undocumented(self.system) if self.fragment is None 
+                                else self.fragment_contents[self.fragment], key=lambda o:o.fullName())
         for o in undoccedpublic:
             kind = o.kind
             assert kind is not None  # 'kind is None' makes the object invisible
@@ -359,7 +559,7 @@ class UndocumentedSummaryPage(Page):
         return tag
 
 def summaryPages(system: model.System) -> Iterable[Type[Page]]:
-    pages = [
+    pages: List[Type[Page]] = [
         ModuleIndexPage,
         ClassIndexPage,
         NameIndexPage,
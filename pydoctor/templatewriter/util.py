@@ -2,8 +2,9 @@
 from __future__ import annotations
 
 import warnings
+import weakref
 from typing import (Any, Callable, Dict, Generic, Iterable, Iterator, List, Mapping, 
-                    Optional, MutableMapping, Tuple, TypeVar, Union, Sequence, TYPE_CHECKING)
+                    Optional, MutableMapping, Set, Tuple, TypeVar, Union, Sequence, TYPE_CHECKING)
 from pydoctor import epydoc2stan
 import collections.abc
 from pydoctor import model
@@ -51,13 +52,75 @@ def overriding_subclasses(
     """
     Helper function to retreive the subclasses that override the given name from the parent class object. 
     """
-    if not firstcall and name in classobj.contents:
+    if firstcall:
+        yield from _overriding_subclasses_map(classobj).get(name, ())
+    elif name in classobj.contents:
         yield classobj
     else:
         for subclass in classobj.subclasses:
             if subclass.isVisible:
                 yield from overriding_subclasses(subclass, name, firstcall=False)
 
+# Per-class memos of the hierarchy walks done while rendering. 
+# They are only filled once the MRO is final, i.e. after post-processing; 
+# the weak keys tie their lifetime to the L{model.System} being rendered.
+_overriding_subclasses_cache: 'weakref.WeakKeyDictionary[model.Class, Dict[str, List[model.Class]]]' = weakref.WeakKeyDictionary()
+_overridden_members_cache: 'weakref.WeakKeyDictionary[model.Class, Dict[str, model.Documentable]]' = weakref.WeakKeyDictionary()
+_class_members_cache: 'weakref.WeakKeyDictionary[model.Class, List[Tuple[Tuple[model.Class, ...], Sequence[model.Documentable]]]]' = weakref.WeakKeyDictionary()
+
+def clear_caches() -> None:
+    """
+    Forget the memos of the hierarchy walks, when the classes of a system changed 
+    after they were rendered, see L{model.System.reprocessModules}.
+    """
+    _overriding_subclasses_cache.clear()
+    _overridden_members_cache.clear()
+    _class_members_cache.clear()
+
+def _is_final(cls: model.Class) -> bool:
+    # The MRO is set in post-processing, results computed before are not cached.
+    return cls._mro is not None
+
+def _overriding_subclasses_map(classobj: model.Class) -> Mapping[str, Sequence[model.Class]]:
+    """
+    Map each name to the subclasses that override it, in the order of L{overriding_subclasses}. 
+    The map of a class is built from the maps of its direct subclasses.
+    """
+    try:
+        return _overriding_subclasses_cache[classobj]
+    except KeyError:
+        pass
+    r: Dict[str, List[model.Class]] = {}
+    final = _is_final(classobj)
+    if final:
+        # Placeholder that breaks inheritance cycles.
+        _overriding_subclasses_cache[classobj] = r
+    for subclass in classobj.subclasses:
+        if not subclass.isVisible:
+            continue
+        for name in subclass.contents:
+            r.setdefault(name, []).append(subclass)
+        for name, ocs in _overriding_subclasses_map(subclass).items():
+            if name not in subclass.contents:
+                r.setdefault(name, []).extend(ocs)
+    return r
+
+def overridden_member(classobj: model.Class, name: str) -> Optional[model.Documentable]:
+    """
+    Get the member the given name overrides in the base classes, 
+    that is the first one found when following the MRO, excluding the class itself.
+    """
+    try:
+        members = _overridden_members_cache[classobj]
+    except KeyError:
+        members = {}
+        # Follow the MRO backward, so the first classes in the MRO win.
+        for b in reversed(classobj.mro(include_self=False)):
+            members.update(b.contents)
+        if _is_final(classobj):
+            _overridden_members_cache[classobj] = members
+    return members.get(name)
+
 def nested_bases(classobj: model.Class) -> Iterator[Tuple[model.Class, ...]]:
     """
     Helper function to retreive the complete list of base classes chains (represented by tuples) for a given Class. 
@@ -137,12 +200,24 @@ def class_members(cls: model.Class) -> List[Tuple[Tuple[model.Class, ...], Seque
 
     @returns: Tuples of tuple: C{inherited_via:Tuple[model.Class, ...], attributes:Sequence[model.Documentable]}.
     """
-    baselists = []
-    for baselist in nested_bases(cls):
-        attrs = unmasked_attrs(baselist)
+    try:
+        return list(_class_members_cache[cls])
+    except KeyError:
+        pass
+    # Equivalent to calling unmasked_attrs() for each of nested_bases(), 
+    # but the names defined in the chains are accumulated instead of being re-computed for each chain.
+    baselists: List[Tuple[Tuple[model.Class, ...], Sequence[model.Documentable]]] = []
+    _mro = cls.mro()
+    maybe_masking: Set[str] = set()
+    for i, base in enumerate(_mro):
+        attrs = [o for o in base.contents.values()
+                 if o.isVisible and o.name not in maybe_masking]
         if attrs:
-            baselists.append((baselist, attrs))
-    return baselists
+            baselists.append((tuple(reversed(_mro[:(i+1)])), attrs))
+        maybe_masking.update(base.contents)
+    if _is_final(cls):
+        _class_members_cache[cls] = baselists
+    return list(baselists)
 
 def inherited_members(cls: model.Class) -> List[model.Documentable]:
     """
@@ -1,14 +1,21 @@
 """Badly named module that contains the driving code for the rendering."""
 from __future__ import annotations
 
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+import functools
+import hashlib
+import io
 import itertools
-from pathlib import Path
-from typing import IO, Iterable, Type, TYPE_CHECKING
+import json
+import os
+import threading
+from pathlib import Path, PurePosixPath
+from typing import IO, Any, Callable, Container, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Type, TYPE_CHECKING
 
 from pydoctor import model
 from pydoctor.extensions import zopeinterface
 from pydoctor.templatewriter import (
-    DOCTYPE, pages, summary, search, TemplateLookup, IWriter, StaticTemplate
+    DOCTYPE, pages, summary, search, compress, TemplateLookup, IWriter, StaticTemplate
 )
 
 from twisted.python.failure import Failure
@@ -32,6 +39,20 @@ def flattenToFile(fobj: IO[bytes], elem: "Flattenable") -> None:
     if err:
         raise err
 
+def flattenToBytes(elem: "Flattenable") -> bytes:
+    """
+    Same as L{flattenToFile}, but returns the content of the HTML file.
+    """
+    fobj = io.BytesIO()
+    flattenToFile(fobj, elem)
+    return fobj.getvalue()
+
+MANIFEST = '.pydoctor-manifest.json'
+"""
+Name of the file listing the files written in the build directory, 
+with their hash, size and modification time. See L{TemplateWriter.write_changed_only}.
+"""
+
 
 class TemplateWriter(IWriter):
     """
@@ -60,16 +81,99 @@ class TemplateWriter(IWriter):
         self.written_pages: int = 0
         self.total_pages: int = 0
         self.dry_run: bool = False
+
+        self.visitors: List[Callable[[model.Documentable], None]] = []
+        """
+        Functions called with each visible object while writing the individual files, parents first. 
+        Used to generate the Sphinx inventory without walking the objects again.
+        """
+
+        self.link_static_assets: bool = False
+        """Hard link the static templates from the theme files instead of copying them, when possible."""
+
+        self.static_assets_store: Optional[Path] = None
+        """
+        Directory of content-addressed static templates shared by several builds. 
+        If set, static templates are hard linked from this directory, see L{StaticTemplate.write}.
+        """
+
+        self.write_changed_only: bool = False
+        """
+        Do not write again the files that already exist in the build directory with the same content, 
+        so their modification time is kept, and replace the others atomically. 
         
+        The files written are listed in the L{MANIFEST} file of the build directory, with their hash, 
+        size and modification time: a file that did not change since it's listed in the manifest is not read again. 
+        The files of the previous build that are not written anymore can be deleted with L{deleteStaleFiles}.
+        See C{--write-changed-only} and C{--watch}.
+        """
+
+        self.render_only: Optional[Container[model.Documentable]] = None
+        """
+        If not C{None}, L{writeIndividualFiles} only renders the pages of these objects: 
+        the files of the other pages are kept from the previous build. 
+        The visitors are still called with all the objects. Requires L{write_changed_only}, see C{--watch}.
+        """
+
+        self.unchanged_pages: int = 0
+        """Number of files not written because they were up to date, if L{write_changed_only} is true."""
+
+        self.deleted_files: int = 0
+        """Number of files deleted by L{deleteStaleFiles}."""
+
+        self.write_threads: int = 0
+        """
+        Number of background threads writing the files passed to L{writeFile}, so the next pages 
+        are rendered while the previous ones are written. Zero means the files are written right away.
+        """
+
+        self.max_pending_writes: int = 64
+        """
+        Maximum number of files waiting to be written by the background threads. 
+        L{writeFile} blocks when it's reached, so the rendered pages do not pile up in memory.
+        """
+
+        self.precompress: Sequence[str] = ()
+        """
+        Formats of the compressed copies written next to the HTML pages, JSON files and static assets, 
+        see L{compress.availableFormats}. The files are compressed by a pool of L{compress_processes} processes, 
+        from the data passed to L{writeFile}. See C{--precompress}.
+        """
+
+        self.compress_processes: Optional[int] = None
+        """Number of processes compressing the files, the number of CPUs if C{None}."""
+
+        self._write_pool: Optional[ThreadPoolExecutor] = None
+        self._compress_pool: Optional[ProcessPoolExecutor] = None
+        self._pending_compressions = threading.BoundedSemaphore(self.max_pending_writes)
+        self._pending_writes = threading.BoundedSemaphore(self.max_pending_writes)
+        self._write_error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+
+        self._previous_manifest: Optional[Dict[str, Dict[str, Any]]] = None
+        self._manifest: Dict[str, Dict[str, Any]] = {}
+        self._written: Set[str] = set()
+
 
     def prepOutputDirectory(self) -> None:
         """
         Write static CSS and JS files to build directory.
+        Files that are already up to date are not written again.
         """
         self.build_directory.mkdir(exist_ok=True, parents=True)
+        if self.write_changed_only:
+            self._previous_manifest = self._readManifest()
         for template in self.template_lookup.templates:
             if isinstance(template, StaticTemplate):
-                template.write(self.build_directory)
+                template.write(self.build_directory, 
+                               link=self.link_static_assets, 
+                               store=self.static_assets_store)
+                if self.write_changed_only:
+                    # Static templates are only listed so they are not deleted as stale files.
+                    self._written.add(template.name)
+                    self._manifest[template.name] = {'static': True}
+                if self.precompress:
+                    self._compressFile(template.name, template.data)
 
     def writeIndividualFiles(self, obs: Iterable[model.Documentable]) -> None:
         """
@@ -84,44 +188,320 @@ class TemplateWriter(IWriter):
 
     def writeSummaryPages(self, system: model.System) -> None:
         import time
-        for pclass in itertools.chain(summary.summaryPages(system), search.searchpages):
+        for pclass in itertools.chain(summary.summaryPages(system), search.searchPages(system)):
             system.msg('html', 'starting ' + pclass.__name__ + ' ...', nonl=True)
             T = time.time()
-            page = pclass(system=system, template_lookup=self.template_lookup)
-            with self.build_directory.joinpath(pclass.filename).open('wb') as fobj:
-                flattenToFile(fobj, page)
+            if issubclass(pclass, summary.SummaryPage):
+                instances: Iterable[pages.Page] = pclass.pages(system, self.template_lookup)
+            else:
+                instances = [pclass(system=system, template_lookup=self.template_lookup)]
+            for page in instances:
+                self.writeFile(page.filename, flattenToBytes(page))
             system.msg('html', "took %fs"%(time.time() - T), wantsnl=False)
         
         # Generate the searchindex.json file
         system.msg('html', 'starting lunr search index ...', nonl=True)
         T = time.time()
-        search.write_lunr_index(self.build_directory, system=system)
+        for filename, index in search.get_lunr_indexes(system):
+            self.writeFile(filename, index.encode('utf-8'))
+        system.msg('html', "took %fs"%(time.time() - T), wantsnl=False)
+
+        # Generate the all-documents.json file, used by the search to display results.
+        system.msg('html', 'starting all documents data ...', nonl=True)
+        T = time.time()
+        self.writeFile('all-documents.json', search.dumps_all_documents_json(system).encode('utf-8'))
         system.msg('html', "took %fs"%(time.time() - T), wantsnl=False)
 
         if len(system.root_names) == 1:
             # If there is just a single root module it is written to index.html to produce nicer URLs.
             # To not break old links we also create a symlink from the full module name to the index.html
             # file. This is also good for consistency: every module is accessible by <full module name>.html
-            root_module_path = (self.build_directory / (list(system.root_names)[0] + '.html'))
-            try:
-                root_module_path.unlink()
-                # not using missing_ok=True because that was only added in Python 3.8 and we still support Python 3.6
-            except FileNotFoundError:
-                pass
-            root_module_path.symlink_to('index.html')
+            self.linkFile(list(system.root_names)[0] + '.html', 'index.html')
 
     def _writeDocsFor(self, ob: model.Documentable) -> None:
         if not ob.isVisible:
             return
+        if not self.dry_run:
+            for visitor in self.visitors:
+                visitor(ob)
         if ob.documentation_location is model.DocLocation.OWN_PAGE:
-            if self.dry_run:
+            if self.render_only is not None and ob not in self.render_only:
+                if not self.dry_run:
+                    self._keepFile(ob.url)
+            elif self.dry_run:
                 self.total_pages += 1
             else:
-                with self.build_directory.joinpath(ob.url).open('wb') as fobj:
-                    self._writeDocsForOne(ob, fobj)
+                fobj = io.BytesIO()
+                self._writeDocsForOne(ob, fobj)
+                self.writeFile(ob.url, fobj.getvalue())
         for o in ob.contents.values():
             self._writeDocsFor(o)
 
+    def writeFile(self, name: str, data: bytes) -> None:
+        """
+        Write a file of the documentation: HTML pages, search indexes and Sphinx inventory. 
+        Static templates are written by L{prepOutputDirectory}.
+
+        Files are written in the build directory, by the background threads if L{write_threads} is not zero. 
+        If L{write_changed_only} is true, files that already have the same content are not written again. 
+        Subclasses can override this method to store the files elsewhere, 
+        see L{pydoctor.templatewriter.archive}.
+
+        @param name: Path of the file relative to the build directory, with C{/} separators.
+        @param data: Content of the file.
+        @raises Exception: If a previous file could not be written by the background threads.
+        """
+        self._written.add(name)
+        if self.precompress:
+            self._compressFile(name, data)
+        if self.write_threads <= 0:
+            self._writeFileNow(name, data)
+            return
+        
+        self._raiseWriteError()
+        if self._write_pool is None:
+            self._write_pool = ThreadPoolExecutor(max_workers=self.write_threads, 
+                                                  thread_name_prefix='pydoctor-writer')
+            self._pending_writes = threading.BoundedSemaphore(self.max_pending_writes)
+        # Wait for a slot if too many files are waiting to be written.
+        self._pending_writes.acquire()
+        try:
+            future = self._write_pool.submit(self._writeFileNow, name, data)
+        except BaseException:
+            self._pending_writes.release()
+            raise
+        future.add_done_callback(self._writeDone)
+
+    def _keepFile(self, name: str) -> None:
+        """
+        Keep the file written by the previous build, so it's not deleted by L{deleteStaleFiles}.
+        """
+        assert self.write_changed_only
+        self._written.add(name)
+        if self.precompress and compress.isCompressible(name):
+            self._written.update(f'{name}.{fmt}' for fmt in self.precompress)
+
+    def _writeDone(self, future: 'Future[None]') -> None:
+        self._pending_writes.release()
+        error = future.exception()
+        if error is not None:
+            self._setWriteError(error)
+
+    def _setWriteError(self, error: BaseException) -> None:
+        with self._lock:
+            if self._write_error is None:
+                self._write_error = error
+
+    def _waitForWrites(self) -> None:
+        # The compressed files are written when the compression is done, before the pool shuts down.
+        if self._compress_pool is not None:
+            self._compress_pool.shutdown(wait=True)
+            self._compress_pool = None
+        if self._write_pool is not None:
+            self._write_pool.shutdown(wait=True)
+            self._write_pool = None
+
+    def _compressFile(self, name: str, data: bytes) -> None:
+        """
+        Write the compressed copies of a file, in the background.
+        """
+        if not compress.isCompressible(name):
+            return
+        names = [f'{name}.{fmt}' for fmt in self.precompress]
+        self._written.update(names)
+        digest = None
+        if self.write_changed_only:
+            digest = hashlib.sha256(data).hexdigest()
+            entries = self._compressedEntries(names, digest)
+            if entries is not None:
+                # Not compressed again: the compressed files are up to date.
+                with self._lock:
+                    self.unchanged_pages += len(entries)
+                    self._manifest.update(entries)
+                return
+        
+        self._raiseWriteError()
+        if self._compress_pool is None:
+            self._compress_pool = ProcessPoolExecutor(max_workers=self.compress_processes)
+            self._pending_compressions = threading.BoundedSemaphore(self.max_pending_writes)
+        # Wait for a slot if too many files are waiting to be compressed.
+        self._pending_compressions.acquire()
+        try:
+            future = self._compress_pool.submit(compress.compress, data, tuple(self.precompress))
+        except BaseException:
+            self._pending_compressions.release()
+            raise
+        future.add_done_callback(functools.partial(self._compressDone, name, digest))
+
+    def _compressDone(self, name: str, digest: Optional[str], future: 'Future[List[Tuple[str, bytes]]]') -> None:
+        try:
+            for fmt, data in future.result():
+                self._writeFileNow(f'{name}.{fmt}', data, source=digest)
+        except BaseException as e:
+            self._setWriteError(e)
+        finally:
+            self._pending_compressions.release()
+
+    def _compressedEntries(self, names: Sequence[str], digest: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Get the manifest entries of the compressed files if they are up to date, else C{None}.
+        """
+        entries = {}
+        for name in names:
+            entry = (self._previous_manifest or {}).get(name)
+            if entry is None or entry.get('source') != digest:
+                return None
+            try:
+                st = self.build_directory.joinpath(name).stat()
+            except OSError:
+                return None
+            if (st.st_size, st.st_mtime_ns) != (entry.get('size'), entry.get('mtime_ns')):
+                return None
+            entries[name] = entry
+        return entries
+
+    def _raiseWriteError(self) -> None:
+        error, self._write_error = self._write_error, None
+        if error is not None:
+            raise error
+
+    def _writeFileNow(self, name: str, data: bytes, source: Optional[str] = None) -> None:
+        path = self.build_directory.joinpath(name)
+        if not self.write_changed_only:
+            path.write_bytes(data)
+            return
+        
+        up_to_date = self._upToDateEntry(name, path, data, source)
+        if up_to_date is not None:
+            with self._lock:
+                self.unchanged_pages += 1
+                self._manifest[name] = up_to_date
+            return
+        
+        # Write to a temporary file and rename it, so a browser reloading 
+        # the page while it's written never gets a truncated file.
+        tmp = path.with_name(f'.{path.name}.tmp')
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            raise
+        st = path.stat()
+        entry: Dict[str, Any] = {'sha256': hashlib.sha256(data).hexdigest(), 
+                                 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+        if source is not None:
+            entry['source'] = source
+        with self._lock:
+            self._manifest[name] = entry
+
+    def _upToDateEntry(self, name: str, path: Path, data: bytes, 
+                       source: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get the manifest entry of the file if it already has the given content, else C{None}.
+
+        @param source: For compressed files, the hash of the uncompressed data.
+        """
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        if st.st_size != len(data):
+            return None
+        entry: Dict[str, Any] = {'sha256': hashlib.sha256(data).hexdigest(), 
+                                 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+        if source is not None:
+            entry['source'] = source
+        previous = (self._previous_manifest or {}).get(name)
+        # The file did not change since the last build: no need to read it.
+        if previous == entry or path.read_bytes() == data:
+            return entry
+        return None
+
+    def linkFile(self, name: str, target: str) -> None:
+        """
+        Make the file C{name} an alias of the file C{target}, in the same directory. 
+        Creates a symbolic link in the build directory.
+        """
+        path = self.build_directory.joinpath(name)
+        self._written.add(name)
+        if self.write_changed_only:
+            with self._lock:
+                self._manifest[name] = {'link': target}
+        if not (path.is_symlink() and os.readlink(path) == target):
+            try:
+                path.unlink()
+                # not using missing_ok=True because that was only added in Python 3.8 and we still support Python 3.6
+            except FileNotFoundError:
+                pass
+            path.symlink_to(target)
+        if self.precompress and compress.isCompressible(target):
+            for fmt in self.precompress:
+                self.linkFile(f'{name}.{fmt}', f'{target}.{fmt}')
+
+    def deleteStaleFiles(self) -> None:
+        """
+        Delete the files listed in the L{MANIFEST} of the previous build that were not written by this one, 
+        because the objects they documented do not exist anymore. 
+        
+        Only called when all files have been written: if only some pages are written, the others are not stale. 
+        Does nothing if L{write_changed_only} is false.
+
+        @raises Exception: If a file could not be written by the background threads, 
+            nothing is deleted in this case.
+        """
+        if self._previous_manifest is None:
+            return
+        self._waitForWrites()
+        self._raiseWriteError()
+        for name in sorted(self._previous_manifest.keys() - self._written):
+            parts = PurePosixPath(name).parts
+            if not parts or parts[0] == '/' or '..' in parts:
+                # Never delete files outside of the build directory, whatever is in the manifest.
+                continue
+            try:
+                self.build_directory.joinpath(*parts).unlink()
+            except FileNotFoundError:
+                pass
+            self.deleted_files += 1
+            del self._previous_manifest[name]
+
+    def _readManifest(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            manifest = json.loads(self.build_directory.joinpath(MANIFEST).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(manifest, dict) or manifest.get('version') != 1:
+            return {}
+        files = manifest.get('files')
+        return files if isinstance(files, dict) else {}
+
+    def _writeManifest(self) -> None:
+        assert self._previous_manifest is not None
+        # The files of the previous build not written this time are still there.
+        files = {**self._previous_manifest, **self._manifest}
+        path = self.build_directory.joinpath(MANIFEST)
+        tmp = path.with_name(f'.{path.name}.tmp')
+        tmp.write_text(json.dumps({'version': 1, 'files': files}, sort_keys=True, indent=0), encoding='utf-8')
+        os.replace(tmp, path)
+
+    def close(self) -> None:
+        """
+        Called last, when all files have been written with L{writeFile}, including the Sphinx inventory. 
+        Waits for the background threads and processes to finish writing the files, 
+        then writes the L{MANIFEST} if L{write_changed_only} is true.
+
+        @raises Exception: If a file could not be compressed or written in the background.
+        """
+        self._waitForWrites()
+        if self._previous_manifest is not None:
+            self._writeManifest()
+            self._previous_manifest = None
+        self._raiseWriteError()
+
     def _writeDocsForOne(self, ob: model.Documentable, fobj: IO[bytes]) -> None:
         if not ob.isVisible:
             return
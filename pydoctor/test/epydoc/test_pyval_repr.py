@@ -7,7 +7,7 @@ import xml.sax
 
 import pytest
 
-from pydoctor.epydoc.markup._pyval_repr import PyvalColorizer, colorize_inline_pyval
+from pydoctor.epydoc.markup._pyval_repr import PyvalColorizer, colorize_inline_pyval, colorize_pyval
 from pydoctor.test import NotFoundLinker
 from pydoctor.stanutils import flatten, flatten_text, html2stan
 from pydoctor.node2stan import gettext
@@ -1495,6 +1495,44 @@ def test_refmap_explicit() -> None:
     assert '<obj_reference refuri="<mymod>.MyInt">' in dump
     assert '<obj_reference refuri="str">' in dump
 
+def test_large_value_colorized_lazily() -> None:
+    """
+    The colorization of large values stops as soon as the maximum number of lines is reached, 
+    the nodes past this point are not visited at all.
+    """
+    expr = extract_expr(ast.parse('{' + ', '.join(f"'k{i}': (1 + {i}) * 2" for i in range(10000)) + '}'))
+    assert isinstance(expr, ast.Dict)
+    assert color2(expr) == ("{'k0': (1 + 0) * 2,\n"
+                            " 'k1': (1 + 1) * 2,\n"
+                            " 'k2': (1 + 2) * 2,\n"
+                            " 'k3': (1 + 3) * 2,\n"
+                            " 'k4': (1 + 4) * 2,\n"
+                            "...")
+    assert getattr(expr.values[0], 'parent') is expr
+    assert getattr(expr.values[0].left, 'parent') is expr.values[0]
+    assert not hasattr(expr.values[-1], 'parent')
+    assert not hasattr(expr.values[-1].left, 'parent')
+
+def test_colorize_pyval_cached() -> None:
+    """
+    The colorization of AST nodes is cached per set of arguments, 
+    each call still returns a new L{ParsedDocstring}.
+    """
+    expr = extract_expr(ast.parse('Type[MyInt, str]'))
+    doc1 = colorize_inline_pyval(expr)
+    doc2 = colorize_inline_pyval(expr)
+    assert doc1 is not doc2
+    assert doc1.to_node() is doc2.to_node()
+    
+    doc3 = colorize_inline_pyval(expr, refmap={'MyInt': '<mymod>.MyInt'})
+    assert doc3.to_node() is not doc1.to_node()
+    assert '<obj_reference refuri="<mymod>.MyInt">' in doc3.to_node().pformat()
+    assert '<obj_reference refuri="<mymod>.MyInt">' not in doc2.to_node().pformat()
+    
+    doc4 = colorize_pyval(expr, linelen=80, maxlines=5)
+    assert doc4.to_node() is not doc1.to_node()
+    assert flatten(doc4.to_stan(NotFoundLinker())) == flatten(doc1.to_stan(NotFoundLinker()))
+
 def check_src_roundtrip(src:str, subtests:Any) -> None:
     # from cpython/Lib/test/test_unparse.py
     with subtests.test(msg="round trip", src=src):
@@ -169,6 +169,17 @@ def test_rst_directive_adnomitions() -> None:
 
         assert prettify(expect)==prettify(actual)
 
+def test_rst_directive_adnomitions_render_again() -> None:
+    """
+    Rendering an admonition does not change the docstring:
+    it's rendered the same way again and its text is unchanged.
+    """
+    node = rst2node(".. note:: this is a single line\n")
+    html = node2html(node)
+    assert html.count('Note') == 1
+    assert node2html(node) == html
+    assert node.astext() == 'this is a single line'
+
 
 def test_rst_directive_versionadded() -> None:
     """
@@ -346,3 +357,6 @@ Other
 """
     assert prettify(html) == prettify(expected_html)
 
+    # The table of contents is built once, the ids of its entries don't change when the page is rendered again.
+    assert parsed.get_toc(4) is toc
+
@@ -576,6 +576,7 @@ def test_all_recognition(systemcls: Type[model.System]) -> None:
     __all__ = ['f']
     ''', systemcls=systemcls)
     assert mod.all == ['f']
+    assert mod.all_names == {'f'}
     assert '__all__' not in mod.contents
 
 @systemcls_param
@@ -1692,6 +1693,27 @@ def test_constant_module(systemcls: Type[model.System]) -> None:
     assert lang.kind is model.DocumentableKind.CONSTANT
     assert ast.literal_eval(getattr(mod.resolveName('LANG'), 'value')) == 'FR'
 
+@systemcls_param
+def test_parent_links_recorded_during_walk(systemcls: Type[model.System]) -> None:
+    """
+    Statements and assigned values are linked to their parents by the module walk,
+    nested expressions are not annotated until the colorizer needs it.
+    """
+    mod = fromText('''
+    if TYPE_CHECKING:
+        LANG = ('F' + 'R') * 2
+    ''', systemcls=systemcls)
+    lang = mod.contents['LANG']
+    assert isinstance(lang, model.Attribute)
+    assert lang.kind is model.DocumentableKind.VARIABLE
+    value = lang.value
+    assert isinstance(value, ast.BinOp)
+    assert [type(n) for n in astutils.get_parents(value)] == [ast.Assign, ast.If, ast.Module]
+    assert getattr(value.left, 'parent', None) is None
+    assert flatten_text(epydoc2stan.format_constant_value(lang)) == "Value('F' + 'R') * 2"
+    assert [type(n) for n in astutils.get_parents(value)] == [ast.Assign, ast.If, ast.Module]
+    assert getattr(value.left, 'parent', None) is value
+
 @systemcls_param
 def test_constant_module_with_final(systemcls: Type[model.System]) -> None:
     """
@@ -2061,6 +2083,42 @@ def test_reexport_wildcard(systemcls: Type[model.System]) -> None:
     assert system.allobjects['_impl2'].resolveName('i') == system.allobjects['top'].contents['i']
     assert all(n in system.allobjects['top'].contents for n in  ['f', 'g', 'h', 'i', 'j'])
 
+@systemcls_param
+def test_reexport_several_names(systemcls: Type[model.System]) -> None:
+    """
+    All the names re-exported by an import statement are moved into the target module, 
+    with their members, including names imported twice and renamed.
+    """
+    system = systemcls()
+    builder = system.systemBuilder(system)
+    builder.addModuleString('''
+    from ._impl import C, f, f as g, h
+    __all__ = ['C', 'f', 'g']
+    ''', modname='top', is_package=True)
+
+    builder.addModuleString('''
+    class C:
+        def m(self): 
+            pass
+    def f():
+        pass
+    def h():
+        pass
+    ''', modname='_impl', parent_name='top')
+    builder.buildModules()
+
+    top = system.allobjects['top']
+    assert isinstance(top, model.Module)
+    assert top.all_names == {'C', 'f', 'g'}
+    assert list(top.contents) == ['_impl', 'C', 'g']
+    assert system.allobjects['top.C.m'] is top.contents['C'].contents['m']
+    assert system.allobjects['top.g'] is top.contents['g']
+    for name in ('top._impl.C', 'top._impl.C.m', 'top._impl.f', 'top.f'):
+        assert name not in system.allobjects
+    assert top.resolveName('f') is top.contents['g']
+    assert top.resolveName('h') is system.allobjects['top._impl.h']
+    assert system.allobjects['top._impl'].resolveName('C') is top.contents['C']
+
 @systemcls_param
 def test_exception_kind(systemcls: Type[model.System], capsys: CapSys) -> None:
     """
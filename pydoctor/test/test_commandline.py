@@ -1,8 +1,13 @@
 from contextlib import redirect_stdout
 from io import StringIO
 from pathlib import Path
+import json
 import re
+import subprocess
 import sys
+from typing import Dict, List, Optional
+
+import pytest
 
 from pydoctor.options import Options
 from pydoctor import driver
@@ -272,3 +277,255 @@ def test_make_intersphix(tmp_path: Path) -> None:
     assert [p.name for p in tmp_path.iterdir()] == ['objects.inv']
     assert inventory.is_file()
     assert b'Project: acme-lib\n# Version: 20.12.0-dev123\n' in inventory.read_bytes()
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_batch_builder(tmp_path: Path, jobs: int) -> None:
+    """
+    L{driver.BatchBuilder} builds several systems with shared templates, 
+    and reports errors and timings for each of them.
+    """
+    all_options = [Options.from_args([
+                        '--quiet', '--make-html', 
+                        f'--html-output={tmp_path / name}', 
+                        f'pydoctor/test/testpackages/{name}/']) 
+                    for name in ('basic', 'report_trigger', 'no_such_package')]
+    all_options[1].warnings_as_errors = True
+    for o in all_options:
+        # Ignore the intersphinx configuration of the repository.
+        o.intersphinx = []
+    
+    builder = driver.BatchBuilder()
+    results = builder.build(all_options, jobs=jobs)
+    
+    assert [r.options.htmloutput for r in results] == [o.htmloutput for o in all_options]
+    assert [r.exitcode for r in results] == [0, 3, 1]
+    assert results[0].error is None
+    assert results[2].error is not None
+    assert (tmp_path / 'basic' / 'basic.mod.C.html').is_file()
+    assert (tmp_path / 'report_trigger' / 'report_trigger.html').is_file()
+    for r in results[:2]:
+        assert set(r.timings) == {'system', 'make', 'total'}
+        assert r.timings['total'] >= r.timings['system'] + r.timings['make']
+    
+    if jobs == 1:
+        assert builder.template_lookup(all_options[0]) is builder.template_lookup(all_options[1])
+
+def test_batch_builder_shared_intersphinx_cache(tmp_path: Path) -> None:
+    """
+    The intersphinx inventories are fetched once for all the systems.
+    """
+    fetched: List[str] = []
+    class Cache:
+        def get(self, url: str) -> Optional[bytes]:
+            fetched.append(url)
+            return None
+        def close(self) -> None:
+            pass
+    
+    cache = driver._MemoryCache(Cache())
+    for _ in range(3):
+        assert cache.get('https://example.com/objects.inv') is None
+    assert fetched == ['https://example.com/objects.inv']
+
+def test_batch_builder_minify_html(tmp_path: Path) -> None:
+    """
+    L{driver.BatchBuilder} does not share the templates between builds with and without C{--minify-html}.
+    """
+    builder = driver.BatchBuilder()
+    for name, args in (('plain', []), ('minified', ['--minify-html'])):
+        options = Options.from_args(['--quiet', '--buildtime=2020-01-01 00:00:00', 
+                                     f'--html-output={tmp_path / name}', 
+                                     'pydoctor/test/testpackages/basic/', *args])
+        options.intersphinx = []
+        assert builder.build_one(options).exitcode == 0
+    
+    plain = (tmp_path / 'plain' / 'classIndex.html').read_text()
+    minified = (tmp_path / 'minified' / 'classIndex.html').read_text()
+    assert len(minified) < len(plain)
+
+def test_source_watcher(tmp_path: Path) -> None:
+    """
+    L{driver.SourceWatcher} reports the python files created, modified or removed between two polls.
+    """
+    pkg = tmp_path / 'pkg'
+    (pkg / '__pycache__').mkdir(parents=True)
+    (pkg / '__init__.py').write_text('')
+    (pkg / 'mod.py').write_text('x = 1\n')
+    (pkg / 'README.txt').write_text('')
+    watcher = driver.SourceWatcher([pkg])
+    assert set(watcher.files) == {pkg / '__init__.py', pkg / 'mod.py'}
+    assert watcher.poll() == []
+
+    (pkg / 'mod.py').write_text('x = 12\n')
+    (pkg / 'new.pyi').write_text('')
+    (pkg / '__pycache__' / 'mod.py').write_text('')
+    (pkg / 'README.txt').write_text('changed')
+    (pkg / '__init__.py').unlink()
+    assert watcher.poll() == [pkg / '__init__.py', pkg / 'mod.py', pkg / 'new.pyi']
+    assert watcher.poll() == []
+
+def test_watch_writes_changed_pages_only(tmp_path: Path) -> None:
+    """
+    With C{--watch}, building again only writes the pages whose content changed.
+    """
+    pkg = tmp_path / 'pkg'
+    pkg.mkdir()
+    (pkg / '__init__.py').write_text('')
+    (pkg / 'a.py').write_text('"""Module a."""\n')
+    (pkg / 'b.py').write_text('"""Module b."""\n')
+    out = tmp_path / 'out'
+    # The build time is displayed on every page.
+    options = Options.from_args(['--quiet', '--watch', '--buildtime=2020-01-01 00:00:00', f'--html-output={out}', str(pkg)])
+    options.intersphinx = []
+
+    builder = driver.BatchBuilder()
+    assert builder.build_one(options).exitcode == 0
+    mtimes = {p.name: p.stat().st_mtime_ns for p in out.glob('*.html')}
+    
+    (pkg / 'b.py').write_text('"""Module b, changed."""\n')
+    assert builder.build_one(options).exitcode == 0
+    
+    changed = {p.name for p in out.glob('*.html') if p.stat().st_mtime_ns != mtimes[p.name]}
+    # The package page (index.html) and the summary pages include the module summary as well.
+    assert 'pkg.b.html' in changed
+    assert 'pkg.a.html' not in changed
+    assert 'classIndex.html' not in changed
+    assert 'changed' in (out / 'pkg.b.html').read_text()
+
+def test_watch_update(tmp_path: Path) -> None:
+    """
+    Updating the system of the previous build after some source files changed gives
+    the same output as a build from scratch, and only writes the pages that changed.
+    """
+    pkg = tmp_path / 'pkg'
+    pkg.mkdir()
+    (pkg / '__init__.py').write_text('"""Package."""\nfrom .a import A\n__all__ = ["A"]\n')
+    (pkg / 'a.py').write_text('"""Module a."""\nclass A:\n    """Class A."""\nclass B:\n    """Class B."""\n')
+    (pkg / 'b.py').write_text('"""Module b."""\nfrom pkg.a import B\nclass C(B):\n    """Class C."""\ndef g(): ...\n')
+    (pkg / 'c.py').write_text('"""Module c."""\nfrom pkg.b import C\n')
+    (pkg / 'e.py').write_text('"""Module e."""\nfrom pkg import b\nb.g.__doc__ = "Documented by e."\n')
+    def options(out: Path) -> Options:
+        # The build time is displayed on every page.
+        options = Options.from_args(['--quiet', '--watch', '--buildtime=2020-01-01 00:00:00', f'--html-output={out}', str(pkg)])
+        options.intersphinx = []
+        return options
+    def files(out: Path) -> Dict[Path, bytes]:
+        return {p.relative_to(out): p.read_bytes() for p in out.rglob('*')
+                if p.is_file() and p.name != '.pydoctor-manifest.json'}
+
+    out = tmp_path / 'out'
+    builder = driver.BatchBuilder()
+    result = builder.build_one(options(out), keep_system=True)
+    assert result.system is not None
+
+    for name, old, new in [('a.py', 'Class B.', 'Class B, changed.'),
+                           ('e.py', 'by e.', 'again by e.'),
+                           # A new name: all the pages are rendered again.
+                           ('b.py', 'def g', 'def h(): ...\ndef g'),
+                           # A new module: the system is built again from scratch.
+                           ('d.py', '', '"""Module d."""\n')]:
+        path = pkg / name
+        path.write_text(path.read_text().replace(old, new) if path.exists() else new)
+        mtimes = {p.name: p.stat().st_mtime_ns for p in out.glob('*.html')}
+        result = builder.update(result.system, [path])
+        assert result.error is None
+        assert result.system is not None
+        full = tmp_path / name
+        assert driver.BatchBuilder().build_one(options(full)).exitcode == 0
+        assert files(out) == files(full)
+        if name == 'a.py':
+            changed = {p.name for p in out.glob('*.html') if p.stat().st_mtime_ns != mtimes.get(p.name)}
+            assert 'pkg.a.B.html' in changed
+            assert 'pkg.b.C.html' not in changed
+            assert 'pkg.c.html' not in changed
+
+def test_watch_keeps_buildtime(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: CapSys) -> None:
+    """
+    C{watch()} builds again with the build time of the first build and reports the changes.
+    """
+    pkg = tmp_path / 'pkg'
+    pkg.mkdir()
+    (pkg / '__init__.py').write_text('')
+    options = Options.from_args(['--watch', f'--html-output={tmp_path / "out"}', str(pkg)])
+    options.intersphinx = []
+    monkeypatch.delenv('SOURCE_DATE_EPOCH', raising=False)
+
+    buildtimes: List[Optional[str]] = []
+    class Builder(driver.BatchBuilder):
+        def build_one(self, options: Options, keep_system: bool = False) -> driver.BuildResult:
+            buildtimes.append(options.buildtime)
+            return driver.BuildResult(options, 0, {'total': 0.0})
+    
+    waits = iter([[pkg / '__init__.py']])
+    def wait(self: driver.SourceWatcher, interval: float) -> List[Path]:
+        try:
+            return next(waits)
+        except StopIteration:
+            raise KeyboardInterrupt()
+    monkeypatch.setattr(driver.SourceWatcher, 'wait', wait)
+
+    assert driver.watch(options, Builder()) == 0
+    assert len(buildtimes) == 2
+    assert buildtimes[0] is not None
+    assert buildtimes[0] == buildtimes[1]
+    out = capsys.readouterr().out
+    assert 'watching 1 files for changes' in out
+    assert f'changed: {pkg / "__init__.py"}' in out
+
+def test_write_changed_only(tmp_path: Path) -> None:
+    """
+    With C{--write-changed-only}, the files with the same content are not written again, 
+    and the pages of the objects that do not exist anymore are deleted.
+    """
+    pkg = tmp_path / 'pkg'
+    pkg.mkdir()
+    (pkg / '__init__.py').write_text('')
+    (pkg / 'a.py').write_text('"""Module a."""\n')
+    (pkg / 'b.py').write_text('"""Module b."""\n')
+    out = tmp_path / 'out'
+    # The build time is displayed on every page.
+    options = Options.from_args(['--quiet', '--write-changed-only', '--buildtime=2020-01-01 00:00:00', f'--html-output={out}', str(pkg)])
+    options.intersphinx = []
+
+    builder = driver.BatchBuilder()
+    assert builder.build_one(options).exitcode == 0
+    manifest = json.loads((out / '.pydoctor-manifest.json').read_text())
+    assert {'pkg.a.html', 'pkg.b.html', 'objects.inv', 'apidocs.css'} <= manifest['files'].keys()
+    # Files that pydoctor did not write are never deleted.
+    (out / 'extra.txt').write_text('not generated')
+    # A page modified after the build is written again.
+    (out / 'classIndex.html').write_text('modified')
+    mtimes = {p.name: p.stat().st_mtime_ns for p in out.glob('*.html')}
+
+    (pkg / 'b.py').write_text('"""Module b, changed."""\n')
+    assert builder.build_one(options).exitcode == 0
+    assert (out / 'pkg.a.html').stat().st_mtime_ns == mtimes['pkg.a.html']
+    assert 'modified' not in (out / 'classIndex.html').read_text()
+
+    (pkg / 'b.py').unlink()
+    assert builder.build_one(options).exitcode == 0
+    assert not (out / 'pkg.b.html').exists()
+    assert (out / 'pkg.a.html').exists()
+    assert (out / 'extra.txt').read_text() == 'not generated'
+    manifest = json.loads((out / '.pydoctor-manifest.json').read_text())
+    assert 'pkg.b.html' not in manifest['files']
+    assert 'pkg.a.html' in manifest['files']
+
+def test_startup_lazy_imports() -> None:
+    """
+    Importing the driver does not import the dependencies that are only needed 
+    by some steps of the build: requests and cachecontrol to fetch intersphinx inventories 
+    and lunr to build the search index.
+
+    This uses C{python -X importtime}, that also reports the time spent importing each module. 
+    Run C{python -X importtime -c "import pydoctor.driver"} to benchmark the startup time.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import pydoctor.driver'], 
+                            capture_output=True, text=True, check=True)
+    imported = {line.rsplit('|', 1)[1].strip() for line in result.stderr.splitlines() 
+                if line.startswith('import time:')}
+    
+    assert 'pydoctor.driver' in imported
+    assert 'pydoctor.templatewriter.search' in imported
+    for mod in ('requests', 'cachecontrol', 'lunr'):
+        assert mod not in imported
@@ -2,6 +2,7 @@
 Unit tests for model.
 """
 
+import json
 import subprocess
 import os
 from inspect import signature
@@ -13,7 +14,7 @@ import pytest
 from twisted.web.template import Tag
 
 from pydoctor.options import Options
-from pydoctor import model, stanutils, extensions
+from pydoctor import driver, model, stanutils, extensions
 from pydoctor.templatewriter import pages
 from pydoctor.utils import parse_privacy_tuple
 from pydoctor.sphinx import CacheT
@@ -491,6 +492,46 @@ def test_privacy_reparented() -> None:
 
     assert base.privacyClass == model.PrivacyClass.PUBLIC
 
+def test_names_cache_reparented() -> None:
+    """
+    The cached full names and URLs of an object and its members are 
+    updated when the object is reparented or renamed because of a duplicate.
+    """
+    system = model.System()
+
+    mod_private = fromText('''
+    class _MyClass:
+        def meth(self):...
+    class _MyClass:
+        def meth(self):...
+    ''', modname='private', system=system)
+    mod_export = fromText('', modname='public', system=system)
+    
+    dup = system.allobjects['private._MyClass 0']
+    assert dup.contents['meth'].fullName() == 'private._MyClass 0.meth'
+    assert dup.contents['meth'].url == 'private._MyClass%200.html#meth'
+
+    base = mod_private.contents['_MyClass']
+    meth = base.contents['meth']
+    assert meth.fullName() == 'private._MyClass.meth'
+    assert meth.url == 'private._MyClass.html#meth'
+
+    base.reparent(mod_export, 'MyClass')
+    assert meth.fullName() == 'public.MyClass.meth'
+    assert meth.url == 'public.MyClass.html#meth'
+    assert system.allobjects['public.MyClass.meth'] is meth
+
+def test_url_cache_root_modules() -> None:
+    """
+    The URL of a single root module is index.html, 
+    the cached URL is updated when another root module is added.
+    """
+    system = model.System()
+    mod = fromText('', modname='mod', system=system)
+    assert mod.url == 'index.html'
+    fromText('', modname='other', system=system)
+    assert mod.url == 'mod.html'
+
 def test_name_defined() -> None:
     src = '''
     # module 'm'
@@ -573,3 +614,181 @@ def test_priority_processor(capsys:CapSys) -> None:
                                                             'priority 100 (bis)',
                                                             'priority 25',
                                                             ]
+
+def test_progress_throttled_json_stream(tmp_path: Path, capsys: CapSys) -> None:
+    """
+    Progress updates are rate limited: the last update of a section is always reported,
+    and a pending update is reported before the next log message. 
+    Updates are written as JSON lines to the C{--progress-fd} file descriptor.
+    """
+    progress_file = tmp_path / 'progress.jsonl'
+    with progress_file.open('w') as f:
+        system = model.System(Options.from_args(['--progress-fd', str(f.fileno())]))
+        system.progress_interval = 60
+        for i in range(1, 11):
+            system.progress('process', i, 10, 'modules processed')
+        for i in range(1, 4):
+            system.progress('html', i, None, 'pages written')
+        system.msg('html', 'done')
+    
+    lines = [json.loads(l) for l in progress_file.read_text().splitlines()]
+    assert [(l['section'], l['current'], l['total'], l['msg']) for l in lines] == [
+        ('process', 1, 10, 'modules processed'), 
+        ('process', 10, 10, 'modules processed'), 
+        ('html', 3, None, 'pages written')]
+    assert capsys.readouterr().out == 'done\n'
+
+def test_progress_flush(tmp_path: Path) -> None:
+    """
+    The pending progress update of a section without total is reported by L{model.System.flushProgress}, 
+    which is called at the end of the build steps.
+    """
+    progress_file = tmp_path / 'progress.jsonl'
+    with progress_file.open('w') as f:
+        system = model.System(Options.from_args(['--progress-fd', str(f.fileno())]))
+        system.progress_interval = 60
+        for i in range(1, 4):
+            system.progress('analyzeModule', i, None, 'modules and packages discovered')
+        system.flushProgress()
+        system.flushProgress()
+    
+    lines = [json.loads(l) for l in progress_file.read_text().splitlines()]
+    assert [(l['section'], l['current']) for l in lines] == [('analyzeModule', 1), ('analyzeModule', 3)]
+
+    options = Options.from_args(['--quiet', f'--html-output={tmp_path / "out"}', str(testpackages / 'basic')])
+    options.intersphinx = []
+    system = driver.get_system(options)
+    assert system._progress_pending is None
+
+def test_modules_processed_in_import_order() -> None:
+    """
+    Modules are processed after the modules they import names from, 
+    so processing a long chain of imports does not recurse. 
+    Modules importing each other are processed in the order they were added.
+    """
+    depths = []
+    processed = []
+    class System(model.System):
+        def processModule(self, mod: model.Module) -> None:
+            processed.append(mod.fullName())
+            super().processModule(mod)
+            depths.append(len(self.processing_modules))
+    
+    system = System()
+    builder = system.systemBuilder(system)
+    for i in range(50):
+        builder.addModuleString(f'from m{i+1} import x\n', f'm{i}')
+    builder.addModuleString('x = 1\n', 'm50')
+    builder.addModuleString('from cycle_b import y\nz = 1\n', 'cycle_a')
+    builder.addModuleString('from cycle_a import z\ny = 1\n', 'cycle_b')
+    builder.buildModules()
+
+    assert processed == [f'm{i}' for i in range(50, -1, -1)] + ['cycle_a', 'cycle_b']
+    # Only the import cycle recurses.
+    assert depths == [0] * 51 + [1, 0]
+    assert system.allobjects['cycle_a'].expandName('y') == 'cycle_b.y'
+
+def test_expandName_cache() -> None:
+    """
+    The results of L{model.Documentable.expandName} are cached per scope 
+    and forgotten when objects are added or reparented.
+    """
+    mod = fromText('''
+    from external import thing
+    class C:
+        def f(self): ...
+    ''', modname='mod')
+    system = mod.system
+    C = mod.contents['C']
+    
+    assert mod.expandName('thing') == 'external.thing'
+    hits = system.expandName_hits
+    assert mod.expandName('thing') == 'external.thing'
+    # Class members share the cache of their class.
+    assert C.expandName('D') == 'D'
+    assert C.contents['f'].expandName('D') == 'D'
+    assert system.expandName_hits == hits + 2
+    
+    system.addObject(model.Class(system, 'D', mod))
+    assert C.expandName('D') == 'mod.D'
+    
+    C.reparent(cast(model.Module, system.allobjects['mod']), 'E')
+    assert mod.expandName('C.f') == 'mod.E.f'
+    assert mod.expandName('E.f') == 'mod.E.f'
+
+def test_docsources_resolved_in_post_processing() -> None:
+    """
+    The documentation sources of the members are resolved once in post-processing, 
+    they are computed again if the system changes afterwards.
+    """
+    mod = fromText('''
+    class A:
+        def f(self):
+            "doc"
+        def __init__(self):
+            self.x = 1
+    class B(A):
+        def f(self): ...
+        x = 2
+    ''', modname='mod')
+    A, B = mod.contents['A'], mod.contents['B']
+    f = B.contents['f']
+
+    stored = model.get_docsources(f)
+    assert stored == (f, A.contents['f'])
+    assert model.get_docsources(f) is stored
+    assert model.get_docstring(f) == ('doc', A.contents['f'])
+    assert B.contents['x'].kind is model.DocumentableKind.INSTANCE_VARIABLE
+    
+    mod.system.addObject(model.Function(mod.system, 'g', B))
+    assert model.get_docsources(f) is not stored
+    assert model.get_docsources(f) == stored
+
+def test_reprocessModules(tmp_path: Path) -> None:
+    """
+    When a source file changes, its module is processed again with the modules that depend on it, 
+    and the objects whose page must be written again are returned. 
+    The modules importing it are processed again only if its names changed.
+    """
+    pkg = tmp_path / 'pkg'
+    pkg.mkdir()
+    (pkg / '__init__.py').write_text('"""Package."""\nfrom .a import A\n__all__ = ["A"]\n')
+    (pkg / 'a.py').write_text('"""Module a."""\nclass A:\n    """Class A."""\nclass B:\n    """Class B."""\n')
+    (pkg / 'b.py').write_text('"""Module b."""\nfrom pkg.a import B\nclass C(B):\n    """Class C."""\ndef g(): ...\n')
+    (pkg / 'c.py').write_text('"""Module c."""\nfrom pkg.b import C\n')
+    (pkg / 'e.py').write_text('"""Module e."""\nfrom pkg import b\nb.g.__doc__ = "Documented by e."\n')
+    system = model.System()
+    system.addPackage(pkg)
+    system.process()
+    c = system.allobjects['pkg.c']
+
+    (pkg / 'a.py').write_text('"""Module a."""\nclass A:\n    """Class A, changed."""\nclass B:\n    """Class B."""\n')
+    pages = system.reprocessModules([pkg / 'a.py'])
+    assert pages is not None
+    A = system.allobjects['pkg.A']
+    assert A.docstring == 'Class A, changed.'
+    C = system.allobjects['pkg.b.C']
+    assert isinstance(C, model.Class)
+    # The subclass refers to the new base class.
+    assert C.baseobjects == [system.allobjects['pkg.a.B']]
+    # The module importing names from pkg.b is not processed again since its names did not change, 
+    # pkg.b is processed again for its subclass of pkg.a.B, and pkg.e for its docstring of pkg.b.g.
+    assert system.allobjects['pkg.c'] is c
+    assert system.allobjects['pkg.b.g'].docstring == 'Documented by e.'
+    # The re-exported class, its module, the package and the subclass of pkg.a.B.
+    assert {ob.fullName() for ob in pages} == {'pkg', 'pkg.A', 'pkg.a', 'pkg.a.B', 'pkg.b.C'}
+
+    (pkg / 'b.py').write_text('"""Module b."""\nfrom pkg.a import B\nclass C(B):\n    """Class C."""\ndef g(): ...\ndef h(): ...\n')
+    pages = system.reprocessModules([pkg / 'b.py'])
+    # A name was added: the modules importing pkg.b are processed again and all the pages are written again.
+    assert pages == set(system.allobjects.values())
+    assert system.allobjects['pkg.c'] is not c
+    assert system.allobjects['pkg.b.g'].docstring == 'Documented by e.'
+    # The objects are in the same order as in a full build.
+    full = model.System()
+    full.addPackage(pkg)
+    full.process()
+    assert list(system.allobjects) == list(full.allobjects)
+
+    (pkg / 'd.py').write_text('')
+    assert system.reprocessModules([pkg / 'd.py']) is None
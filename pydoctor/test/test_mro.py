@@ -1,4 +1,4 @@
-from typing import List, Optional, Type
+from typing import Dict, List, Optional, Type
 import pytest
 
 from pydoctor import model, stanutils
@@ -243,3 +243,87 @@ def test_inherited_members() -> None:
     assert len(util.inherited_members(dimond.contents['C']))==3 # type:ignore
     assert len(util.inherited_members(dimond.contents['A']))==0 # type:ignore
     assert len(util.inherited_members(dimond.contents['_MyBase']))==0 # type:ignore
+
+def test_class_members_same_as_nested_bases() -> None:
+    """
+    The memoised class_members(), overridden_member() and overriding_subclasses()
+    give the same results as the plain walks over the MRO and the subclasses.
+    """
+    mod = fromText("""\
+    class _MyBase:
+        def z():...
+        def y():...
+    class A(_MyBase):
+        def a():...
+        def z():...
+    class B(_MyBase):
+        def b():...
+    class C(A,B):
+        def a():...
+    class D(C):
+        def b():...
+        def y():...
+    """, modname='diamond')
+
+    for klass in mod.contents.values():
+        assert isinstance(klass, model.Class)
+        expected = [(b, util.unmasked_attrs(b)) for b in util.nested_bases(klass) 
+                    if util.unmasked_attrs(b)]
+        assert util.class_members(klass) == expected
+        # Results are cached, but each call returns a new list.
+        assert util.class_members(klass) is not util.class_members(klass)
+
+        for name in ('a', 'b', 'y', 'z'):
+            assert list(util.overriding_subclasses(klass, name)) == [
+                o for s in klass.subclasses 
+                for o in util.overriding_subclasses(s, name, firstcall=False)]
+            
+            overridden = next((b.contents[name] for b in klass.mro(include_self=False) 
+                               if name in b.contents), None)
+            assert util.overridden_member(klass, name) is overridden
+    
+    assert list(util.overriding_subclasses(mod.contents['B'], 'b')) == [mod.contents['D']] # type:ignore
+    assert util.overridden_member(mod.contents['D'], 'a') is mod.contents['C'].contents['a'] # type:ignore
+
+def _wide_diamond_hierarchy(size: int, seed: int) -> List[type]:
+    """
+    Create a Zope-interfaces-like hierarchy of Python classes: 
+    each class extends several of the previously created ones.
+    """
+    import random
+    rand = random.Random(seed)
+    classes: List[type] = [object]
+    for i in range(size):
+        candidates = rand.sample(classes, min(len(classes), rand.randint(1, 6)))
+        # Sort the bases from the most derived to the least derived, 
+        # otherwise most hierarchies would not be linearizable.
+        candidates.sort(key=lambda c: -len(c.__mro__))
+        try:
+            classes.append(type(f'C{i}', tuple(candidates), {}))
+        except TypeError:
+            # Inconsistent hierarchy
+            continue
+    return classes
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_mro_wide_diamond_hierarchy(seed: int) -> None:
+    """
+    The C3 linearization gives the same results as Python on wide, diamond-heavy hierarchies, 
+    whether the linearizations of the bases are shared in a cache or not.
+    """
+    from pydoctor import mro
+
+    def getbases(c: type) -> List[type]:
+        return list(c.__bases__)
+
+    classes = _wide_diamond_hierarchy(400, seed)
+    assert len(classes) > 200
+    cache: Dict[type, List[type]] = {}
+    for c in classes:
+        assert mro.mro(c, getbases, cache) == list(c.__mro__)
+    for c in classes[-10:]:
+        assert mro.mro(c, getbases) == list(c.__mro__)
+    
+    with pytest.raises(ValueError, match="Cannot compute linearization"):
+        # Same as class X(B, A) when A extends B.
+        mro.mro('X', {'X':['B', 'A'], 'A':['B'], 'B':[]}.__getitem__)
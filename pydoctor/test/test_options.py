@@ -7,7 +7,7 @@ from io import StringIO
 from pydoctor import model
 from pydoctor.options import PydoctorConfigParser, Options
 
-from pydoctor.test import FixtureRequest, TempPathFactory
+from pydoctor.test import CapSys, FixtureRequest, TempPathFactory
 
 EXAMPLE_TOML_CONF = """
 [tool.poetry]
@@ -259,3 +259,13 @@ not-found = 423
     assert options.quietness == 0
     assert options.warnings_as_errors == False
     assert options.htmloutput == '1'
+
+@pytest.mark.parametrize('writerclass', ['ZipWriter', 'TarWriter', 'SQLiteWriter'])
+def test_precompress_archive_writer(writerclass: str, capsys: CapSys) -> None:
+    """
+    The archive writers do not support --precompress.
+    """
+    with pytest.raises(SystemExit):
+        Options.from_args(['--precompress', f'--html-writer=pydoctor.templatewriter.archive.{writerclass}'])
+    assert 'Invalid --precompress option' in capsys.readouterr().err
+    assert Options.from_args([f'--html-writer=pydoctor.templatewriter.archive.{writerclass}']).precompress is False
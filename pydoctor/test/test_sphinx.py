@@ -153,6 +153,38 @@ def test_generateContent(inv_writer_nolog: sphinx.SphinxInventoryWriter) -> None
     assert expected_result == result
 
 
+def test_generate_streamed() -> None:
+    """
+    The content is compressed while the objects are walked iteratively, 
+    the result is the same as compressing the whole content at once.
+    """
+    system = model.System()
+    root = model.Package(system, 'package1')
+    system.addObject(root)
+    parent = root
+    for i in range(200):
+        child = model.Package(system, f'child{i}', parent=parent)
+        system.addObject(child)
+        system.addObject(model.Module(system, f'mod{i}', parent=parent))
+        parent = child
+    
+    inv_writer, logger = get_inv_writer_with_logger()
+    output = io.BytesIO()
+    @contextmanager
+    def openFileForWriting(path: str) -> Iterator[io.BytesIO]:
+        yield output
+    inv_writer._openFileForWriting = openFileForWriting # type: ignore
+    
+    inv_writer.generate(subjects=[root], basepath='base-path')
+    content = inv_writer._generateContent([root])
+
+    assert content.count(b'\n') == 401
+    assert content.startswith(b'package1 py:module -1 index.html -\n'
+                              b'package1.child0 py:module -1 package1.child0.html -\n'
+                              b'package1.child0.child1 py:module -1 package1.child0.child1.html -\n')
+    assert output.getvalue() == inv_writer._generateHeader() + zlib.compress(content)
+
+
 def test_generateLine_package(inv_writer_nolog: sphinx.SphinxInventoryWriter) -> None:
     """
     Check inventory for package.
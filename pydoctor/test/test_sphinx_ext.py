@@ -0,0 +1,102 @@
+"""
+Tests for the Sphinx extension L{pydoctor.sphinx_ext.build_apidocs}.
+"""
+from pathlib import Path
+from argparse import Namespace
+from typing import List, Sequence, Tuple
+
+import pytest
+
+from pydoctor import sphinx
+from pydoctor.options import parse_args
+from pydoctor.sphinx_ext import build_apidocs
+from pydoctor.test import CapLog
+from pydoctor.test.test_packages import testpackages
+
+
+def test_run_pydoctor_parallel(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Two builds run at the same time in pydoctor processes, each writes its own output.
+    """
+    # Do not load the configuration of the pydoctor repository.
+    monkeypatch.chdir(tmp_path)
+    builds = [(name, build_apidocs._get_arguments(
+                        [f'--html-output={tmp_path / name}', str(testpackages / name)], {}))
+              for name in ('basic', 'allgames')]
+    build_apidocs._run_pydoctor_parallel(builds, jobs=2)
+    assert (tmp_path / 'basic' / 'basic.mod.C.html').is_file()
+    assert (tmp_path / 'allgames' / 'allgames.mod1.html').is_file()
+    assert (tmp_path / 'allgames' / 'objects.inv').is_file()
+
+
+def test_run_pydoctor_process_failure(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, caplog: CapLog) -> None:
+    """
+    The exit code of a failed process is logged as a warning.
+    """
+    monkeypatch.chdir(tmp_path)
+    build_apidocs._run_pydoctor_process('broken', ['--html-output', str(tmp_path), str(tmp_path / 'missing')])
+    assert "Building 'broken' pydoctor API docs failed with exit code 1" in caplog.records[-1].getMessage()
+
+
+def test_builder_inited_sequential(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Without C{pydoctor_jobs}, the output of each build is moved to its temporary path right after the build.
+    """
+    moved: List[List[str]] = []
+    def run_pydoctor(name: str, arguments: Sequence[str]) -> None:
+        moved.append(sorted(p.name for p in tmp_path.glob('*.pydoctor_temp')))
+        (tmp_path / name).mkdir()
+    monkeypatch.setattr(build_apidocs, '_run_pydoctor', run_pydoctor)
+    
+    config = Namespace(pydoctor_args={name: [f'--html-output={tmp_path / name}', 'src'] for name in ('a', 'b')}, 
+                       pydoctor_url_path={}, pydoctor_jobs=None, intersphinx_mapping={})
+    app = Namespace(builder=Namespace(name='html'), outdir=str(tmp_path), config=config)
+    build_apidocs.on_builder_inited(app) # type:ignore[arg-type]
+    assert moved == [[], ['a.pydoctor_temp']]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['a.pydoctor_temp', 'b.pydoctor_temp']
+
+
+def test_prepare_intersphinx_cache_closed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    The intersphinx cache used to fetch the inventories before the parallel builds is closed.
+    """
+    class Cache:
+        closed = False
+        def get(self, url: str) -> None:
+            fetched.append(url)
+        def close(self) -> None:
+            self.closed = True
+    fetched: List[str] = []
+    caches: List[Cache] = []
+    def prepareCache(**kwargs: object) -> Cache:
+        caches.append(Cache())
+        return caches[-1]
+    monkeypatch.setattr(sphinx, 'prepareCache', prepareCache)
+
+    arguments = ['--html-output', str(tmp_path), f'--intersphinx-cache-path={tmp_path / "cache"}', 
+                 '--intersphinx=https://example.com/objects.inv', 'src']
+    build_apidocs._prepare_intersphinx_cache([('a', arguments, parse_args(arguments))])
+    assert fetched == ['https://example.com/objects.inv']
+    assert [c.closed for c in caches] == [True]
+
+
+def test_prepare_intersphinx_cache(tmp_path: Path) -> None:
+    """
+    The intersphinx cache is cleared once before the builds run,
+    and the builds do not clear it again.
+    """
+    cache = tmp_path / 'cache'
+    cache.mkdir()
+    (cache / 'stale').write_text('stale')
+    builds: List[Tuple[str, Sequence[str], Namespace]] = []
+    for name in ('a', 'b'):
+        arguments = ['--html-output', str(tmp_path / name),
+                                f'--intersphinx-cache-path={cache}', '--clear-intersphinx-cache', name]
+        builds.append((name, arguments, parse_args(arguments)))
+
+    prepared = build_apidocs._prepare_intersphinx_cache(builds)
+    assert not (cache / 'stale').exists()
+    assert [key for key, _, _ in prepared] == ['a', 'b']
+    for _, prepared_arguments, _ in prepared:
+        assert '--clear-intersphinx-cache' not in prepared_arguments
+        assert f'--intersphinx-cache-path={cache}' in prepared_arguments
@@ -1,11 +1,12 @@
 from io import BytesIO
 import re
-from typing import Callable, Union, Any, cast, Type, TYPE_CHECKING
+from typing import Callable, Dict, List, Union, Any, cast, Type, TYPE_CHECKING
 import pytest
 import warnings
 import sys
 import tempfile
 import os
+import shutil
 from pathlib import Path, PurePath
 
 from pydoctor import model, templatewriter, stanutils, __version__, epydoc2stan
@@ -15,6 +16,7 @@ from pydoctor.templatewriter import (FailedToCreateTemplate, StaticTemplate, pag
                                      OverrideTemplateNotAllowed)
 from pydoctor.templatewriter.pages.table import ChildTable
 from pydoctor.templatewriter.pages.attributechild import AttributeChild
+from pydoctor.templatewriter import summary
 from pydoctor.templatewriter.summary import isClassNodePrivate, isPrivate, moduleSummary, ClassIndexPage
 from pydoctor.test.test_astbuilder import fromText, systemcls_param
 from pydoctor.test.test_packages import processPackage, testpackages
@@ -115,6 +117,20 @@ def test_nonempty_table() -> None:
     flattened = flatten(t)
     assert 'The renderer named' not in flattened
 
+def test_table_ids_per_page() -> None:
+    """
+    The tables are numbered on each page, so a page is the same whatever the pages rendered before it.
+    """
+    mod = fromText('''
+    def f(): pass
+    class C:
+        def m(self): pass
+    ''')
+    html = getHTMLOf(mod)
+    assert 'id="id1"' in html
+    assert getHTMLOf(mod.contents['C'])
+    assert getHTMLOf(mod) == html
+
 def test_rest_support() -> None:
     system = model.System()
     system.options.docformat = 'restructuredtext'
@@ -147,6 +163,239 @@ def test_basic_package(tmp_path: Path) -> None:
     with open(tmp_path / 'basic.html', encoding='utf-8') as f:
         assert 'Package docstring' in f.read()
 
+def test_write_threads(tmp_path: Path) -> None:
+    """
+    With background writer threads, the same files are written once the writer is closed, 
+    and errors from the threads are raised by L{TemplateWriter.close}.
+    """
+    system = processPackage("basic")
+    for name, threads in (('sync', 0), ('threads', 2)):
+        w = writer.TemplateWriter(tmp_path / name, TemplateLookup(template_dir))
+        w.write_threads = threads
+        w.max_pending_writes = 1
+        w.prepOutputDirectory()
+        w.writeIndividualFiles(system.rootobjects)
+        w.writeSummaryPages(system)
+        w.close()
+    
+    def files(directory: Path) -> Dict[Path, bytes]:
+        # Table ids are numbered for the whole process, they differ between the two builds.
+        return {p.relative_to(directory): re.sub(rb'id="id\d+"', b'', p.read_bytes()) 
+                for p in directory.rglob('*') if p.is_file()}
+    written = files(tmp_path / 'sync')
+    assert written == files(tmp_path / 'threads')
+    assert Path('basic.mod.html') in written
+
+    w = writer.TemplateWriter(tmp_path / 'error', TemplateLookup(template_dir))
+    w.write_threads = 2
+    w.prepOutputDirectory()
+    w.writeFile('nosuchdir/page.html', b'')
+    with pytest.raises(FileNotFoundError):
+        w.close()
+    # The error is raised only once.
+    w.close()
+
+def test_precompress(tmp_path: Path) -> None:
+    """
+    The compressed copies of the files are written next to them, and not compressed again 
+    when they are up to date with L{TemplateWriter.write_changed_only}.
+    """
+    import gzip
+    system = processPackage("basic")
+    def build() -> writer.TemplateWriter:
+        w = writer.TemplateWriter(tmp_path, TemplateLookup(template_dir))
+        w.write_threads = 2
+        w.write_changed_only = True
+        w.precompress = ('gz',)
+        w.compress_processes = 2
+        w.prepOutputDirectory()
+        w.writeIndividualFiles(system.rootobjects)
+        w.writeSummaryPages(system)
+        w.writeFile('objects.inv', b'compressed already')
+        w.close()
+        return w
+    
+    build()
+    for name in ('basic.mod.html', 'searchindex.json', 'apidocs.css', 'fonts/info.svg'):
+        assert gzip.decompress((tmp_path / f'{name}.gz').read_bytes()) == (tmp_path / name).read_bytes()
+    assert not (tmp_path / 'objects.inv.gz').exists()
+    assert os.readlink(tmp_path / 'basic.html.gz') == 'index.html.gz'
+    unchanged = ('apidocs.css.gz', 'searchindex.json.gz', 'all-documents.json.gz')
+    mtimes = [(tmp_path / name).stat().st_mtime_ns for name in unchanged]
+    
+    w = build()
+    assert [(tmp_path / name).stat().st_mtime_ns for name in unchanged] == mtimes
+    # Some pages include the table ids, numbered for the whole process, so they change.
+    assert w.unchanged_pages > 20
+    assert w.deleted_files == 0
+
+def test_prep_output_directory_static_assets(tmp_path: Path) -> None:
+    """
+    Static templates are copied or hard linked from the theme files, up to date files are not written again.
+    """
+    lookup = TemplateLookup(template_dir)
+    lookup.add_template(StaticTemplate('extra.css', data=b'body {}'))
+    css = lookup.get_template('apidocs.css')
+    assert isinstance(css, StaticTemplate)
+    assert isinstance(css.path, Path)
+    
+    def inode(p: Path) -> int:
+        return p.stat().st_ino
+
+    # copy
+    w = writer.TemplateWriter(tmp_path / 'copy', lookup)
+    w.prepOutputDirectory()
+    out = tmp_path / 'copy' / 'apidocs.css'
+    assert out.read_bytes() == css.data
+    assert inode(out) != inode(css.path)
+    assert (tmp_path / 'copy' / 'extra.css').read_bytes() == b'body {}'
+    assert (tmp_path / 'copy' / 'fonts' / 'info.svg').is_file()
+    copied = {p: inode(p) for p in (tmp_path / 'copy').rglob('*')}
+    w.prepOutputDirectory()
+    assert copied == {p: inode(p) for p in (tmp_path / 'copy').rglob('*')}
+    # out of date files are replaced
+    out.write_bytes(b'changed')
+    w.prepOutputDirectory()
+    assert out.read_bytes() == css.data
+
+    # link
+    w = writer.TemplateWriter(tmp_path / 'link', lookup)
+    w.link_static_assets = True
+    w.prepOutputDirectory()
+    assert inode(tmp_path / 'link' / 'apidocs.css') == inode(css.path)
+    assert (tmp_path / 'link' / 'extra.css').read_bytes() == b'body {}'
+
+    # shared store
+    store = tmp_path / 'store'
+    for site in ('site1', 'site2'):
+        w = writer.TemplateWriter(tmp_path / site, lookup)
+        w.static_assets_store = store
+        w.prepOutputDirectory()
+    for name in ('apidocs.css', 'extra.css', 'fonts/info.svg'):
+        assert inode(tmp_path / 'site1' / name) == inode(tmp_path / 'site2' / name)
+    assert (tmp_path / 'site1' / 'apidocs.css').read_bytes() == css.data
+    assert len(list(store.iterdir())) == len([t for t in lookup.templates if isinstance(t, StaticTemplate)])
+
+def test_all_documents_json(tmp_path: Path) -> None:
+    """
+    The search results data is written as compact JSON, with flattened summaries.
+    """
+    from pydoctor.templatewriter.search import ALL_DOCUMENTS_JSON_FIELDS
+    import json
+    system = processPackage("basic")
+    w = writer.TemplateWriter(tmp_path, TemplateLookup(template_dir))
+    w.prepOutputDirectory()
+    w.writeSummaryPages(system)
+    with open(tmp_path / 'all-documents.json', encoding='utf-8') as f:
+        data = json.load(f)
+    assert data['fields'] == list(ALL_DOCUMENTS_JSON_FIELDS)
+    assert set(data['documents']) == {ob.fullName() for ob in system.allobjects.values() if ob.isVisible}
+    kind, type_, summary, url, privacy = data['documents']['basic.mod.C']
+    assert kind == 'Class'
+    assert type_ == 'Class'
+    assert url == 'basic.mod.C.html'
+    assert privacy == 'PUBLIC'
+    assert summary == stanutils.flatten(epydoc2stan.format_summary(system.allobjects['basic.mod.C']))
+
+def test_no_all_documents_html(tmp_path: Path) -> None:
+    """
+    With --no-all-documents-html, only the JSON data used by the search is written.
+    """
+    system = processPackage("basic")
+    system.options.noalldocumentshtml = True
+    w = writer.TemplateWriter(tmp_path, TemplateLookup(template_dir))
+    w.writeSummaryPages(system)
+    assert not (tmp_path / 'all-documents.html').exists()
+    assert (tmp_path / 'all-documents.json').is_file()
+    assert (tmp_path / 'searchindex.json').is_file()
+
+@pytest.mark.parametrize('fields', [["name", "names", "qname"], 
+                                    ["name", "names", "qname", "docstring", "kind"]])
+def test_lunr_index_builder_same_as_lunr_py(fields: List[str]) -> None:
+    """
+    The serialized index is exactly the same as the one built by lunr.py.
+    """
+    from lunr import lunr, get_default_builder
+    from pydoctor.templatewriter.search import LunrIndexWriter, LunrIndexBuilder
+    import json
+
+    system = processPackage("allgames")
+    for name in ["basic", "multipleinheritance", "interfaceallgames"]:
+        processPackage(name, systemcls=lambda: system)
+    
+    w = LunrIndexWriter(Path(), system=system, fields=fields)
+    corpus = w.get_corpus()
+
+    builder = get_default_builder()
+    for pipeline_function in builder.pipeline.registered_functions.values():
+        builder.pipeline.skip(pipeline_function, w._SKIP_PIPELINES)
+    builder.search_pipeline.reset()
+    expected = lunr(ref='qname', 
+                    fields=[{'field_name':name, 'boost':w._BOOSTS[name]} for name in fields], 
+                    documents=corpus, builder=builder).serialize()
+
+    serialized = LunrIndexBuilder(ref='qname', 
+                                  fields=[(name, w._BOOSTS[name]) for name in fields], 
+                                  skip_pipeline=w._SKIP_PIPELINES).build(corpus)
+    
+    assert json.dumps(serialized) == json.dumps(expected)
+
+def test_lunr_index_builder_without_docstrings() -> None:
+    """
+    A system without docstrings has empty docstring fields only, the index is still the same as lunr.py's.
+    """
+    from lunr import lunr, get_default_builder
+    from pydoctor.templatewriter.search import LunrIndexWriter, LunrIndexBuilder
+    import json
+
+    system = model.System()
+    fromText('''
+    class C:
+        def f(self): ...
+    def g(): ...
+    ''', modname='mod', system=system)
+    
+    fields = ["name", "names", "qname", "docstring", "kind"]
+    w = LunrIndexWriter(Path(), system=system, fields=fields)
+    corpus = w.get_corpus()
+
+    builder = get_default_builder()
+    for pipeline_function in builder.pipeline.registered_functions.values():
+        builder.pipeline.skip(pipeline_function, w._SKIP_PIPELINES)
+    builder.search_pipeline.reset()
+    expected = lunr(ref='qname', 
+                    fields=[{'field_name':name, 'boost':w._BOOSTS[name]} for name in fields], 
+                    documents=corpus, builder=builder).serialize()
+
+    serialized = LunrIndexBuilder(ref='qname', 
+                                  fields=[(name, w._BOOSTS[name]) for name in fields], 
+                                  skip_pipeline=w._SKIP_PIPELINES).build(corpus)
+    
+    assert json.dumps(serialized) == json.dumps(expected)
+
+@pytest.mark.skipif(shutil.which('node') is None, reason="node is not installed")
+def test_lunr_index_loads_in_lunr_js(tmp_path: Path) -> None:
+    """
+    The bundled lunr.js can load and query the index.
+    """
+    from pydoctor.templatewriter.search import write_lunr_index
+    import json, subprocess
+    system = processPackage("basic")
+    write_lunr_index(tmp_path, system)
+    lunrjs = template_dir / 'lunr.js'
+    script = f"""
+    const lunr = require({json.dumps(str(lunrjs))});
+    const fs = require('fs');
+    let result = {{}};
+    for (const f of ['searchindex.json', 'fullsearchindex.json']) {{
+        const index = lunr.Index.load(JSON.parse(fs.readFileSync({json.dumps(str(tmp_path))} + '/' + f)));
+        result[f] = index.search('+qname:basic.mod.C').map(r => r.ref);
+    }}
+    console.log(JSON.stringify(result));
+    """
+    out = subprocess.run(['node', '-e', script], check=True, capture_output=True, text=True).stdout
+    assert json.loads(out) == {'searchindex.json': ['basic.mod.C'], 'fullsearchindex.json': ['basic.mod.C']}
+
 def test_hasdocstring() -> None:
     system = processPackage("basic")
     from pydoctor.templatewriter.summary import hasdocstring
@@ -230,6 +479,107 @@ def test_html_template_version() -> None:
         if isinstance(template, HtmlTemplate) and not len(template.text.strip()) == 0:
             assert template.version >= 1
 
+def test_html_template_compiled_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Compiled HTML templates are cached in memory and on disk, 
+    the version warnings are re-emitted on each cache hit.
+    """
+    here = Path(__file__).parent
+    text = filetext(here / 'testcustomtemplates' / 'faketemplate' / 'table.html')
+
+    def load(cache: templatewriter._CompiledTemplates) -> HtmlTemplate:
+        monkeypatch.setattr(templatewriter, 'compiled_templates', cache)
+        with pytest.warns(UserWarning) as catch_warnings:
+            template = HtmlTemplate(name='table.html', text=text)
+        assert len(catch_warnings) == 1, [str(w.message) for w in catch_warnings]
+        assert "Could not read 'table.html' template version" in str(catch_warnings.pop().message)
+        return template
+
+    cache = templatewriter._CompiledTemplates(tmp_path)
+    template = load(cache)
+    assert len(list(tmp_path.iterdir())) == 1
+    
+    # in memory
+    assert load(cache).loader.load() is template.loader.load()
+    
+    # on disk
+    template2 = load(templatewriter._CompiledTemplates(tmp_path))
+    assert template2.loader.load() is not template.loader.load()
+    assert template2.version == template.version == -1
+    assert flatten(template2.loader.load()) == flatten(template.loader.load())
+    
+    # corrupted entries are ignored
+    for entry in tmp_path.iterdir():
+        entry.write_bytes(b'not a pickle')
+    template3 = load(templatewriter._CompiledTemplates(tmp_path))
+    assert flatten(template3.loader.load()) == flatten(template.loader.load())
+
+    # the version meta tag is removed
+    default = HtmlTemplate(name='index.html', text=filetext(template_dir / 'index.html'))
+    assert default.version >= 1
+    assert 'pydoctor-template-version' not in repr(default.loader.load())
+
+def test_templates_cache_directory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    The on-disk cache of compiled templates is enabled by PYDOCTOR_TEMPLATES_CACHE.
+    """
+    monkeypatch.setenv('PYDOCTOR_TEMPLATES_CACHE', str(tmp_path))
+    assert templatewriter._templates_cache_directory() == tmp_path
+    monkeypatch.setenv('PYDOCTOR_TEMPLATES_CACHE', '')
+    assert templatewriter._templates_cache_directory() is None
+    monkeypatch.delenv('PYDOCTOR_TEMPLATES_CACHE')
+    assert templatewriter._templates_cache_directory() is None
+
+def test_html_template_cache_key() -> None:
+    """
+    The compiled templates cache key changes with the compilation format.
+    """
+    key = templatewriter._CompiledTemplates._key('index.html', '<html/>')
+    assert key != templatewriter._CompiledTemplates._key('index.html', '<html/>', minify=True)
+    with pytest.MonkeyPatch.context() as m:
+        m.setattr(templatewriter, '_COMPILED_TEMPLATES_FORMAT', 'other')
+        assert key != templatewriter._CompiledTemplates._key('index.html', '<html/>')
+
+def test_minify() -> None:
+    """
+    Whitespace next to block elements and comments are removed, whitespace is collapsed elsewhere 
+    and kept as is in preformatted elements.
+    """
+    from twisted.web.template import XMLString
+    loaded = XMLString("""<div>
+        <!-- comment -->
+        <ul>
+            <li>  <a href="#">link</a>   <code>code</code>  </li>
+            <li><span>text
+              on two lines</span></li>
+        </ul>
+        <pre>  keep
+   this  </pre>
+        <p class="pre">  and   this </p>
+    </div>""").load()
+    assert stanutils.flatten(stanutils.minify(loaded)) == (
+        '<div><ul><li><a href="#">link</a> <code>code</code></li>'
+        '<li><span>text on two lines</span></li></ul>'
+        '<pre>  keep\n   this  </pre><p class="pre">  and   this </p></div>')
+
+def test_minify_html_templates(tmp_path: Path) -> None:
+    """
+    With a minified template lookup, the pages are smaller and display the same text.
+    """
+    system = processPackage("basic")
+    ob = system.allobjects['basic.mod.C']
+    html = {}
+    for minify in (False, True):
+        w = writer.TemplateWriter(tmp_path, TemplateLookup(template_dir, minify=minify))
+        f = BytesIO()
+        w._writeDocsForOne(ob, f)
+        html[minify] = f.getvalue().decode()
+    
+    assert len(html[True]) < len(html[False]) * 0.9
+    def text(html: str) -> str:
+        return ' '.join(re.sub('<[^>]*>|<!--.*?-->', ' ', html, flags=re.DOTALL).split())
+    assert text(html[True]) == text(html[False])
+
 def test_template_lookup_get_template() -> None:
 
     lookup = TemplateLookup(template_dir)
@@ -644,6 +994,83 @@ def test_index_contains_infos(tmp_path: Path) -> None:
         for i in infos:
             assert i in page, page
 
+@pytest.mark.parametrize('split', [False, True])
+def test_split_summary_pages(tmp_path: Path, split: bool) -> None:
+    """
+    With --split-summary-pages, the summary pages link to one page per second level package,
+    and the index of names to one page per initial letter.
+    """
+    system = model.System()
+    system.options.split_summary_pages = split
+    fromText('', modname='top', is_package=True, system=system)
+    fromText('', parent_name='top', modname='a', is_package=True, system=system)
+    fromText('class A: pass\nclass E(Exception): pass', parent_name='top.a', modname='m', system=system)
+    fromText('from top.a.m import A\nclass B(A): pass\nclass F(Exception): pass', 
+             parent_name='top', modname='b', system=system)
+    w = writer.TemplateWriter(tmp_path, TemplateLookup(template_dir))
+    w.writeSummaryPages(system)
+
+    fragments = sorted(p.name for p in tmp_path.glob('*-*.html') if p.name != 'all-documents.html')
+    if not split:
+        assert fragments == []
+        return
+    assert fragments == ['classIndex-top.a.html', 'classIndex-top.b.html', 
+                         'moduleIndex-top.a.html', 
+                         'nameIndex-A.html', 'nameIndex-B.html', 'nameIndex-E.html', 
+                         'nameIndex-F.html', 'nameIndex-M.html', 'nameIndex-T.html', 
+                         'undoccedSummary-top.a.html', 'undoccedSummary-top.b.html', 'undoccedSummary-top.html']
+
+    def read(name: str) -> str:
+        return (tmp_path / name).read_text(encoding='utf-8')
+
+    # B is listed in the hierarchy of A, in the fragment of its root class.
+    classIndex = read('classIndex.html')
+    assert '<a href="classIndex-top.a.html">top.a</a> - 3 classes' in classIndex
+    assert '<a href="classIndex-top.b.html">top.b</a> - 1 class' in classIndex
+    assert 'top.a.m.A' not in classIndex
+    assert 'top.b.B' in read('classIndex-top.a.html')
+    assert 'top.b.B' not in read('classIndex-top.b.html')
+    assert 'top.b.F' in read('classIndex-top.b.html')
+    assert 'top.a.m.E' not in read('classIndex-top.b.html')
+    
+    assert '<a href="moduleIndex-top.a.html">' in read('moduleIndex.html')
+    assert 'top.a.m' not in read('moduleIndex.html')
+    assert 'top.a.m' in read('moduleIndex-top.a.html')
+
+    nameIndex = read('nameIndex.html')
+    assert '<a href="nameIndex-A.html">A</a> - 2 names' in nameIndex
+    assert 'top.a.m.A' not in nameIndex
+    nameIndexA = read('nameIndex-A.html')
+    assert 'Index of Names: A' in nameIndexA
+    assert '<a href="nameIndex-B.html">B</a>' in nameIndexA
+    assert '<a href="top.a.m.A.html" class="internal-link">top.a.m.A</a>' in nameIndexA
+    assert 'top.b.B' not in nameIndexA
+
+    assert 'top.b.F' not in read('undoccedSummary.html')
+    assert 'top.b.F' in read('undoccedSummary-top.b.html')
+    assert 'top.b.F' not in read('undoccedSummary-top.a.html')
+
+def test_split_summary_pages_group_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    With --split-summary-pages, the objects are grouped in fragments once for all the pages.
+    """
+    system = model.System()
+    system.options.split_summary_pages = True
+    fromText('', modname='top', is_package=True, system=system)
+    fromText('class A: pass', parent_name='top', modname='a', system=system)
+    fromText('class B: pass', parent_name='top', modname='b', system=system)
+    
+    calls: Dict[str, int] = {}
+    for name in ('findRootClasses', '_initials', '_undocumented'):
+        def counted(system: model.System, _name: str = name, _f: Callable[[model.System], Any] = getattr(summary, name)) -> Any:
+            calls[_name] = calls.get(_name, 0) + 1
+            return _f(system)
+        monkeypatch.setattr(summary, name, counted)
+
+    writer.TemplateWriter(tmp_path, TemplateLookup(template_dir)).writeSummaryPages(system)
+    assert (tmp_path / 'nameIndex-B.html').is_file()
+    assert calls == {'findRootClasses': 1, '_initials': 1, '_undocumented': 1}
+
 @pytest.mark.parametrize('_order', ["alphabetical", "source"])
 def test_objects_order_mixed_modules_and_packages(_order:str) -> None:
     """
@@ -910,3 +1337,42 @@ def test_class_hierarchy_links_top_level_names() -> None:
     index = flatten(ClassIndexPage(mod.system, TemplateLookup(template_dir)))
     assert 'href="https://docs.python.org/3/library/socket.html#socket.socket"' in index
 
+
+@pytest.mark.parametrize('filename, writerclass', [
+    ('apidocs.zip', 'ZipWriter'), 
+    ('apidocs.tar.gz', 'TarWriter'), 
+    ('apidocs.sqlite', 'SQLiteWriter'),
+    ])
+def test_archive_writers(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, filename: str, writerclass: str) -> None:
+    """
+    The archive writers store the same files as the default writer, in a single file.
+    """
+    from pydoctor import driver
+    from pydoctor.templatewriter import archive
+    # Do not pick up the intersphinx configuration of the pydoctor project.
+    monkeypatch.chdir(tmp_path)
+    package = str(testpackages / 'basic')
+    args = ['--quiet', '--buildtime=2022-01-01 00:00:00', package]
+    assert driver.main([f'--html-output={tmp_path / "dir"}', *args]) == 0
+    assert driver.main([f'--html-output={tmp_path / filename}', 
+                        f'--html-writer=pydoctor.templatewriter.archive.{writerclass}', *args]) == 0
+    
+    expected = {p.relative_to(tmp_path / 'dir').as_posix() for p in (tmp_path / 'dir').rglob('*') if p.is_file()}
+    reader = archive.openArchive(tmp_path / filename)
+    try:
+        assert set(reader.names()) == expected
+        # Table ids are numbered for the whole process, they differ between the two builds.
+        def page(data: bytes) -> bytes:
+            return re.sub(rb'id="id\d+"', b'', data)
+        assert page(reader.read('basic.mod.html') or b'') == page((tmp_path / 'dir' / 'basic.mod.html').read_bytes())
+        assert reader.read('objects.inv') == (tmp_path / 'dir' / 'objects.inv').read_bytes()
+        assert reader.read('apidocs.css') == (tmp_path / 'dir' / 'apidocs.css').read_bytes()
+        # The root module alias is a link or a redirection to index.html
+        assert b'index.html' in (reader.read('basic.html') or b'')
+        assert reader.read('nosuchfile.html') is None
+
+        archive.extract(reader, tmp_path / 'extracted')
+    finally:
+        reader.close()
+    assert page((tmp_path / 'extracted' / 'basic.mod.html').read_bytes()) == page((tmp_path / 'dir' / 'basic.mod.html').read_bytes())
+    assert (tmp_path / 'extracted' / 'fonts' / 'info.svg').is_file()
@@ -2,6 +2,7 @@ from typing import Dict, Optional
 import pytest
 
 from pydoctor.templatewriter.util import CaseInsensitiveDict
+from pydoctor.utils import strongly_connected_components
 
 class TestCaseInsensitiveDict:
     
@@ -45,3 +46,12 @@ class TestCaseInsensitiveDict:
     )
     def test_instance_equality(self, other: Optional[Dict[str, str]], result: bool) -> None:
         assert (self.case_insensitive_dict == other) is result
+
+def test_strongly_connected_components() -> None:
+    graph = {1: [2, 6], 2: [3], 3: [2, 4], 4: [], 5: [1], 6: []}
+    assert strongly_connected_components([1, 2, 3, 4, 5, 6], graph.__getitem__) == [[4], [2, 3], [6], [1], [5]]
+    # Unknown nodes are ignored
+    assert strongly_connected_components([1], graph.__getitem__) == [[1]]
+    # Long chains do not recurse
+    chain = {i: [i + 1] for i in range(10000)}
+    assert strongly_connected_components(chain, chain.__getitem__)[0] == [9999]
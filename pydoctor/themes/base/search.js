@@ -200,7 +200,7 @@ function _getSearchDelayPromise(indexURL){ // -> Promise of a Search delay numbe
 
 function _getIsSearchReadyPromise(){
   return Promise.all([
-    httpGetPromise("all-documents.html"),
+    httpGetPromise("all-documents.json"),
     httpGetPromise("searchindex.json"),
     httpGetPromise("fullsearchindex.json"),
     httpGetPromise("lunr.js"),
@@ -313,7 +313,7 @@ function launchSearch(noDelay){
       setStatus("One sec...");
 
       // Get result data
-      return fetchResultsData(lunrResults, "all-documents.html").then((documentResults) => {
+      return fetchResultsData(lunrResults, "all-documents.json").then((documentResults) => {
 
         // outdated query results
         if (_searchStartTime != _lastSearchStartTime){return;}
@@ -361,7 +361,7 @@ function displaySearchResults(_query, documentResults, lunrResults){
   }
 
   let publicResults = documentResults.filter(function(value){
-    return !value.querySelector('.privacy').innerHTML.includes("PRIVATE");
+    return !value.privacy.includes("PRIVATE");
   })
 
   if (publicResults.length==0){
@@ -408,7 +408,7 @@ input.onkeyup = (event) => {
 };
 input.onfocus = (event) => {
   // Ensure the search bar is set-up.
-  // Load fullsearchindex.json, searchindex.json and all-documents.html to have them in the cache asap.
+  // Load fullsearchindex.json, searchindex.json and all-documents.json to have them in the cache asap.
   isSearchReadyPromise = _getIsSearchReadyPromise();
 }
 document.onload = (event) => { 
@@ -4,7 +4,7 @@
 //      provide a hackable inferface to integrate API docs searching into other platforms, i.e. provide a 
 //      "Search in API docs" option from Read The Docs search page.
 // Depends on ajax.js, bundled with pydoctor. 
-// Other required ressources like lunr.js, searchindex.json and all-documents.html are passed as URL
+// Other required ressources like lunr.js, searchindex.json and all-documents.json are passed as URL
 //      to functions. This makes the code reusable outside of pydoctor build directory.    
 // Implementation note: Searches are designed to be launched synchronously, if lunrSearch() is called sucessively (while already running),
 // old promise will never resolves and the searhc worker will be restarted.
@@ -242,27 +242,35 @@ function lunrSearch(query, indexURL, defaultFields, lunrJsURL, searchDelay, auto
 
 /** 
 * @param results: list of lunr.Index~Result.
-* @param allDocumentsURL: URL pointing to all-documents.html, generated by pydoctor.
-* @returns: Promise of a list of HTMLElement corresponding to the all-documents.html
-*   list elements matching your search results.
+* @param allDocumentsURL: URL pointing to all-documents.json, generated by pydoctor.
+* @returns: Promise of a list of document objects corresponding to the search results. 
+*   Document objects have the following properties: 'id', 'kind', 'type', 'summary', 'url' and 'privacy'.
 */
 function fetchResultsData(results, allDocumentsURL){
     return _getAllDocumentsPromise(allDocumentsURL).then((allDocuments) => {
-        // Look for results data in parsed all-documents.html
+        // Look for results data in parsed all-documents.json
         return _asyncFor(results, (result) => {
             // Find the result model row data.
-            var dobj = allDocuments.getElementById(result.ref);
-            if (!dobj){
+            var values = allDocuments.documents[result.ref];
+            if (!values){
                 throw new Error("Cannot find document ID: " + result.ref);
             }
             // Return result data
+            var dobj = {'id': result.ref};
+            allDocuments.fields.forEach((field, i) => {
+                dobj[field] = values[i];
+            });
             return dobj;
         })
     })
 }
 
+function _htmlEncode(str) {
+    return String(str).replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;').replace(/"/g, '&quot;');
+}
+
 /**
- * Transform list item as in all-documents.html into a formatted search result row.
+ * Transform document object as returned by fetchResultsData() into a formatted search result row.
  */
 function buildSearchResult(dobj) {
 
@@ -277,20 +285,21 @@ function buildSearchResult(dobj) {
         a = document.createElement('a'),
         p = document.createElement('p');
   
-    p.innerHTML = dobj.querySelector('.summary').innerHTML;
-    a.setAttribute('href', dobj.querySelector('.url').innerHTML);
+    p.innerHTML = dobj.summary;
+    a.setAttribute('href', dobj.url);
     a.setAttribute('class', 'internal-link');
-    a.innerHTML = dobj.querySelector('.fullName').innerHTML;
+    // Insert word break opportunities after each dot, like in all-documents.html.
+    a.innerHTML = _htmlEncode(dobj.id).replace(/\./g, '<wbr>.');
     
-    let kind_value = dobj.querySelector('.kind').innerHTML;
-    let type_value = dobj.querySelector('.type').innerHTML;
+    let kind_value = dobj.kind;
+    let type_value = dobj.type;
   
     // Adding '()' on functions and methods
     if (type_value.endsWith("Function")){
         a.innerHTML = a.innerHTML + '()';
     }
   
-    kindtd.innerHTML = kind_value;
+    kindtd.innerHTML = _htmlEncode(kind_value);
     
     // Putting everything together
     tr.appendChild(kindtd);
@@ -303,11 +312,11 @@ function buildSearchResult(dobj) {
     section.appendChild(p);
   
     // Set kind as the CSS class of the kind td tag
-    let ob_css_class = dobj.querySelector('.kind').innerHTML.toLowerCase().replace(' ', '');
+    let ob_css_class = kind_value.toLowerCase().replace(' ', '');
     kindtd.setAttribute('class', ob_css_class);
   
     // Set private
-    if (dobj.querySelector('.privacy').innerHTML.includes('PRIVATE')){
+    if (dobj.privacy.includes('PRIVATE')){
       tr.setAttribute('class', 'private');
     }
     
@@ -352,13 +361,12 @@ function _getIndexDataPromise(indexURL) { // -> Promise of a structured data for
     }
 }
 
-// Cache Document object
+// Cache all documents data
 var _allDocumentsCache = {};
-function _getAllDocumentsPromise(allDocumentsURL) { // -> Promise of the all-documents.html Document object.
+function _getAllDocumentsPromise(allDocumentsURL) { // -> Promise of the all-documents.json structured data.
     if (!_allDocumentsCache[allDocumentsURL]){
         return httpGetPromise(allDocumentsURL).then((responseText) => {
-            let _parser = new self.DOMParser();
-            _allDocumentsCache[allDocumentsURL] = _parser.parseFromString(responseText, "text/html");
+            _allDocumentsCache[allDocumentsURL] = JSON.parse(responseText);
             return (_allDocumentsCache[allDocumentsURL]);
         });
     }
@@ -4,7 +4,7 @@ from __future__ import annotations
 from pathlib import Path
 import sys
 import functools
-from typing import Any, Type, TypeVar, Tuple, Union, cast, TYPE_CHECKING
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Type, TypeVar, Tuple, Union, cast, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from pydoctor import model
@@ -13,6 +13,7 @@ else:
     NoReturn = None
 
 T = TypeVar('T')
+H = TypeVar('H', bound=Hashable)
 
 def error(msg: str, *args: object) -> NoReturn:
     if args:
@@ -103,3 +104,60 @@ def partialclass(cls: Type[Any], *args: Any, **kwds: Any) -> Type[Any]:
         __class__ = cls
     assert isinstance(NewPartialCls, type)
     return NewPartialCls
+
+def strongly_connected_components(nodes: Iterable[H], successors: Callable[[H], Iterable[H]]) -> List[List[H]]:
+    """
+    Find the strongly connected components of a directed graph with Tarjan's algorithm.
+
+    The graph is walked without recursion, so long chains of nodes do not hit the recursion limit.
+
+    @param nodes: All nodes of the graph. 
+    @param successors: Function returning the nodes a node points to. Nodes not in C{nodes} are ignored.
+    @returns: The components, each component comes after all the components its nodes point to. 
+        The nodes of a component are in the same order as in C{nodes}.
+    """
+    nodes = list(nodes)
+    order = {n: i for i, n in enumerate(nodes)}
+    index: Dict[H, int] = {}
+    lowlink: Dict[H, int] = {}
+    stack: List[H] = []
+    on_stack = set()
+    components: List[List[H]] = []
+
+    for root in nodes:
+        if root in index:
+            continue
+        # Each frame is a node and the iterator over its successors.
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        frames = [(root, iter(successors(root)))]
+        while frames:
+            node, it = frames[-1]
+            for succ in it:
+                if succ not in order:
+                    continue
+                if succ not in index:
+                    index[succ] = lowlink[succ] = len(index)
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    frames.append((succ, iter(successors(succ))))
+                    break
+                elif succ in on_stack:
+                    lowlink[node] = min(lowlink[node], index[succ])
+            else:
+                frames.pop()
+                if frames:
+                    parent = frames[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component: List[H] = []
+                    while True:
+                        n = stack.pop()
+                        on_stack.discard(n)
+                        component.append(n)
+                        if n == node:
+                            break
+                    component.sort(key=order.__getitem__)
+                    components.append(component)
+    return components